@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Nearest-hit cost against scene size, testing every shape versus walking a BVH.
+
+Run with ``python benchmarks/bench_bvh.py``. Time per ray should grow linearly with the number of spheres when
+every shape is tested, and roughly logarithmically through the BVH.
+"""
+from __future__ import annotations
+
+import random
+import time
+from functools import partial
+
+from raytracer.bvh import BVH
+from raytracer.intersections import Intersection, hit, intersect_all
+from raytracer.matrices import Matrix4
+from raytracer.rays import Ray
+from raytracer.shapes import Shape, Sphere
+from raytracer.tuples import normalize, point, vector
+
+COUNTS = (100, 1_000, 10_000, 40_000)
+RAYS = 200
+# Testing every shape gets slow quickly, so larger scenes only time the BVH.
+NAIVE_LIMIT = 10_000
+
+
+def scene(count: int, rng: random.Random) -> list[Sphere]:
+    """Small spheres scattered through a cube whose side grows with the count, keeping the density constant."""
+    side = count ** (1 / 3) * 2
+    spheres = []
+    for _ in range(count):
+        r = rng.uniform(0.1, 0.4)
+        x, y, z = (rng.uniform(-side / 2, side / 2) for _ in range(3))
+        spheres.append(Sphere(Matrix4((r, 0, 0, x, 0, r, 0, y, 0, 0, r, z, 0, 0, 0, 1))))
+    return spheres
+
+
+def rays(count: int, rng: random.Random) -> list[Ray]:
+    return [
+        Ray(point(0, 0, 0), normalize(vector(rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1))))
+        for _ in range(count)
+    ]
+
+
+def naive_hit(shapes: list[Shape], ray: Ray) -> Intersection | None:
+    return hit(intersect_all(shapes, ray))
+
+
+def per_ray(func: object, batch: list[Ray]) -> float:
+    start = time.perf_counter()
+    for ray in batch:
+        func(ray)  # type: ignore[operator]
+    return (time.perf_counter() - start) / len(batch)
+
+
+if __name__ == "__main__":
+    rng = random.Random(15)
+    batch = rays(RAYS, rng)
+    header = f"{'spheres':>8}{'split':>8}{'build (s)':>11}{'depth':>7}{'bvh (us/ray)':>14}{'naive (us/ray)':>16}"
+    print(header)  # noqa: T201
+    for count in COUNTS:
+        spheres = scene(count, rng)
+        naive = per_ray(partial(naive_hit, spheres), batch[:20]) if count <= NAIVE_LIMIT else None
+        for split in ("sah", "median"):
+            start = time.perf_counter()
+            tree = BVH(spheres, split=split)
+            build = time.perf_counter() - start
+            traced = per_ray(tree.hit, batch)
+            naive_column = f"{naive * 1e6:>16.0f}" if naive is not None else f"{'-':>16}"
+            print(  # noqa: T201
+                f"{count:>8}{split:>8}{build:>11.2f}{tree.depth():>7}{traced * 1e6:>14.0f}{naive_column}"
+            )
@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Compare the generic nested-list ``Matrix`` against the unrolled ``Matrix4`` transform type.
+
+Run with ``python benchmarks/bench_matrices.py``.
+"""
+from __future__ import annotations
+
+import timeit
+from typing import TYPE_CHECKING
+
+from raytracer.matrices import Matrix, Matrix4, inverse, transform_batch, transpose
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+ELEMENTS: list[list[int | float]] = [[-5, 2, 6, -8], [1, -5, 1, 8], [7, 7, -6, -7], [1, -3, 7, 4]]
+GENERIC = Matrix(ELEMENTS)
+AFFINE = Matrix4((2, 0, 0, 5, 0, 1, 0.5, -3, 0, 0, 1, 2, 0, 0, 0, 1))
+GENERIC_AFFINE = Matrix(AFFINE.elements)
+FAST = Matrix4.from_matrix(GENERIC)
+POINT = (1.5, -2.0, 3.25, 1.0)
+BATCH_SIZE = 100_000
+BATCH = [coord for i in range(BATCH_SIZE) for coord in (i * 0.5, -i * 0.25, i * 0.125, 1.0)]
+BATCH_TUPLES = [tuple(BATCH[i : i + 4]) for i in range(0, len(BATCH), 4)]
+
+
+def bench_generic_matrix_mul() -> None:
+    GENERIC * GENERIC
+
+
+def bench_matrix4_mul() -> None:
+    FAST * FAST
+
+
+def bench_generic_tuple_mul() -> None:
+    GENERIC * POINT
+
+
+def bench_matrix4_tuple_mul() -> None:
+    FAST * POINT
+
+
+def bench_generic_transpose() -> None:
+    transpose(GENERIC)
+
+
+def bench_matrix4_transpose() -> None:
+    transpose(FAST)
+
+
+def bench_generic_inverse() -> None:
+    inverse(GENERIC)
+
+
+def bench_matrix4_inverse() -> None:
+    inverse(FAST)
+
+
+def bench_per_tuple_transform() -> None:
+    [GENERIC_AFFINE * coords for coords in BATCH_TUPLES]
+
+
+def bench_transform_batch() -> None:
+    transform_batch(AFFINE, BATCH)
+
+
+PAIRS: list[tuple[str, Callable[[], None], Callable[[], None]]] = [
+    ("matrix * matrix", bench_generic_matrix_mul, bench_matrix4_mul),
+    ("matrix * tuple", bench_generic_tuple_mul, bench_matrix4_tuple_mul),
+    ("transpose", bench_generic_transpose, bench_matrix4_transpose),
+    ("inverse", bench_generic_inverse, bench_matrix4_inverse),
+]
+BATCH_PAIRS: list[tuple[str, Callable[[], None], Callable[[], None]]] = [
+    (f"{BATCH_SIZE} points", bench_per_tuple_transform, bench_transform_batch),
+]
+
+
+def best_of(func: Callable[[], None], number: int = 2000, repeat: int = 5) -> float:
+    """Best per-call time in seconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+if __name__ == "__main__":
+    print(f"{'operation':<16}{'Matrix (us)':>14}{'Matrix4 (us)':>14}{'speedup':>10}")  # noqa: T201
+    for name, generic, fast in PAIRS:
+        generic_time = best_of(generic)
+        fast_time = best_of(fast)
+        print(  # noqa: T201
+            f"{name:<16}{generic_time * 1e6:>14.2f}{fast_time * 1e6:>14.2f}{generic_time / fast_time:>9.1f}x"
+        )
+    print(f"\n{'transform':<16}{'per-tuple (ms)':>14}{'batch (ms)':>14}{'speedup':>10}")  # noqa: T201
+    for name, single, batched in BATCH_PAIRS:
+        single_time = best_of(single, number=1, repeat=3)
+        batched_time = best_of(batched, number=1, repeat=3)
+        print(  # noqa: T201
+            f"{name:<16}{single_time * 1e3:>14.1f}{batched_time * 1e3:>14.1f}{single_time / batched_time:>9.1f}x"
+        )
@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Full P3 encoding time of one frame, serially and across process pools of increasing size.
+
+Run with ``python benchmarks/bench_ppm.py [width height]``.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from raytracer.canvas import ArrayCanvas, canvas_to_ppm
+
+
+def frame(width: int, height: int) -> ArrayCanvas:
+    canvas = ArrayCanvas(width, height)
+    canvas.write_array([(i % 251) / 250 for i in range(width * height * 3)], width=width)
+    return canvas
+
+
+if __name__ == "__main__":
+    width, height = (int(arg) for arg in sys.argv[1:3]) if sys.argv[2:] else (900, 550)
+    canvas = frame(width, height)
+    cores = os.cpu_count() or 1
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}")  # noqa: T201
+    start = time.perf_counter()
+    canvas.mark_dirty()
+    expected = canvas_to_ppm(canvas)
+    serial = time.perf_counter() - start
+    print(f"{'serial':>8}{serial:>10.3f}{1:>9.1f}x")  # noqa: T201
+    for workers in sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1))):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Warm the pool up so process start-up is not part of the timing.
+            list(executor.map(abs, range(workers)))
+            canvas.mark_dirty()
+            start = time.perf_counter()
+            encoded = canvas_to_ppm(canvas, executor=executor)
+            elapsed = time.perf_counter() - start
+        assert encoded == expected  # noqa: S101
+        print(f"{workers:>8}{elapsed:>10.3f}{serial / elapsed:>9.1f}x")  # noqa: T201
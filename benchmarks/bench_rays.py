@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Primary-ray throughput against a single sphere, per ray and batched.
+
+Run with ``python benchmarks/bench_rays.py [width height]``.
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+from functools import partial
+from typing import TYPE_CHECKING
+
+from raytracer.arrays import PointArray, VectorArray
+from raytracer.arrays import normalize as normalize_all
+from raytracer.intersections import hit, intersect, intersect_batch
+from raytracer.matrices import Matrix4
+from raytracer.rays import RayArray
+from raytracer.shapes import Sphere
+
+if TYPE_CHECKING:
+    from raytracer.intersections import Intersection
+    from raytracer.rays import Ray
+    from raytracer.shapes import Shape
+
+
+def primary_rays(width: int, height: int) -> RayArray:
+    """One ray per pixel from a pinhole at ``z = -5`` through a 7x7 wall at ``z = 10``."""
+    count = width * height
+    xs = [-3.5 + 7 * (x + 0.5) / width for _y in range(height) for x in range(width)]
+    ys = [3.5 - 7 * (y + 0.5) / height for y in range(height) for _x in range(width)]
+    directions = normalize_all(VectorArray(xs, ys, [15.0] * count))
+    return RayArray(PointArray([0.0] * count, [0.0] * count, [-5.0] * count), directions)
+
+
+def hit_each(shape: Shape, rays: list[Ray]) -> list[Intersection | None]:
+    return [hit(intersect(shape, ray)) for ray in rays]
+
+
+if __name__ == "__main__":
+    width, height = (int(arg) for arg in sys.argv[1:3]) if sys.argv[2:] else (320, 240)
+    rays = primary_rays(width, height)
+    scalar_rays = rays.to_list()
+    print(f"{'shape':<12}{'path':<8}{'Mrays/s':>10}")  # noqa: T201
+    for name, shape in (
+        ("unit", Sphere()),
+        ("transformed", Sphere(Matrix4((1, 0, 0, 0.5, 0, 0.5, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1)))),
+    ):
+        scalar = min(timeit.repeat(partial(hit_each, shape, scalar_rays), number=1, repeat=3))
+        batched = min(timeit.repeat(partial(intersect_batch, shape, rays), number=1, repeat=3))
+        print(f"{name:<12}{'scalar':<8}{len(rays) / scalar / 1e6:>10.2f}")  # noqa: T201
+        print(f"{name:<12}{'batch':<8}{len(rays) / batched / 1e6:>10.2f}")  # noqa: T201
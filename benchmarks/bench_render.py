@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Scaling of the tiled process-pool renderer with the number of workers.
+
+Run with ``python benchmarks/bench_render.py [width height]``.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from math import sin
+
+from raytracer.canvas import ArrayCanvas
+from raytracer.render import render
+from raytracer.tuples import Color
+
+
+def busy_shader(x: int, y: int) -> Color:
+    value = 0.0
+    for i in range(200):
+        value += sin(x * 0.01 + y * 0.02 + i)
+    return Color(abs(value) % 1, x % 256 / 255, y % 256 / 255)
+
+
+if __name__ == "__main__":
+    width, height = (int(arg) for arg in sys.argv[1:3]) if sys.argv[2:] else (320, 240)
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, 32, 64, cores} & set(range(1, cores + 1)))
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}")  # noqa: T201
+    baseline = 0.0
+    for workers in counts:
+        start = time.perf_counter()
+        render(ArrayCanvas(width, height), pixel_shader=busy_shader, tile_size=32, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8}{elapsed:>10.2f}{baseline / elapsed:>9.1f}x")  # noqa: T201
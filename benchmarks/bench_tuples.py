@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Per-instance memory and arithmetic throughput of the slotted tuple and color classes.
+
+The ``Dict*`` classes below reproduce the previous ``__dict__``-based layout, which stored every coordinate twice,
+so the numbers can be compared side by side. Run with ``python benchmarks/bench_tuples.py``.
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from raytracer.tuples import Color, TupleFeature
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class DictTupleFeature:
+    def __init__(self, coords: tuple[float, float, float, float]) -> None:
+        self.coords = coords
+        self.x = coords[0]
+        self.y = coords[1]
+        self.z = coords[2]
+        self.w = coords[3]
+
+    def __add__(self, other: DictTupleFeature) -> DictTupleFeature:
+        return DictTupleFeature((self.x + other.x, self.y + other.y, self.z + other.z, self.w + other.w))
+
+    def __mul__(self, other: float) -> DictTupleFeature:
+        return DictTupleFeature((self.x * other, self.y * other, self.z * other, self.w * other))
+
+
+class DictColor:
+    def __init__(self, red: float, green: float, blue: float) -> None:
+        self.rgb = (red, green, blue)
+        self.red = red
+        self.green = green
+        self.blue = blue
+
+    def __add__(self, other: DictColor) -> DictColor:
+        return DictColor(self.red + other.red, self.green + other.green, self.blue + other.blue)
+
+    def __mul__(self, other: float | DictColor) -> DictColor:
+        if isinstance(other, int | float):
+            return DictColor(self.red * other, self.green * other, self.blue * other)
+        return DictColor(self.red * other.red, self.green * other.green, self.blue * other.blue)
+
+
+def shallow_size(obj: object) -> int:
+    """``sys.getsizeof`` of the instance plus its ``__dict__`` and any tuple it stores, when present."""
+    size = sys.getsizeof(obj)
+    for attribute in getattr(obj, "__dict__", {}).values():
+        if isinstance(attribute, tuple):
+            size += sys.getsizeof(attribute)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def traced_bytes_per_instance(factory: Callable[[], object], count: int = 100_000) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (after - before) / count
+
+
+def ops_per_second(func: Callable[[], object], number: int = 200_000) -> float:
+    return number / min(timeit.repeat(func, number=number, repeat=5))
+
+
+if __name__ == "__main__":
+    a, b = TupleFeature((1.5, 2.5, 3.5, 1.0)), TupleFeature((0.5, -1.5, 2.0, 0.0))
+    dict_a, dict_b = DictTupleFeature((1.5, 2.5, 3.5, 1.0)), DictTupleFeature((0.5, -1.5, 2.0, 0.0))
+    red, blue = Color(0.9, 0.1, 0.2), Color(0.1, 0.2, 0.9)
+    dict_red, dict_blue = DictColor(0.9, 0.1, 0.2), DictColor(0.1, 0.2, 0.9)
+
+    rows: list[tuple[str, float, float]] = [
+        ("tuple size (B)", shallow_size(dict_a), shallow_size(a)),
+        (
+            "tuple traced (B)",
+            traced_bytes_per_instance(lambda: DictTupleFeature((1.5, 2.5, 3.5, 1.0))),
+            traced_bytes_per_instance(lambda: TupleFeature((1.5, 2.5, 3.5, 1.0))),
+        ),
+        ("color size (B)", shallow_size(dict_red), shallow_size(red)),
+        (
+            "color traced (B)",
+            traced_bytes_per_instance(lambda: DictColor(0.9, 0.1, 0.2)),
+            traced_bytes_per_instance(lambda: Color(0.9, 0.1, 0.2)),
+        ),
+        ("tuple + (Mops/s)", ops_per_second(lambda: dict_a + dict_b) / 1e6, ops_per_second(lambda: a + b) / 1e6),
+        ("tuple * (Mops/s)", ops_per_second(lambda: dict_a * 2.0) / 1e6, ops_per_second(lambda: a * 2.0) / 1e6),
+        (
+            "color + (Mops/s)",
+            ops_per_second(lambda: dict_red + dict_blue) / 1e6,
+            ops_per_second(lambda: red + blue) / 1e6,
+        ),
+        (
+            "color * (Mops/s)",
+            ops_per_second(lambda: dict_red * dict_blue) / 1e6,
+            ops_per_second(lambda: red * blue) / 1e6,
+        ),
+    ]
+    print(f"{'measure':<18}{'before':>10}{'after':>10}")  # noqa: T201
+    for name, before, after in rows:
+        print(f"{name:<18}{before:>10.2f}{after:>10.2f}")  # noqa: T201
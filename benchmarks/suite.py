@@ -0,0 +1,275 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Throughput benchmark suite with JSON results and baseline regression checks.
+
+Run with ``hatch run bench`` (or ``python benchmarks/suite.py``). Useful options:
+
+* ``--output results.json`` saves the timings,
+* ``--baseline baseline.json`` compares against a previous run and exits non-zero on a regression,
+* ``--threshold 0.2`` sets the allowed slowdown as a fraction of the baseline time (default 10%),
+* ``-k ppm`` only runs cases whose name contains the given substring.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from raytracer.__about__ import __version__
+from raytracer.approx import canvases_close
+from raytracer.arrays import PointArray, VectorArray
+from raytracer.arrays import normalize as normalize_all
+from raytracer.bvh import BVH
+from raytracer.canvas import ArrayCanvas, Canvas, canvas_to_ppm, write_pixel
+from raytracer.compare import compare_canvases
+from raytracer.intersections import hit, intersect, intersect_batch
+from raytracer.matrices import Matrix, Matrix4, transpose
+from raytracer.ppm import parse_ppm, write_ppm
+from raytracer.projectile import Environment, Projectile, simulate_batch, tick
+from raytracer.rays import Ray, RayArray
+from raytracer.shapes import Sphere
+from raytracer.sparse_canvas import SparseCanvas
+from raytracer.transformations import Transform
+from raytracer.tuples import Color, TupleFeature, normalize, point, vector
+
+Case = tuple[str, Callable[[], Callable[[], object]], int]
+
+
+def tuple_arithmetic() -> Callable[[], object]:
+    a = TupleFeature((1.5, 2.5, 3.5, 1.0))
+    b = TupleFeature((0.5, -1.5, 2.0, 0.0))
+    return lambda: (a + b - b) * 2.0 / 4.0
+
+
+def color_ops() -> Callable[[], object]:
+    red = Color(0.9, 0.1, 0.2)
+    blue = Color(0.1, 0.2, 0.9)
+    return lambda: (red + blue - blue) * blue * 0.5
+
+
+def matrix_mul() -> Callable[[], object]:
+    matrix = Matrix([[1, 2, 3, 4], [5, 6, 7, 8], [9, 8, 7, 6], [5, 4, 3, 2]])
+    return lambda: matrix * matrix
+
+
+def matrix_tuple_mul() -> Callable[[], object]:
+    matrix = Matrix([[1, 2, 3, 4], [5, 6, 7, 8], [9, 8, 7, 6], [5, 4, 3, 2]])
+    return lambda: matrix * (1.0, 2.0, 3.0, 1.0)
+
+
+def matrix_transpose() -> Callable[[], object]:
+    matrix = Matrix([[1, 2, 3, 4], [5, 6, 7, 8], [9, 8, 7, 6], [5, 4, 3, 2]])
+    return lambda: transpose(matrix)
+
+
+def transform_chain() -> Callable[[], object]:
+    chain = Transform().rotate_x(0.5).rotate_y(0.25).scale(2, 3, 4).shear(0.5, 0, 0, 0, 0, 0).translate(1, 2, 3)
+    # A fresh Transform each call, so the fold is timed rather than the cached matrix.
+    return lambda: Transform(chain.steps).matrix
+
+
+def canvas_construction(width: int, height: int) -> Callable[[], Callable[[], object]]:
+    return lambda: lambda: Canvas(width, height)
+
+
+def ppm_encoding(width: int, height: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        canvas = Canvas(width, height)
+        for y in range(height):
+            for x in range(width):
+                write_pixel(canvas, x, y, Color(x / width, y / height, 0.5))
+        return lambda: canvas_to_ppm(canvas)
+
+    return setup
+
+
+def sparse_ppm_encoding(width: int, height: int, points: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        def encode() -> str:
+            # A fresh canvas per call, so the timing covers plotting a trajectory and one full encode.
+            canvas = SparseCanvas(width, height)
+            for i in range(points):
+                write_pixel(canvas, i * (width - 1) // points, height - 1 - i * (height - 1) // points, Color(1, 1, 1))
+            return canvas_to_ppm(canvas)
+
+        return encode
+
+    return setup
+
+
+def canvas_comparison(width: int, height: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        a, b = ArrayCanvas(width, height), ArrayCanvas(width, height)
+        for canvas in (a, b):
+            canvas.write_array([x / width for x in range(width * 3)] * height, width=width)
+        # One component off by less than the tolerance, so the elementwise comparison runs to the end.
+        write_pixel(b, width - 1, height - 1, Color(0.5 + 1e-7, 0.5, 0.5))
+        return lambda: canvases_close(a, b)
+
+    return setup
+
+
+def ppm_decoding(width: int, height: int, fmt: str) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        canvas = ArrayCanvas(width, height)
+        canvas.write_array([(i % 251) / 250 for i in range(width * height * 3)], width=width)
+        stream = io.BytesIO()
+        write_ppm(canvas, stream, fmt)
+        data = stream.getvalue()
+        return lambda: parse_ppm(data)
+
+    return setup
+
+
+def golden_comparison(width: int, height: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        a, b = ArrayCanvas(width, height), ArrayCanvas(width, height)
+        a.write_array([(i % 251) / 250 for i in range(width * height * 3)], width=width)
+        # Every row differs, so no row is settled by the equality shortcut.
+        b.write_array([(i % 241) / 240 for i in range(width * height * 3)], width=width)
+        return lambda: compare_canvases(a, b, tolerance=0.01)
+
+    return setup
+
+
+def projectile_ticks() -> Callable[[], object]:
+    environment = Environment(gravity=vector(0, -0.1, 0), wind=vector(-0.01, 0, 0))
+
+    def run() -> None:
+        projectile = Projectile(position=point(0, 1, 0), velocity=normalize(vector(1, 1.8, 0)) * 11.25)
+        while projectile.position.y > 0:
+            projectile = tick(env=environment, proj=projectile)
+
+    return run
+
+
+def projectile_batch_sweep(count: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        positions = PointArray([0.0] * count, [1.0] * count, [0.0] * count)
+        directions = VectorArray([1 + i / count for i in range(count)], [1.8] * count, [0.0] * count)
+        velocities = normalize_all(directions) * 11.25
+        return lambda: simulate_batch(positions, velocities, vector(0, -0.1, 0), vector(-0.01, 0, 0))
+
+    return setup
+
+
+def sphere_intersect(width: int, height: int, batched: bool) -> Callable[[], Callable[[], object]]:  # noqa: FBT001
+    def setup() -> Callable[[], object]:
+        origin = point(0, 0, -5)
+        rays = [
+            Ray(origin, normalize(vector(-3.5 + 7 * x / width, 3.5 - 7 * y / height, 15)))
+            for y in range(height)
+            for x in range(width)
+        ]
+        shape = Sphere()
+        if batched:
+            batch = RayArray.from_rays(rays)
+            return lambda: intersect_batch(shape, batch)
+        return lambda: [hit(intersect(shape, ray)) for ray in rays]
+
+    return setup
+
+
+def bvh_hits(count: int, rays: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        rng = random.Random(count)
+        side = count ** (1 / 3) * 2
+        spheres = []
+        for _ in range(count):
+            x, y, z = (rng.uniform(-side / 2, side / 2) for _ in range(3))
+            spheres.append(Sphere(Matrix4((0.3, 0, 0, x, 0, 0.3, 0, y, 0, 0, 0.3, z, 0, 0, 0, 1))))
+        tree = BVH(spheres)
+        batch = [
+            Ray(point(0, 0, 0), normalize(vector(rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1))))
+            for _ in range(rays)
+        ]
+        return lambda: [tree.hit(ray) for ray in batch]
+
+    return setup
+
+
+CASES: list[Case] = [
+    ("tuple_arithmetic", tuple_arithmetic, 20_000),
+    ("color_ops", color_ops, 20_000),
+    ("matrix_mul", matrix_mul, 2_000),
+    ("matrix_tuple_mul", matrix_tuple_mul, 10_000),
+    ("matrix_transpose", matrix_transpose, 5_000),
+    ("transform_chain_fold", transform_chain, 5_000),
+    ("canvas_construction_900x550", canvas_construction(900, 550), 10),
+    ("canvas_to_ppm_64x64", ppm_encoding(64, 64), 20),
+    ("canvas_to_ppm_320x240", ppm_encoding(320, 240), 3),
+    ("canvas_to_ppm_900x550", ppm_encoding(900, 550), 1),
+    ("parse_ppm_p3_900x550", ppm_decoding(900, 550, "P3"), 1),
+    ("parse_ppm_p6_900x550", ppm_decoding(900, 550, "P6"), 3),
+    ("sparse_canvas_to_ppm_900x550", sparse_ppm_encoding(900, 550, 300), 3),
+    ("canvases_close_320x240", canvas_comparison(320, 240), 3),
+    ("compare_canvases_900x550", golden_comparison(900, 550), 1),
+    ("projectile_ticks", projectile_ticks, 20),
+    ("projectile_batch_10k", projectile_batch_sweep(10_000), 1),
+    ("sphere_intersect_160x120", sphere_intersect(160, 120, batched=False), 1),
+    ("sphere_intersect_batch_160x120", sphere_intersect(160, 120, batched=True), 3),
+    ("bvh_hit_10k_spheres_100_rays", bvh_hits(10_000, 100), 3),
+]
+
+
+def run_cases(name_filter: str = "", repeat: int = 5) -> dict[str, float]:
+    """Return the best per-call time in seconds of every case whose name contains ``name_filter``."""
+    results = {}
+    for name, setup, number in CASES:
+        if name_filter not in name:
+            continue
+        func = setup()
+        results[name] = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Return the names of cases that got slower than ``baseline`` by more than ``threshold``."""
+    return [
+        name for name, seconds in results.items() if name in baseline and seconds > baseline[name] * (1 + threshold)
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="name_filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions per case (best is kept)")
+    parser.add_argument("--output", type=Path, help="write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against results from this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown fraction (default 0.1)")
+    args = parser.parse_args(argv)
+
+    results = run_cases(args.name_filter, args.repeat)
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline else {}
+
+    print(f"{'case':<32}{'time (ms)':>12}{'baseline':>12}{'change':>10}")  # noqa: T201
+    for name, seconds in results.items():
+        line = f"{name:<32}{seconds * 1e3:>12.4f}"
+        if name in baseline:
+            line += f"{baseline[name] * 1e3:>12.4f}{seconds / baseline[name] - 1:>+10.1%}"
+        print(line)  # noqa: T201
+
+    if args.output:
+        document = {
+            "raytracer": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+    regressions = compare(results, baseline, args.threshold)
+    for name in regressions:
+        print(f"REGRESSION: {name} is more than {args.threshold:.0%} slower than the baseline")  # noqa: T201
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
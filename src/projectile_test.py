@@ -1,24 +1,7 @@
-from raytracer.canvas import Canvas, canvas_to_ppm, write_pixel
-from raytracer.tuples import Color, TupleFeature, Vector, normalize, point, vector
-
-
-class Projectile:
-    def __init__(self, position: TupleFeature, velocity: TupleFeature) -> None:
-        self.position = position
-        self.velocity = velocity
-
-
-class Environment:
-    def __init__(self, gravity: Vector, wind: Vector) -> None:
-        self.gravity = gravity
-        self.wind = wind
-
-
-def tick(env: Environment, proj: Projectile) -> Projectile:
-    position = proj.position + proj.velocity
-    velocity = proj.velocity + env.gravity + env.wind
-    return Projectile(position=position, velocity=velocity)
-
+from raytracer.canvas import canvas_to_ppm, write_pixel
+from raytracer.projectile import Environment, Projectile, tick
+from raytracer.sparse_canvas import SparseCanvas
+from raytracer.tuples import Color, normalize, point, vector
 
 if __name__ == "__main__":
     # projectile starts one unit above the origin.
@@ -29,7 +12,8 @@ if __name__ == "__main__":
     # e ← environment(vector(0, -0.1, 0), vector(-0.01, 0, 0))
     environment = Environment(gravity=vector(0, -0.1, 0), wind=vector(-0.01, 0, 0))
 
-    canvas = Canvas(900, 550)
+    # Only the tiles the trajectory crosses are stored; the rest of the canvas stays background.
+    canvas = SparseCanvas(900, 550)
 
     while projectile.position.y > 0:
         x = projectile.position.x
@@ -1,3 +1,10 @@
 # SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
 #
 # SPDX-License-Identifier: MIT
+import os
+
+if os.environ.get("RAYTRACER_INSTRUMENT"):
+    # Imported only on request, so an uninstrumented run never loads or patches anything.
+    from raytracer.instrument import enable_from_environment
+
+    enable_from_environment()
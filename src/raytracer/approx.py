@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Approximate comparison of matrices, colors and canvases, and hashable keys that snap values to a grid.
+
+The ``*_close`` functions compare every component against an absolute tolerance in one ``map`` pipeline, which is
+much cheaper than ``isclose`` per element on large canvases.
+
+``MatrixKey`` and ``ColorKey`` round every component to a multiple of ``epsilon`` and hash and compare that
+snapped tuple, so equality is transitive and always agrees with the hash. Keys that compare equal therefore hold
+values within ``epsilon`` of each other; values closer than that can still straddle a grid line and get different
+keys, which costs a duplicate cache entry but never a wrong lookup.
+"""
+from __future__ import annotations
+
+from itertools import chain, starmap, zip_longest
+from math import isfinite, nan
+from operator import sub
+from typing import TYPE_CHECKING
+
+from raytracer.canvas import ArrayCanvas, Canvas
+from raytracer.matrices import Matrix, Matrix4
+from raytracer.tuples import Color
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+EPSILON = 1e-5
+
+
+def all_close(a: Iterable[float], b: Iterable[float], abs_tol: float = EPSILON) -> bool:
+    """Whether every pair of components differs by at most ``abs_tol``; ``nan`` is never close to anything.
+
+    Iterables of different lengths are never close: the shorter one is padded with ``nan``.
+    """
+    return all(map(abs_tol.__ge__, map(abs, starmap(sub, zip_longest(a, b, fillvalue=nan)))))
+
+
+def matrices_close(a: Matrix, b: Matrix, abs_tol: float = EPSILON) -> bool:
+    if (a.rows, a.columns) != (b.rows, b.columns):
+        return False
+    return all_close(_matrix_values(a), _matrix_values(b), abs_tol)
+
+
+def colors_close(a: Color, b: Color, abs_tol: float = EPSILON) -> bool:
+    return all_close(a.rgb, b.rgb, abs_tol)
+
+
+def canvases_close(a: Canvas, b: Canvas, abs_tol: float = EPSILON) -> bool:
+    """Whether both canvases have the same size and every pixel component is within ``abs_tol``."""
+    if (a.width, a.height) != (b.width, b.height):
+        return False
+    if isinstance(a, ArrayCanvas) and isinstance(b, ArrayCanvas):
+        # Comparing memoryviews of whole buffers runs in C without boxing a float per component, and settles the
+        # common case of identical renders at once.
+        identical = a.typecode == b.typecode and memoryview(a.buffer) == memoryview(b.buffer)
+        return identical or all_close(a.buffer, b.buffer, abs_tol)
+    for y in range(a.height):
+        row_a, row_b = a.row_components(y), b.row_components(y)
+        if row_a != row_b and not all_close(row_a, row_b, abs_tol):
+            return False
+    return True
+
+
+def _matrix_values(matrix: Matrix) -> Iterable[float]:
+    if isinstance(matrix, Matrix4):
+        return matrix.values
+    return chain.from_iterable(matrix.elements)
+
+
+def _snap(values: Iterable[float], epsilon: float) -> tuple[float, ...]:
+    scale = 1 / epsilon
+    try:
+        # -0.0 and 0.0 snap to the same integer 0.
+        return tuple([round(value * scale) for value in values])
+    except (ValueError, OverflowError):
+        # nan and infinities cannot be rounded; they are kept as they are.
+        return tuple(round(value * scale) if isfinite(value) else value for value in values)
+
+
+class MatrixKey:
+    """Hashable stand-in for a matrix, equal to keys of matrices that snap to the same ``epsilon`` grid."""
+
+    __slots__ = ("matrix", "epsilon", "_snapped", "_hash")
+
+    def __init__(self, matrix: Matrix, epsilon: float = EPSILON) -> None:
+        # Snapshot the contents, so later __setitem__ calls on a mutable matrix cannot change the key.
+        square = (matrix.rows, matrix.columns) == (4, 4)
+        self.matrix = matrix.freeze() if square else Matrix([list(row) for row in matrix.elements])
+        self.epsilon = epsilon
+        self._snapped = (matrix.rows, matrix.columns, *_snap(_matrix_values(self.matrix), epsilon))
+        self._hash = hash(self._snapped)
+
+    def __repr__(self) -> str:
+        return f"MatrixKey({self.matrix!r}, epsilon={self.epsilon})"
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MatrixKey):
+            return False
+        return self.epsilon == other.epsilon and self._snapped == other._snapped
+
+
+class ColorKey:
+    """Hashable stand-in for a color, equal to keys of colors that snap to the same ``epsilon`` grid."""
+
+    __slots__ = ("color", "epsilon", "_snapped", "_hash")
+
+    def __init__(self, color: Color, epsilon: float = EPSILON) -> None:
+        self.color = Color(*color.rgb)
+        self.epsilon = epsilon
+        self._snapped = _snap(color.rgb, epsilon)
+        self._hash = hash(self._snapped)
+
+    def __repr__(self) -> str:
+        return f"ColorKey({self.color!r}, epsilon={self.epsilon})"
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ColorKey):
+            return False
+        return self.epsilon == other.epsilon and self._snapped == other._snapped
@@ -0,0 +1,308 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Struct-of-arrays containers for many points, vectors or colors at once.
+
+Each container keeps one ``array("d")`` per component and mirrors the arithmetic of the scalar classes in
+``raytracer.tuples``, one whole column at a time.
+"""
+from __future__ import annotations
+
+from array import array
+from math import sqrt
+from typing import TYPE_CHECKING, TypeVar
+
+from raytracer.matrices import transform_columns
+from raytracer.tuples import Color, Point, TupleFeature, Vector
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence, Sized
+
+    from raytracer.matrices import Matrix
+
+_TupleArrayT = TypeVar("_TupleArrayT", bound="TupleArray")
+
+
+def _column(values: Iterable[float]) -> array:
+    if isinstance(values, array) and values.typecode == "d":
+        return values
+    return array("d", values)
+
+
+def _check_lengths(a: Sized, b: Sized) -> None:
+    if len(a) != len(b):
+        msg = f"arrays must have the same length, got {len(a)} and {len(b)}"
+        raise ValueError(msg)
+
+
+class TupleArray:
+    scalar_type: type[TupleFeature] = TupleFeature
+    default_w: float = 0
+
+    def __init__(
+        self, xs: Iterable[float], ys: Iterable[float], zs: Iterable[float], ws: Iterable[float] | None = None
+    ) -> None:
+        self.xs = _column(xs)
+        self.ys = _column(ys)
+        self.zs = _column(zs)
+        self.ws = _column(ws) if ws is not None else array("d", [self.default_w]) * len(self.xs)
+        if not len(self.xs) == len(self.ys) == len(self.zs) == len(self.ws):
+            msg = "all columns must have the same length"
+            raise ValueError(msg)
+
+    @classmethod
+    def from_tuples(cls: type[_TupleArrayT], features: Sequence[TupleFeature]) -> _TupleArrayT:
+        return cls(
+            [feature.x for feature in features],
+            [feature.y for feature in features],
+            [feature.z for feature in features],
+            [feature.w for feature in features],
+        )
+
+    def to_list(self) -> list[TupleFeature]:
+        scalar_type = self.scalar_type
+        return [scalar_type(coords) for coords in zip(self.xs, self.ys, self.zs, self.ws, strict=True)]
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, index: int) -> TupleFeature:
+        return self.scalar_type((self.xs[index], self.ys[index], self.zs[index], self.ws[index]))
+
+    def __repr__(self) -> str:
+        columns = ", ".join(str(column.tolist()) for column in (self.xs, self.ys, self.zs, self.ws))
+        return f"{type(self).__name__}({columns})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TupleArray):
+            return False
+        return self.xs == other.xs and self.ys == other.ys and self.zs == other.zs and self.ws == other.ws
+
+    def __add__(self, other: TupleArray) -> TupleArray:
+        _check_lengths(self, other)
+        result_type = _SUM_TYPES.get((type(self), type(other)), TupleArray)
+        return result_type(
+            [a + b for a, b in zip(self.xs, other.xs, strict=True)],
+            [a + b for a, b in zip(self.ys, other.ys, strict=True)],
+            [a + b for a, b in zip(self.zs, other.zs, strict=True)],
+            [a + b for a, b in zip(self.ws, other.ws, strict=True)],
+        )
+
+    def __sub__(self, other: TupleArray) -> TupleArray:
+        _check_lengths(self, other)
+        result_type = _DIFFERENCE_TYPES.get((type(self), type(other)), TupleArray)
+        return result_type(
+            [a - b for a, b in zip(self.xs, other.xs, strict=True)],
+            [a - b for a, b in zip(self.ys, other.ys, strict=True)],
+            [a - b for a, b in zip(self.zs, other.zs, strict=True)],
+            [a - b for a, b in zip(self.ws, other.ws, strict=True)],
+        )
+
+    # Scaling or negating moves points off ``w == 1``, so the result is a plain TupleArray; VectorArray overrides
+    # these to keep vectors vectors.
+    def __neg__(self) -> TupleArray:
+        return self._negated(TupleArray)
+
+    def __mul__(self, other: float | int) -> TupleArray:
+        return self._multiplied(other, TupleArray)
+
+    def __truediv__(self, other: float | int) -> TupleArray:
+        return self._divided(other, TupleArray)
+
+    def _negated(self, result: type[_TupleArrayT]) -> _TupleArrayT:
+        return result([-a for a in self.xs], [-a for a in self.ys], [-a for a in self.zs], [-a for a in self.ws])
+
+    def _multiplied(self, other: float | int, result: type[_TupleArrayT]) -> _TupleArrayT:
+        return result(
+            [a * other for a in self.xs],
+            [a * other for a in self.ys],
+            [a * other for a in self.zs],
+            [a * other for a in self.ws],
+        )
+
+    def _divided(self, other: float | int, result: type[_TupleArrayT]) -> _TupleArrayT:
+        return result(
+            [a / other for a in self.xs],
+            [a / other for a in self.ys],
+            [a / other for a in self.zs],
+            [a / other for a in self.ws],
+        )
+
+
+class PointArray(TupleArray):
+    scalar_type = Point
+    default_w = 1
+
+
+class VectorArray(TupleArray):
+    scalar_type = Vector
+    default_w = 0
+
+    def __neg__(self) -> VectorArray:
+        return self._negated(VectorArray)
+
+    def __mul__(self, other: float | int) -> VectorArray:
+        return self._multiplied(other, VectorArray)
+
+    def __truediv__(self, other: float | int) -> VectorArray:
+        return self._divided(other, VectorArray)
+
+
+_SUM_TYPES: dict[tuple[type[TupleArray], type[TupleArray]], type[TupleArray]] = {
+    (PointArray, VectorArray): PointArray,
+    (VectorArray, PointArray): PointArray,
+    (VectorArray, VectorArray): VectorArray,
+}
+_DIFFERENCE_TYPES: dict[tuple[type[TupleArray], type[TupleArray]], type[TupleArray]] = {
+    (PointArray, PointArray): VectorArray,
+    (PointArray, VectorArray): PointArray,
+    (VectorArray, VectorArray): VectorArray,
+}
+
+
+class ColorArray:
+    def __init__(self, reds: Iterable[float], greens: Iterable[float], blues: Iterable[float]) -> None:
+        self.reds = _column(reds)
+        self.greens = _column(greens)
+        self.blues = _column(blues)
+        if not len(self.reds) == len(self.greens) == len(self.blues):
+            msg = "all columns must have the same length"
+            raise ValueError(msg)
+
+    @classmethod
+    def from_colors(cls, colors: Sequence[Color]) -> ColorArray:
+        return cls([color.red for color in colors], [color.green for color in colors], [color.blue for color in colors])
+
+    @classmethod
+    def from_components(cls, values: Sequence[float]) -> ColorArray:
+        """Build from flat ``r, g, b`` components, the layout used by ``ArrayCanvas``."""
+        return cls(values[0::3], values[1::3], values[2::3])
+
+    def to_list(self) -> list[Color]:
+        return [Color(*rgb) for rgb in zip(self.reds, self.greens, self.blues, strict=True)]
+
+    def to_components(self) -> array:
+        """Interleave the columns into flat ``r, g, b`` components, ready for ``Canvas.write_array``."""
+        components = array("d", bytes(len(self) * 3 * self.reds.itemsize))
+        components[0::3] = self.reds
+        components[1::3] = self.greens
+        components[2::3] = self.blues
+        return components
+
+    def __len__(self) -> int:
+        return len(self.reds)
+
+    def __getitem__(self, index: int) -> Color:
+        return Color(self.reds[index], self.greens[index], self.blues[index])
+
+    def __repr__(self) -> str:
+        return f"ColorArray({self.reds.tolist()}, {self.greens.tolist()}, {self.blues.tolist()})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ColorArray):
+            return False
+        return self.reds == other.reds and self.greens == other.greens and self.blues == other.blues
+
+    def __add__(self, other: ColorArray) -> ColorArray:
+        _check_lengths(self, other)
+        return ColorArray(
+            [a + b for a, b in zip(self.reds, other.reds, strict=True)],
+            [a + b for a, b in zip(self.greens, other.greens, strict=True)],
+            [a + b for a, b in zip(self.blues, other.blues, strict=True)],
+        )
+
+    def __sub__(self, other: ColorArray) -> ColorArray:
+        _check_lengths(self, other)
+        return ColorArray(
+            [a - b for a, b in zip(self.reds, other.reds, strict=True)],
+            [a - b for a, b in zip(self.greens, other.greens, strict=True)],
+            [a - b for a, b in zip(self.blues, other.blues, strict=True)],
+        )
+
+    def __neg__(self) -> ColorArray:
+        return ColorArray([-a for a in self.reds], [-a for a in self.greens], [-a for a in self.blues])
+
+    def __mul__(self, other: int | float | ColorArray) -> ColorArray:
+        if isinstance(other, ColorArray):
+            _check_lengths(self, other)
+            return ColorArray(
+                [a * b for a, b in zip(self.reds, other.reds, strict=True)],
+                [a * b for a, b in zip(self.greens, other.greens, strict=True)],
+                [a * b for a, b in zip(self.blues, other.blues, strict=True)],
+            )
+        return ColorArray(
+            [a * other for a in self.reds], [a * other for a in self.greens], [a * other for a in self.blues]
+        )
+
+    def __truediv__(self, other: int | float) -> ColorArray:
+        return ColorArray(
+            [a / other for a in self.reds], [a / other for a in self.greens], [a / other for a in self.blues]
+        )
+
+    def scaled_between(self, scale_min: int, scale_max: int) -> tuple[array, array, array]:
+        """Columns of ``Color.scaled_between`` results, as three ``array("l")``."""
+        return (
+            _scaled_column(self.reds, scale_min, scale_max),
+            _scaled_column(self.greens, scale_min, scale_max),
+            _scaled_column(self.blues, scale_min, scale_max),
+        )
+
+
+def _scaled_column(column: array, scale_min: int, scale_max: int) -> array:
+    return array(
+        "l",
+        [
+            scale_min if (n := round(value * scale_max)) < scale_min else scale_max if n > scale_max else n
+            for value in column
+        ],
+    )
+
+
+def dot(vec_a: TupleArray, vec_b: TupleArray) -> array:
+    _check_lengths(vec_a, vec_b)
+    return array(
+        "d",
+        [
+            ax * bx + ay * by + az * bz + aw * bw
+            for ax, ay, az, aw, bx, by, bz, bw in zip(
+                vec_a.xs, vec_a.ys, vec_a.zs, vec_a.ws, vec_b.xs, vec_b.ys, vec_b.zs, vec_b.ws, strict=True
+            )
+        ],
+    )
+
+
+def magnitude(vec: TupleArray) -> array:
+    return array(
+        "d",
+        [sqrt(x**2 + y**2 + z**2 + w**2) for x, y, z, w in zip(vec.xs, vec.ys, vec.zs, vec.ws, strict=True)],
+    )
+
+
+def normalize(vec: TupleArray) -> VectorArray:
+    magnitudes = magnitude(vec)
+    return VectorArray(
+        [a / m for a, m in zip(vec.xs, magnitudes, strict=True)],
+        [a / m for a, m in zip(vec.ys, magnitudes, strict=True)],
+        [a / m for a, m in zip(vec.zs, magnitudes, strict=True)],
+        [a / m for a, m in zip(vec.ws, magnitudes, strict=True)],
+    )
+
+
+def cross(vec_a: TupleArray, vec_b: TupleArray) -> VectorArray:
+    _check_lengths(vec_a, vec_b)
+    return VectorArray(
+        [ay * bz - az * by for ay, az, by, bz in zip(vec_a.ys, vec_a.zs, vec_b.ys, vec_b.zs, strict=True)],
+        [az * bx - ax * bz for ax, az, bx, bz in zip(vec_a.xs, vec_a.zs, vec_b.xs, vec_b.zs, strict=True)],
+        [ax * by - ay * bx for ax, ay, bx, by in zip(vec_a.xs, vec_a.ys, vec_b.xs, vec_b.ys, strict=True)],
+    )
+
+
+def transform(matrix: Matrix, tuples: TupleArray) -> TupleArray:
+    """Apply ``matrix`` to every tuple, column by column, exactly as ``matrix * tuple.coords`` would.
+
+    Affine matrices keep the array type, since they leave ``w`` alone; any other matrix gives a ``TupleArray``.
+    """
+    xs, ys, zs, ws = transform_columns(matrix, tuples.xs, tuples.ys, tuples.zs, tuples.ws)
+    if ws is None:
+        return type(tuples)(xs, ys, zs, array("d", tuples.ws))
+    return TupleArray(xs, ys, zs, ws)
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from itertools import product
+from math import inf
+from typing import TYPE_CHECKING
+
+from raytracer.matrices import Matrix, Matrix4
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+Corner = tuple[float, float, float]
+
+
+class BoundingBox:
+    """Axis-aligned box from ``minimum`` to ``maximum``; the default box is empty and contains nothing."""
+
+    __slots__ = ("minimum", "maximum")
+
+    def __init__(self, minimum: Corner = (inf, inf, inf), maximum: Corner = (-inf, -inf, -inf)) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def around(cls, corners: Iterable[Corner]) -> BoundingBox:
+        """Smallest box containing every corner."""
+        xs, ys, zs = zip(*corners, strict=True)
+        return cls((min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs)))
+
+    def __repr__(self) -> str:
+        return f"BoundingBox({self.minimum}, {self.maximum})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BoundingBox):
+            return False
+        return self.minimum == other.minimum and self.maximum == other.maximum
+
+    @property
+    def is_empty(self) -> bool:
+        return any(low > high for low, high in zip(self.minimum, self.maximum, strict=True))
+
+    @property
+    def centroid(self) -> Corner:
+        (x0, y0, z0), (x1, y1, z1) = self.minimum, self.maximum
+        return ((x0 + x1) / 2, (y0 + y1) / 2, (z0 + z1) / 2)
+
+    @property
+    def surface_area(self) -> float:
+        (x0, y0, z0), (x1, y1, z1) = self.minimum, self.maximum
+        dx, dy, dz = x1 - x0, y1 - y0, z1 - z0
+        if dx < 0 or dy < 0 or dz < 0:
+            return 0.0
+        return 2 * (dx * dy + dy * dz + dz * dx)
+
+    def corners(self) -> list[Corner]:
+        return list(product(*zip(self.minimum, self.maximum, strict=True)))  # type: ignore[arg-type]
+
+    def merge(self, other: BoundingBox) -> BoundingBox:
+        """Smallest box containing both boxes."""
+        (ax0, ay0, az0), (ax1, ay1, az1) = self.minimum, self.maximum
+        (bx0, by0, bz0), (bx1, by1, bz1) = other.minimum, other.maximum
+        return BoundingBox((min(ax0, bx0), min(ay0, by0), min(az0, bz0)), (max(ax1, bx1), max(ay1, by1), max(az1, bz1)))
+
+    def contains(self, point: Corner) -> bool:
+        return all(low <= value <= high for low, value, high in zip(self.minimum, point, self.maximum, strict=True))
+
+    def transform(self, matrix: Matrix) -> BoundingBox:
+        """Box around all eight corners after ``matrix`` moves them, so it still encloses the moved contents."""
+        if self.is_empty:
+            return BoundingBox()
+        matrix = Matrix4.from_matrix(matrix)
+        return BoundingBox.around((matrix * (x, y, z, 1))[:3] for x, y, z in self.corners())  # type: ignore[misc]
+
+    def intersection_range(self, origin: Corner, direction: Corner) -> tuple[float, float] | None:
+        """Entry and exit distances of the ray through the box, or ``None`` when the ray's line misses it.
+
+        The range may lie partly or wholly behind the origin; callers clip it against what they care about.
+        """
+        t_min, t_max = -inf, inf
+        for low, high, o, d in zip(self.minimum, self.maximum, origin, direction, strict=True):
+            if d == 0:
+                # Parallel to this slab: either always inside it or never.
+                if o < low or o > high:
+                    return None
+                continue
+            t0 = (low - o) / d
+            t1 = (high - o) / d
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_min = max(t_min, t0)
+            t_max = min(t_max, t1)
+            if t_min > t_max:
+                return None
+        return t_min, t_max
@@ -0,0 +1,217 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Bounding volume hierarchy over shapes, so a ray only tests the shapes whose boxes it passes through."""
+from __future__ import annotations
+
+from math import inf
+from typing import TYPE_CHECKING
+
+from raytracer.bounds import BoundingBox, Corner
+from raytracer.intersections import Intersection, hit, intersect
+from raytracer.shapes import Shape
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from raytracer.rays import Ray
+
+SPLIT_METHODS = ("sah", "median")
+SAH_BINS = 16
+
+# A shape with its parent-space box and that box's centroid, computed once before building.
+Entry = tuple[Shape, BoundingBox, Corner]
+
+
+class BVHNode:
+    __slots__ = ("box", "left", "right", "shapes")
+
+    def __init__(
+        self,
+        box: BoundingBox,
+        left: BVHNode | None = None,
+        right: BVHNode | None = None,
+        shapes: list[Shape] | None = None,
+    ) -> None:
+        self.box = box
+        self.left = left
+        self.right = right
+        self.shapes = shapes
+
+    @property
+    def is_leaf(self) -> bool:
+        return self.shapes is not None
+
+
+class BVH:
+    """Binary tree of boxes over ``shapes``, built once and queried with ``hit``.
+
+    ``split="sah"`` partitions each node where the surface area heuristic estimates the cheapest traversal,
+    evaluated over ``SAH_BINS`` buckets of box centroids along each axis. ``split="median"`` halves the shapes
+    along the axis their centroids spread furthest over, which builds faster but can give a worse tree.
+    """
+
+    def __init__(self, shapes: Sequence[Shape], leaf_size: int = 4, split: str = "sah") -> None:
+        if split not in SPLIT_METHODS:
+            msg = f"split must be one of {SPLIT_METHODS}, got {split!r}"
+            raise ValueError(msg)
+        if leaf_size < 1:
+            msg = f"leaf_size must be positive, got {leaf_size}"
+            raise ValueError(msg)
+        self.leaf_size = leaf_size
+        self.split = split
+        self.size = len(shapes)
+        entries = [(shape, shape.parent_space_bounds()) for shape in shapes]
+        self.root = self._build([(shape, box, box.centroid) for shape, box in entries])
+
+    def __len__(self) -> int:
+        return self.size
+
+    def depth(self) -> int:
+        def node_depth(node: BVHNode | None) -> int:
+            if node is None or node.is_leaf:
+                return 1
+            return 1 + max(node_depth(node.left), node_depth(node.right))
+
+        return node_depth(self.root)
+
+    def _build(self, entries: list[Entry]) -> BVHNode:
+        if not entries:
+            return BVHNode(BoundingBox(), shapes=[])
+        box = BoundingBox.around(
+            [shape_box.minimum for _, shape_box, _ in entries] + [shape_box.maximum for _, shape_box, _ in entries]
+        )
+        if len(entries) <= self.leaf_size:
+            return BVHNode(box, shapes=[shape for shape, *_ in entries])
+        centroids = BoundingBox.around(centroid for *_, centroid in entries)
+        if self.split == "sah":
+            split = self._split_sah(entries, centroids, box)
+        else:
+            split = self._split_median(entries, centroids)
+        if split is None:
+            # No split beats a leaf here, or every centroid coincides and no axis separates the shapes.
+            return BVHNode(box, shapes=[shape for shape, *_ in entries])
+        left, right = split
+        return BVHNode(box, left=self._build(left), right=self._build(right))
+
+    @staticmethod
+    def _split_median(entries: list[Entry], centroids: BoundingBox) -> tuple[list[Entry], list[Entry]] | None:
+        extents = [high - low for low, high in zip(centroids.minimum, centroids.maximum, strict=True)]
+        axis = extents.index(max(extents))
+        if extents[axis] == 0:
+            return None
+        entries = sorted(entries, key=lambda entry: entry[2][axis])
+        middle = len(entries) // 2
+        return entries[:middle], entries[middle:]
+
+    def _split_sah(
+        self, entries: list[Entry], centroids: BoundingBox, box: BoundingBox
+    ) -> tuple[list[Entry], list[Entry]] | None:
+        best_cost, best_axis, best_bin = inf, -1, 0
+        for axis in range(3):
+            low, high = centroids.minimum[axis], centroids.maximum[axis]
+            if high == low:
+                continue
+            bins, bin_counts = _sah_bins(entries, axis, low, SAH_BINS / (high - low))
+            cost, index = _cheapest_sah_split(bins, bin_counts)
+            if cost < best_cost:
+                best_cost, best_axis, best_bin = cost, axis, index
+        if best_axis < 0:
+            return None
+        if best_cost >= box.surface_area * len(entries) and len(entries) <= 4 * self.leaf_size:
+            # Splitting would cost more than testing every shape here, and the leaf stays small.
+            return None
+        low = centroids.minimum[best_axis]
+        scale = SAH_BINS / (centroids.maximum[best_axis] - low)
+        left: list[Entry] = []
+        right: list[Entry] = []
+        for entry in entries:
+            index = min(int((entry[2][best_axis] - low) * scale), SAH_BINS - 1)
+            (left if index < best_bin else right).append(entry)
+        return left, right
+
+    def hit(self, ray: Ray) -> Intersection | None:
+        """The nearest non-negative intersection of ``ray`` with any shape, as ``hit(intersect_all(...))``."""
+        origin = (ray.origin.x, ray.origin.y, ray.origin.z)
+        direction = (ray.direction.x, ray.direction.y, ray.direction.z)
+        best: Intersection | None = None
+        best_t = inf
+        entry = self.root.box.intersection_range(origin, direction)
+        if entry is None or entry[1] < 0:
+            return None
+        # Depth-first, nearest child first; a node whose box starts beyond the best hit so far is skipped.
+        stack = [(entry[0], self.root)]
+        while stack:
+            t_enter, node = stack.pop()
+            if t_enter > best_t:
+                continue
+            if node.shapes is not None:
+                for shape in node.shapes:
+                    candidate = hit(intersect(shape, ray))
+                    if candidate is not None and candidate.t < best_t:
+                        best, best_t = candidate, candidate.t
+                continue
+            children: list[tuple[float, BVHNode]] = []
+            for child in (node.left, node.right):
+                if child is None:
+                    continue
+                span = child.box.intersection_range(origin, direction)
+                if span is not None and span[1] >= 0 and span[0] <= best_t:
+                    children.append((span[0], child))
+            children.sort(key=lambda item: item[0], reverse=True)
+            stack.extend(children)
+        return best
+
+
+def _sah_bins(entries: list[Entry], axis: int, low: float, scale: float) -> tuple[list[BoundingBox], list[int]]:
+    """Box around and number of the entries whose centroids fall in each of ``SAH_BINS`` buckets along ``axis``."""
+    # Bin boxes are kept as plain min/max corners; merging BoundingBox objects dominates the build time.
+    bin_lows = [[inf, inf, inf] for _ in range(SAH_BINS)]
+    bin_highs = [[-inf, -inf, -inf] for _ in range(SAH_BINS)]
+    bin_counts = [0] * SAH_BINS
+    for _shape, shape_box, centroid in entries:
+        index = min(int((centroid[axis] - low) * scale), SAH_BINS - 1)
+        lows, highs = bin_lows[index], bin_highs[index]
+        (x0, y0, z0), (x1, y1, z1) = shape_box.minimum, shape_box.maximum
+        if x0 < lows[0]:
+            lows[0] = x0
+        if y0 < lows[1]:
+            lows[1] = y0
+        if z0 < lows[2]:
+            lows[2] = z0
+        if x1 > highs[0]:
+            highs[0] = x1
+        if y1 > highs[1]:
+            highs[1] = y1
+        if z1 > highs[2]:
+            highs[2] = z1
+        bin_counts[index] += 1
+    bins = [
+        BoundingBox((lows[0], lows[1], lows[2]), (highs[0], highs[1], highs[2]))
+        for lows, highs in zip(bin_lows, bin_highs, strict=True)
+    ]
+    return bins, bin_counts
+
+
+def _cheapest_sah_split(bins: list[BoundingBox], bin_counts: list[int]) -> tuple[float, int]:
+    """Estimated cost of the cheapest split between bins and the first bin on its right, ``(inf, 0)`` if none."""
+    # Sweep from the right to get the area and count of every suffix, then from the left to score splits.
+    right_areas = [0.0] * SAH_BINS
+    right_counts = [0] * SAH_BINS
+    running, count = BoundingBox(), 0
+    for index in range(SAH_BINS - 1, 0, -1):
+        running = running.merge(bins[index])
+        count += bin_counts[index]
+        right_areas[index] = running.surface_area
+        right_counts[index] = count
+    best_cost, best_bin = inf, 0
+    running, count = BoundingBox(), 0
+    for index in range(1, SAH_BINS):
+        running = running.merge(bins[index - 1])
+        count += bin_counts[index - 1]
+        if count == 0 or right_counts[index] == 0:
+            continue
+        cost = running.surface_area * count + right_areas[index] * right_counts[index]
+        if cost < best_cost:
+            best_cost, best_bin = cost, index
+    return best_cost, best_bin
@@ -0,0 +1,218 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Content-addressed cache of encoded renders on disk.
+
+An entry is keyed by the SHA-256 of the scene description as canonical JSON, together with the canvas size, the
+PPM format and the package ``__version__``, so upgrading the renderer never serves stale frames. Entries are
+whole PPM files, written to a temporary file in the cache directory and moved into place with ``os.replace``, so
+concurrent writers, even in other processes, never expose a partial file; two writers racing on one key both
+store the same bytes. Entries get the usual ``0o666`` mode less the umask, rather than the private mode of a
+temporary file, so a cache directory can be shared between users. Every hit refreshes the entry's modification
+time, and once the cache grows past ``max_bytes`` the entries with the oldest times are removed first, down to
+``EVICT_FRACTION`` of it. A file that does not parse as a PPM is treated as a miss and replaced.
+
+Each ``RenderCache`` keeps a running total of the stored bytes, so stores do not rescan the directory. Only this
+process's stores are added to it; the total is recounted from the directory whenever eviction scans it.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from raytracer.__about__ import __version__
+from raytracer.canvas import Canvas, canvas_to_ppm
+from raytracer.ppm import PPM_FORMATS, parse_ppm, ppm_header
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+ENTRY_SUFFIX = ".ppm"
+TEMP_PREFIX = ".tmp-"
+# Temporary files this old were left behind by a writer that died before renaming them.
+STALE_TEMP_SECONDS = 3600
+# Eviction frees space down to this fraction of max_bytes, so a full cache is not rescanned on every store.
+EVICT_FRACTION = 0.9
+
+
+def _umask() -> int:
+    # The umask can only be read by setting it, so it is read once, at import, rather than on every store.
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Mode of stored entries: what open() would give a new file, where mkstemp gives 0o600.
+ENTRY_MODE = 0o666 & ~_umask()
+
+
+def scene_key(scene: Any, width: int, height: int, fmt: str = "P6") -> str:
+    """Stable hex digest of a JSON-serializable scene description and everything else the output depends on."""
+    description = {"scene": scene, "width": width, "height": height, "format": fmt, "version": __version__}
+    canonical = json.dumps(description, sort_keys=True, separators=(",", ":"), allow_nan=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def encode_canvas(canvas: Canvas, fmt: str = "P6") -> bytes:
+    if fmt == "P3":
+        return canvas_to_ppm(canvas).encode("ascii")
+    return ppm_header(canvas, fmt).encode("ascii") + canvas.to_bytes()
+
+
+class RenderCache:
+    def __init__(self, directory: str | os.PathLike[str], max_bytes: int = 256 * 2**20, fmt: str = "P6") -> None:
+        if fmt not in PPM_FORMATS:
+            msg = f"fmt must be one of {PPM_FORMATS}, got {fmt!r}"
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.fmt = fmt
+        # Counts for this process only.
+        self.stats: Counter[str] = Counter(hits=0, misses=0, stores=0, evictions=0)
+        # Bytes in stored entries, counted from the directory on first use; see the module docstring.
+        self._size: int | None = None
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def key(self, scene: Any, width: int, height: int) -> str:
+        return scene_key(scene, width, height, self.fmt)
+
+    def path(self, key: str) -> Path:
+        # Two hex digits of fan-out keep directories small on caches with many entries.
+        return self.directory / key[:2] / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> bytes | None:
+        """The stored file for ``key``, marked as recently used, or ``None`` on a miss."""
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since it was read; the bytes are still good.
+            pass
+        self.stats["hits"] += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> Path | None:
+        """Store ``data`` under ``key`` atomically, then evict old entries if the cache is over its size cap.
+
+        Data larger than ``max_bytes`` would only be evicted again at once, so it is not stored and ``None`` is
+        returned.
+        """
+        if len(data) > self.max_bytes:
+            return None
+        path = self.path(key)
+        total = self._tracked_size()
+        path.parent.mkdir(exist_ok=True)
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, temp = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(temp, ENTRY_MODE)
+            os.replace(temp, path)
+        except BaseException:
+            Path(temp).unlink(missing_ok=True)
+            raise
+        self.stats["stores"] += 1
+        self._size = total - replaced + len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+        return path
+
+    def render(self, scene: Any, width: int, height: int, renderer: Callable[[], Canvas]) -> Canvas:
+        """Load the frame for ``scene`` from the cache, or call ``renderer`` and store its canvas.
+
+        A hit skips ``renderer`` entirely and decodes the stored file, so the canvas holds the quantized 8-bit
+        values the file was encoded with. A stored file that fails to decode counts as a miss and is replaced.
+        """
+        key = self.key(scene, width, height)
+        data = self.get(key)
+        if data is not None:
+            try:
+                return parse_ppm(data)
+            except ValueError:
+                self.stats["hits"] -= 1
+                self.stats["misses"] += 1
+                self._remove(self.path(key), len(data))
+        canvas = renderer()
+        if (canvas.width, canvas.height) != (width, height):
+            msg = f"renderer returned a {canvas.width}x{canvas.height} canvas, expected {width}x{height}"
+            raise ValueError(msg)
+        self.put(key, encode_canvas(canvas, self.fmt))
+        return canvas
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """``(mtime, size, path)`` of every stored entry, removing stale temporary files on the way."""
+        entries = []
+        now = time.time()
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    info = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.startswith(TEMP_PREFIX):
+                    if now - info.st_mtime > STALE_TEMP_SECONDS:
+                        Path(entry.path).unlink(missing_ok=True)
+                elif entry.name.endswith(ENTRY_SUFFIX):
+                    entries.append((info.st_mtime, info.st_size, Path(entry.path)))
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _tracked_size(self) -> int:
+        if self._size is None:
+            self._size = self.size()
+        return self._size
+
+    def _remove(self, path: Path, size: int) -> None:
+        # Another process may be removing the same entry; either way it is gone.
+        path.unlink(missing_ok=True)
+        if self._size is not None:
+            self._size = max(self._size - size, 0)
+
+    def evict(self) -> int:
+        """Remove least recently used entries once the cache is over ``max_bytes``; returns how many went.
+
+        Entries go until the rest fit in ``EVICT_FRACTION`` of ``max_bytes``.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_FRACTION
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+        self._size = total
+        self.stats["evictions"] += removed
+        return removed
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+        self._size = 0
@@ -1,46 +1,277 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+
+from raytracer.ppm import P3_BAND_ROWS, encode_p3_rows, ppm_header, quantize
 from raytracer.tuples import Color
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from concurrent.futures import Executor
+
+ARRAY_TYPECODES = ("f", "d")
+
 
 class Canvas:
+    # ``pixels`` is a public list of mutable colors that can change without the canvas knowing, so canvas_to_ppm
+    # encodes every row afresh; see RowCachingCanvas for the canvases that cache encoded rows.
+
     def __init__(self, width: int, height: int, bg_color: Color | None = None) -> None:
         self.width = width
         self.height = height
-        self.pixels = []
         if bg_color is None:
             bg_color = Color(0, 0, 0)
+        self.pixels = [[bg_color] * width for _ in range(height)]
+
+    def write_pixel(self, x: int, y: int, color: Color) -> None:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            msg = f"pixel ({x}, {y}) is outside the {self.width}x{self.height} canvas"
+            raise IndexError(msg)
+        self.pixels[y][x] = color
+
+    def pixel_at(self, x: int, y: int) -> Color:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            msg = f"pixel ({x}, {y}) is outside the {self.width}x{self.height} canvas"
+            raise IndexError(msg)
+        return self.pixels[y][x]
+
+    def fill_region(self, x: int, y: int, width: int, height: int, color: Color) -> None:  # noqa: PLR0913
+        """Paint a ``width`` by ``height`` rectangle; the parts outside the canvas are clipped off."""
+        x, y, x_stop, y_stop = clip_region(self, x, y, width, height)
+        run = [color] * (x_stop - x)
+        for row in self.pixels[y:y_stop]:
+            row[x:x_stop] = run
+
+    def write_row(self, y: int, colors: Sequence[Color], x: int = 0) -> None:
+        check_block(self, x, y, len(colors), 1)
+        self.pixels[y][x : x + len(colors)] = list(colors)
+
+    def write_array(self, values: Sequence[float], x: int = 0, y: int = 0, width: int | None = None) -> None:
+        """Write a block of pixels from flat ``r, g, b`` components laid out row by row.
+
+        ``width`` is the block width in pixels and defaults to the rest of the row starting at ``x``. A block that
+        does not fit on the canvas raises ``IndexError`` before anything is written.
+        """
+        width = block_width(self, values, x, width)
+        check_block(self, x, y, width, len(values) // (width * 3))
+        for offset in range(0, len(values), 3):
+            pixel = offset // 3
+            self.write_pixel(x + pixel % width, y + pixel // width, Color(*values[offset : offset + 3]))
+
+    def row_components(self, y: int) -> Sequence[float]:
+        """Return row ``y`` as flat ``r, g, b`` components."""
+        return [component for pixel in self.pixels[y] for component in pixel.rgb]
+
+    def row_bytes(self, y: int) -> bytes:
+        """Return row ``y`` as flat ``r, g, b`` components scaled to ``0..255``."""
+        return quantize(self.row_components(y))
+
+    def to_bytes(self, transfer: str = "linear", gamma: float = 2.2) -> bytes:
+        """Quantize the whole canvas, row by row, to 8-bit ``r, g, b`` components in one pass.
+
+        ``transfer`` and ``gamma`` are as for ``quantize``; the linear result equals joining every ``row_bytes``.
+        """
+        components = [component for y in range(self.height) for component in self.row_components(y)]
+        return quantize(components, transfer, gamma)
+
+    def p3_rows(self, executor: Executor | None = None) -> list[str]:
+        """Return the P3 text of every row.
+
+        With an ``executor``, rows are encoded in bands of ``P3_BAND_ROWS`` by its workers.
+        """
+        return self._encode_p3_rows(range(self.height), executor)
+
+    def _encode_p3_rows(self, ys: Sequence[int], executor: Executor | None) -> list[str]:
+        if executor is None:
+            return encode_p3_rows([self.row_bytes(y) for y in ys])
+        # Workers get raw components and quantize them too, so only joining the results stays on this thread.
+        bands = [
+            [self.row_components(y) for y in ys[start : start + P3_BAND_ROWS]]
+            for start in range(0, len(ys), P3_BAND_ROWS)
+        ]
+        return [text for texts in executor.map(encode_p3_rows, bands) for text in texts]
+
+
+class RowCachingCanvas(Canvas):
+    """Base for canvases whose every write goes through their methods, which flag the rows they change.
+
+    Only these canvases, ``ArrayCanvas`` and ``SparseCanvas``, keep the encoded P3 text per row once
+    ``canvas_to_ppm`` has run, and re-encode just the rows written since. Subclasses set ``dirty_rows`` to an
+    empty set when they are created, and one whose storage can change behind its back sets ``tracks_dirty_rows``
+    to ``False``.
+    """
+
+    tracks_dirty_rows = True
+    dirty_rows: set[int]
+    _p3_rows: list[str] | None = None
+
+    def mark_dirty(self, start: int = 0, stop: int | None = None) -> None:
+        """Flag rows ``start`` to ``stop`` as changed so the next ``canvas_to_ppm`` re-encodes them."""
+        if self._p3_rows is not None:
+            self.dirty_rows.update(range(max(start, 0), min(self.height if stop is None else stop, self.height)))
+
+    def p3_rows(self, executor: Executor | None = None) -> list[str]:
+        """Return the P3 text of every row, re-encoding only the rows written since the previous call.
+
+        With an ``executor``, rows are encoded in bands of ``P3_BAND_ROWS`` by its workers. The returned list is the
+        cache itself and must not be modified.
+        """
+        if not self.tracks_dirty_rows:
+            return super().p3_rows(executor)
+        if self._p3_rows is None:
+            self._p3_rows = self._encode_p3_rows(range(self.height), executor)
+            self.dirty_rows.clear()
+        elif self.dirty_rows:
+            rows = self._p3_rows
+            dirty = sorted(self.dirty_rows)
+            for y, text in zip(dirty, self._encode_p3_rows(dirty, executor), strict=True):
+                rows[y] = text
+            self.dirty_rows.clear()
+        return self._p3_rows
+
+
+class ArrayCanvas(RowCachingCanvas):
+    """Canvas backed by one contiguous ``height * width * 3`` float buffer.
+
+    ``typecode`` selects the buffer precision: ``"f"`` for float32 or ``"d"`` for float64. Colors are copied into
+    the buffer, so encoded rows are cached; code writing to ``buffer`` directly must call ``mark_dirty``.
+    """
+
+    def __init__(self, width: int, height: int, bg_color: Color | None = None, typecode: str = "d") -> None:
+        if typecode not in ARRAY_TYPECODES:
+            msg = f"typecode must be one of {ARRAY_TYPECODES}, got {typecode!r}"
+            raise ValueError(msg)
+        self.width = width
+        self.height = height
+        self.typecode = typecode
+        self.dirty_rows = set()
+        if bg_color is None:
+            bg_color = Color(0, 0, 0)
+        self.buffer = array(typecode, bg_color.rgb) * (width * height)
+
+    @classmethod
+    def from_buffer(cls, width: int, height: int, buffer: array) -> ArrayCanvas:
+        """Wrap an existing ``width * height * 3`` component buffer without copying it."""
+        if buffer.typecode not in ARRAY_TYPECODES:
+            msg = f"typecode must be one of {ARRAY_TYPECODES}, got {buffer.typecode!r}"
+            raise ValueError(msg)
+        if len(buffer) != width * height * 3:
+            msg = f"expected {width * height * 3} components, got {len(buffer)}"
+            raise ValueError(msg)
+        canvas = cls.__new__(cls)
+        canvas.width = width
+        canvas.height = height
+        canvas.typecode = buffer.typecode
+        canvas.dirty_rows = set()
+        canvas.buffer = buffer
+        return canvas
+
+    @property
+    def pixels(self) -> list[list[Color]]:  # type: ignore[override]
+        """A freshly built list-of-rows copy of the buffer, for code that still expects ``Canvas.pixels``."""
+        return [
+            [Color(*row[i : i + 3]) for i in range(0, len(row), 3)]
+            for row in (self.row_components(y) for y in range(self.height))
+        ]
+
+    def write_pixel(self, x: int, y: int, color: Color) -> None:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            msg = f"pixel ({x}, {y}) is outside the {self.width}x{self.height} canvas"
+            raise IndexError(msg)
+        offset = (y * self.width + x) * 3
+        self.buffer[offset : offset + 3] = array(self.typecode, color.rgb)
+        if self._p3_rows is not None:
+            self.dirty_rows.add(y)
+
+    def pixel_at(self, x: int, y: int) -> Color:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            msg = f"pixel ({x}, {y}) is outside the {self.width}x{self.height} canvas"
+            raise IndexError(msg)
+        offset = (y * self.width + x) * 3
+        buffer = self.buffer
+        return Color(buffer[offset], buffer[offset + 1], buffer[offset + 2])
+
+    def fill_region(self, x: int, y: int, width: int, height: int, color: Color) -> None:  # noqa: PLR0913
+        x, y, x_stop, y_stop = clip_region(self, x, y, width, height)
+        run = array(self.typecode, color.rgb) * (x_stop - x)
+        for row in range(y, y_stop):
+            start = (row * self.width + x) * 3
+            self.buffer[start : start + len(run)] = run
+        self.mark_dirty(y, y_stop)
+
+    def write_row(self, y: int, colors: Sequence[Color], x: int = 0) -> None:
+        self.write_array([component for color in colors for component in color.rgb], x=x, y=y, width=len(colors))
 
-        for _ in range(height):
-            row = []
-            for _ in range(width):
-                row.append(bg_color)
-            self.pixels.append(row)
+    def write_array(self, values: Sequence[float], x: int = 0, y: int = 0, width: int | None = None) -> None:
+        width = block_width(self, values, x, width)
+        stride = width * 3
+        check_block(self, x, y, width, len(values) // stride)
+        block: array
+        if isinstance(values, array) and values.typecode == self.typecode:
+            block = values
+        else:
+            block = array(self.typecode, values)
+        for row, start in enumerate(range(0, len(block), stride)):
+            offset = ((y + row) * self.width + x) * 3
+            self.buffer[offset : offset + stride] = block[start : start + stride]
+        self.mark_dirty(y, y + len(block) // stride)
+
+    def row_components(self, y: int) -> Sequence[float]:
+        start = y * self.width * 3
+        return self.buffer[start : start + self.width * 3]
+
+    def to_bytes(self, transfer: str = "linear", gamma: float = 2.2) -> bytes:
+        return quantize(self.buffer, transfer, gamma)
+
+
+def block_width(canvas: Canvas, values: Sequence[float], x: int, width: int | None) -> int:
+    """Width in pixels of a ``write_array`` block, which defaults to the rest of the row starting at ``x``."""
+    if width is None:
+        width = canvas.width - x
+    if width <= 0 or len(values) % (width * 3):
+        msg = f"expected a multiple of {width * 3} components, got {len(values)}"
+        raise ValueError(msg)
+    return width
+
+
+def check_block(canvas: Canvas, x: int, y: int, width: int, height: int) -> None:
+    """Raise ``IndexError`` unless the block lies wholly on the canvas, as ``write_row`` and ``write_array`` do."""
+    if x < 0 or y < 0 or x + width > canvas.width or y + height > canvas.height:
+        msg = f"a {width}x{height} block at ({x}, {y}) does not fit the {canvas.width}x{canvas.height} canvas"
+        raise IndexError(msg)
+
+
+def clip_region(canvas: Canvas, x: int, y: int, width: int, height: int) -> tuple[int, int, int, int]:
+    """``(x, y, x_stop, y_stop)`` of the part of a rectangle on the canvas, as ``fill_region`` paints it.
+
+    The ranges are empty when the rectangle misses the canvas.
+    """
+    x_stop, y_stop = min(x + width, canvas.width), min(y + height, canvas.height)
+    x, y = max(x, 0), max(y, 0)
+    return x, y, max(x, x_stop), max(y, y_stop)
 
 
 def write_pixel(canvas: Canvas, x: int, y: int, color: Color) -> None:
-    canvas.pixels[y][x] = color
+    canvas.write_pixel(x, y, color)
 
 
 def pixel_at(canvas: Canvas, x: int, y: int) -> Color:
-    return canvas.pixels[y][x]
-
-
-def canvas_to_ppm(canvas: Canvas) -> str:
-    header = f"P3\n{canvas.width} {canvas.height}\n255"
-    pixels = []
-
-    for row in canvas.pixels:
-        current_line = ""
-        for pixel in row:
-            for color_component in pixel.scaled_between(0, 255):
-                component_str = str(color_component)
-                if 70 - len(current_line) >= len(component_str) + 1:
-                    current_line += component_str + " "
-                else:
-                    pixels.append(current_line.rstrip())
-                    current_line = component_str + " "
-        pixels.append(current_line.rstrip())
-
-    pixel_section = "\n".join(pixels)
+    return canvas.pixel_at(x, y)
+
+
+def canvas_to_ppm(canvas: Canvas, executor: Executor | None = None) -> str:
+    """Encode ``canvas`` as a P3 file, optionally spreading the row encoding over ``executor``.
+
+    The output is identical either way. A ``ProcessPoolExecutor`` gives real parallelism; threads only help on
+    interpreters without a global interpreter lock, since the encoding is pure Python string work.
+    """
+    header = ppm_header(canvas, "P3").rstrip("\n")
+
+    pixel_section = "\n".join(canvas.p3_rows(executor))
 
     ppm = "\n".join([header, pixel_section, "\n"])
     return ppm
@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Golden-image comparison of canvases and PPM files, with a command line front end.
+
+The error of a pixel is the largest absolute difference between its components. Errors are computed a whole row at
+a time with ``map`` pipelines, and rows that are exactly equal, the usual case for regression renders, are settled
+by one sequence comparison without looking at their pixels.
+
+Run ``python -m raytracer.compare expected.ppm actual.ppm --tolerance 0.004 --heatmap diff.ppm``; the exit status
+is 0 when no pixel is over the tolerance, 1 when some are and 2 when the images cannot be compared.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from array import array
+from operator import sub
+from typing import TYPE_CHECKING
+
+from raytracer.canvas import ArrayCanvas, Canvas
+from raytracer.ppm import read_ppm, write_ppm
+
+if TYPE_CHECKING:
+    import os
+
+# (left, top, right, bottom) in pixels; ``right`` and ``bottom`` are inclusive.
+PixelBounds = tuple[int, int, int, int]
+
+
+class CanvasDiff:
+    """Result of ``compare_canvases``: per-pixel errors and summary statistics against ``tolerance``."""
+
+    def __init__(self, width: int, height: int, errors: array, tolerance: float) -> None:
+        self.width = width
+        self.height = height
+        self.errors = errors
+        # A float, so its __lt__ below compares with the float errors instead of returning NotImplemented.
+        tolerance = self.tolerance = float(tolerance)
+        self.max_error = max(errors, default=0.0)
+        self.mean_error = sum(errors) / len(errors) if errors else 0.0
+        self.over_tolerance = 0
+        left, top, right, bottom = width, height, -1, -1
+        for y in range(height):
+            # One byte per pixel, so counting and locating the offending pixels are bytes methods.
+            over = bytes(map(tolerance.__lt__, errors[y * width : (y + 1) * width]))
+            count = over.count(1)
+            if count:
+                self.over_tolerance += count
+                left = min(left, over.find(1))
+                right = max(right, over.rfind(1))
+                top = min(top, y)
+                bottom = y
+        self.bounds: PixelBounds | None = (left, top, right, bottom) if self.over_tolerance else None
+
+    def __repr__(self) -> str:
+        return (
+            f"CanvasDiff({self.width}x{self.height}, max_error={self.max_error:g}, mean_error={self.mean_error:g}, "
+            f"over_tolerance={self.over_tolerance}, bounds={self.bounds})"
+        )
+
+    @property
+    def matches(self) -> bool:
+        return self.over_tolerance == 0
+
+    def error_at(self, x: int, y: int) -> float:
+        return self.errors[y * self.width + x]
+
+    def summary(self) -> dict[str, object]:
+        return {
+            "width": self.width,
+            "height": self.height,
+            "tolerance": self.tolerance,
+            "max_error": self.max_error,
+            "mean_error": self.mean_error,
+            "over_tolerance": self.over_tolerance,
+            "bounds": list(self.bounds) if self.bounds else None,
+        }
+
+    def heatmap(self, scale: float | None = None) -> ArrayCanvas:
+        """Errors as an image ramping from black through red and yellow to white at ``scale``.
+
+        ``scale`` defaults to ``max_error``, so the worst pixel is always white; pixels at or under the tolerance
+        stay black, so only the differences that count show up.
+        """
+        if scale is None:
+            scale = self.max_error
+        factor = 3 / scale if scale > 0 else 0.0
+        tolerance = self.tolerance
+        levels = [0.0 if error <= tolerance else min(error * factor, 3.0) for error in self.errors]
+        components = [0.0] * (len(levels) * 3)
+        components[0::3] = [min(level, 1.0) for level in levels]
+        components[1::3] = [min(max(level - 1, 0.0), 1.0) for level in levels]
+        components[2::3] = [max(level - 2, 0.0) for level in levels]
+        return ArrayCanvas.from_buffer(self.width, self.height, array("d", components))
+
+
+def compare_canvases(expected: Canvas, actual: Canvas, tolerance: float = 0.0) -> CanvasDiff:
+    """Compare two canvases of the same size, pixel by pixel, in one pass per row."""
+    if (expected.width, expected.height) != (actual.width, actual.height):
+        msg = f"canvas sizes differ: {expected.width}x{expected.height} and {actual.width}x{actual.height}"
+        raise ValueError(msg)
+    width = expected.width
+    unchanged = array("d", bytes(8 * width))
+    errors = array("d")
+    for y in range(expected.height):
+        row_a, row_b = expected.row_components(y), actual.row_components(y)
+        if row_a == row_b:
+            errors.extend(unchanged)
+            continue
+        deltas = list(map(abs, map(sub, row_a, row_b)))
+        errors.extend(map(max, deltas[0::3], deltas[1::3], deltas[2::3]))
+    return CanvasDiff(width, expected.height, errors, tolerance)
+
+
+def compare(
+    expected: Canvas | str | os.PathLike[str], actual: Canvas | str | os.PathLike[str], tolerance: float = 0.0
+) -> CanvasDiff:
+    """Like ``compare_canvases``, but either side may also be the path of a P3 or P6 file."""
+    if not isinstance(expected, Canvas):
+        expected = read_ppm(expected)
+    if not isinstance(actual, Canvas):
+        actual = read_ppm(actual)
+    return compare_canvases(expected, actual, tolerance)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m raytracer.compare", description=__doc__.splitlines()[0])
+    parser.add_argument("expected", help="golden PPM file")
+    parser.add_argument("actual", help="PPM file to check against it")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.0, help="largest allowed component difference, 0..1 (default 0)"
+    )
+    parser.add_argument("--heatmap", metavar="PATH", help="write the differences to this P6 file")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        diff = compare(args.expected, args.actual, args.tolerance)
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)  # noqa: T201
+        return 2
+    if args.heatmap:
+        write_ppm(diff.heatmap(), args.heatmap, "P6")
+    if args.json:
+        print(json.dumps(diff.summary(), indent=2))  # noqa: T201
+    else:
+        print(  # noqa: T201
+            f"max error {diff.max_error:.6g}, mean error {diff.mean_error:.6g}, "
+            f"{diff.over_tolerance} of {diff.width * diff.height} pixels over {diff.tolerance:g}"
+            + (f", within {diff.bounds}" if diff.bounds else "")
+        )
+    return 0 if diff.matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
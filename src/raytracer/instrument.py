@@ -0,0 +1,305 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Opt-in counters and timers for the hot paths.
+
+Nothing here touches the hot paths until instrumentation is switched on, either by setting the
+``RAYTRACER_INSTRUMENT`` environment variable before ``raytracer`` is imported or with ``instrumented()``::
+
+    with instrumented() as stats:
+        with phase("shade"):
+            ...
+        canvas_to_ppm(canvas)
+    print(stats.to_json())
+
+Enabling swaps counting wrappers into the classes listed in ``COUNTED`` and timing wrappers into ``TIMED``;
+disabling puts the original functions back, so a disabled build runs exactly the uninstrumented code. Modules
+that are not imported yet are wrapped as soon as their import finishes, so enabling never imports anything. Setting
+``RAYTRACER_INSTRUMENT_OUTPUT`` to a path as well writes the snapshot there as JSON when the interpreter exits.
+
+Module-level functions in ``TIMED`` are replaced on their module, so code that imported them by name before
+instrumentation was enabled keeps calling the original; wrap such calls in ``phase`` instead.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import wraps
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import PathFinder
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
+
+ENVIRONMENT_VARIABLE = "RAYTRACER_INSTRUMENT"
+OUTPUT_VARIABLE = "RAYTRACER_INSTRUMENT_OUTPUT"
+
+# (module, class, methods): calls to each method are counted, and ``__init__`` counts an allocation of the
+# instance's own class, so ``Point`` and ``Vector`` are told apart although they share ``TupleFeature.__init__``.
+COUNTED: list[tuple[str, str, tuple[str, ...]]] = [
+    ("raytracer.tuples", "TupleFeature", ("__init__", "__add__", "__sub__", "__neg__", "__mul__", "__truediv__")),
+    ("raytracer.tuples", "Color", ("__init__", "__add__", "__sub__", "__mul__")),
+    ("raytracer.matrices", "Matrix", ("__init__", "__mul__")),
+    ("raytracer.matrices", "Matrix4", ("__init__", "__mul__", "inverse", "transposed")),
+    ("raytracer.canvas", "Canvas", ("write_pixel",)),
+    ("raytracer.canvas", "ArrayCanvas", ("write_pixel",)),
+]
+# (module, attribute): callables whose wall time is accumulated under ``"module.attribute"``.
+TIMED: list[tuple[str, str]] = [
+    ("raytracer.canvas", "canvas_to_ppm"),
+    ("raytracer.canvas", "Canvas.p3_rows"),
+    ("raytracer.ppm", "write_ppm"),
+    ("raytracer.ppm", "read_ppm"),
+    ("raytracer.render", "render"),
+    ("raytracer.matrices", "transform_batch"),
+    ("raytracer.intersections", "intersect_batch"),
+]
+
+
+class Stats:
+    """Counts and timings collected while instrumentation is enabled; safe to update from several threads."""
+
+    def __init__(self) -> None:
+        self.allocations: Counter[str] = Counter()
+        self.calls: Counter[str] = Counter()
+        self.timers: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            timer = self.timers.setdefault(name, [0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+
+    def count_call(self, key: str) -> None:
+        with self._lock:
+            self.calls[key] += 1
+
+    def count_allocation(self, class_name: str) -> None:
+        with self._lock:
+            self.allocations[class_name] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.allocations.clear()
+            self.calls.clear()
+            self.timers.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Plain-dict copy of everything collected so far, plus the shared inverse cache's statistics."""
+        from raytracer.matrices import inverse_cache
+
+        with self._lock:
+            allocations = sorted(self.allocations.items())
+            calls = sorted(self.calls.items())
+            timers = sorted((name, tuple(timer)) for name, timer in self.timers.items())
+        return {
+            "enabled": is_enabled(),
+            "allocations": dict(allocations),
+            "calls": dict(calls),
+            "timers": {name: {"calls": int(count), "seconds": seconds} for name, (count, seconds) in timers},
+            "inverse_cache": inverse_cache.stats(),
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def dump(self, path: str | os.PathLike[str]) -> None:
+        Path(path).write_text(self.to_json() + "\n")
+
+
+stats = Stats()
+
+_enabled_depth = 0
+_originals: list[tuple[object, str, object]] = []
+# Modules with wrappers to install that were not imported yet when instrumentation was enabled.
+_pending: set[str] = set()
+
+
+def is_enabled() -> bool:
+    return _enabled_depth > 0
+
+
+def _counting(key: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    count_call = stats.count_call
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        count_call(key)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _allocating(func: Callable[..., Any]) -> Callable[..., Any]:
+    count_allocation = stats.count_allocation
+
+    @wraps(func)
+    def wrapper(self: object, *args: Any, **kwargs: Any) -> None:
+        count_allocation(type(self).__name__)
+        func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _timing(key: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.add_time(key, perf_counter() - start)
+
+    return wrapper
+
+
+def _patch(owner: object, name: str, original: object, replacement: Callable[..., Any]) -> None:
+    _originals.append((owner, name, original))
+    setattr(owner, name, replacement)
+
+
+def _install(module: ModuleType) -> None:
+    """Wrap everything ``COUNTED`` and ``TIMED`` list for ``module``."""
+    for module_name, class_name, methods in COUNTED:
+        if module_name != module.__name__:
+            continue
+        cls = getattr(module, class_name)
+        for method in methods:
+            original = cls.__dict__[method]
+            if method == "__init__":
+                _patch(cls, method, original, _allocating(original))
+            else:
+                _patch(cls, method, original, _counting(f"{class_name}.{method}", original))
+    for module_name, attribute in TIMED:
+        if module_name != module.__name__:
+            continue
+        owner: object = module
+        *path, name = attribute.split(".")
+        for part in path:
+            owner = getattr(owner, part)
+        original = owner.__dict__[name]
+        _patch(owner, name, original, _timing(f"{module_name}.{attribute}", original))
+
+
+class _InstallingLoader(Loader):
+    """Runs a module with the loader that found it, then installs that module's wrappers."""
+
+    def __init__(self, loader: Loader) -> None:
+        self.loader = loader
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType | None:
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self.loader.exec_module(module)
+        if module.__name__ in _pending:
+            _pending.discard(module.__name__)
+            _install(module)
+
+    def __getattr__(self, name: str) -> Any:
+        # get_source, get_filename and the like, for tracebacks and tools that inspect the loader.
+        return getattr(self.loader, name)
+
+
+class _InstallOnImport(MetaPathFinder):
+    """Meta path finder that hands the modules in ``_pending`` to ``_InstallingLoader``."""
+
+    def find_spec(
+        self, fullname: str, path: Sequence[str] | None, target: ModuleType | None = None
+    ) -> ModuleSpec | None:
+        if fullname not in _pending:
+            return None
+        spec = PathFinder.find_spec(fullname, path, target)
+        if spec is not None and spec.loader is not None:
+            spec.loader = _InstallingLoader(spec.loader)
+        return spec
+
+
+_finder = _InstallOnImport()
+
+
+def _instrumented_modules() -> set[str]:
+    return {module_name for module_name, *_ in COUNTED} | {module_name for module_name, _ in TIMED}
+
+
+def enable() -> None:
+    """Install the counting and timing wrappers; calls nest, and only the outermost ``disable`` removes them."""
+    global _enabled_depth  # noqa: PLW0603
+    _enabled_depth += 1
+    if _enabled_depth > 1:
+        return
+    for module_name in sorted(_instrumented_modules()):
+        module = sys.modules.get(module_name)
+        if module is None:
+            _pending.add(module_name)
+        else:
+            _install(module)
+    if _pending:
+        sys.meta_path.insert(0, _finder)
+
+
+def disable() -> None:
+    global _enabled_depth  # noqa: PLW0603
+    if _enabled_depth == 0:
+        return
+    _enabled_depth -= 1
+    if _enabled_depth > 0:
+        return
+    if _finder in sys.meta_path:
+        sys.meta_path.remove(_finder)
+    _pending.clear()
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+
+
+@contextmanager
+def instrumented(reset: bool = True) -> Iterator[Stats]:  # noqa: FBT001, FBT002
+    """Enable instrumentation for the ``with`` block, starting from empty counters unless ``reset=False``."""
+    if reset:
+        stats.reset()
+    enable()
+    try:
+        yield stats
+    finally:
+        disable()
+
+
+@contextmanager
+def _timed_phase(name: str) -> Iterator[None]:
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_time(name, perf_counter() - start)
+
+
+_NO_PHASE = nullcontext()
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+    """Time a named block while instrumentation is enabled; otherwise a shared no-op context manager."""
+    if _enabled_depth == 0:
+        return _NO_PHASE
+    return _timed_phase(name)
+
+
+def enable_from_environment() -> None:
+    """Switch instrumentation on for the whole process, as requested by ``RAYTRACER_INSTRUMENT``."""
+    if os.environ.get(ENVIRONMENT_VARIABLE, "").lower() in ("", "0", "false", "no"):
+        return
+    enable()
+    output = os.environ.get(OUTPUT_VARIABLE)
+    if output:
+        atexit.register(stats.dump, output)
@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from array import array
+from math import inf
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+from raytracer.matrices import identity_matrix4, inverse_cache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from raytracer.rays import Ray, RayArray
+    from raytracer.shapes import Shape
+
+
+class Intersection:
+    __slots__ = ("t", "object")
+
+    def __init__(self, t: float, obj: Shape) -> None:
+        self.t = t
+        self.object = obj
+
+    def __repr__(self) -> str:
+        return f"Intersection({self.t}, {self.object!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Intersection):
+            return False
+        return self.t == other.t and self.object is other.object
+
+
+# Sort key for intersections, nearest first.
+_distance = attrgetter("t")
+
+
+def intersections(*xs: Intersection) -> list[Intersection]:
+    return sorted(xs, key=_distance)
+
+
+def intersect(shape: Shape, ray: Ray) -> list[Intersection]:
+    """Where ``ray`` crosses ``shape``, sorted by distance along the ray."""
+    if shape.transform.key != identity_matrix4.key:
+        ray = ray.transform(inverse_cache.inverse(shape.transform))
+    return [Intersection(t, shape) for t in shape.local_intersect(ray)]
+
+
+def intersect_all(shapes: Sequence[Shape], ray: Ray) -> list[Intersection]:
+    """Every intersection of ``ray`` with any of ``shapes``, sorted by distance; tests each shape in turn."""
+    return sorted((i for shape in shapes for i in intersect(shape, ray)), key=_distance)
+
+
+def hit(xs: Iterable[Intersection]) -> Intersection | None:
+    """The visible intersection: the one with the lowest non-negative ``t``."""
+    return min((i for i in xs if i.t >= 0), key=_distance, default=None)
+
+
+class BatchHits:
+    """Result of ``intersect_batch``, one entry per ray.
+
+    ``near`` and ``far`` hold both intersection distances (``nan`` on a miss), ``ts`` holds the distance ``hit``
+    would pick (``inf`` when it would return ``None``) and ``mask[i]`` is ``1`` exactly when ray ``i`` has a hit.
+    """
+
+    def __init__(self, near: array, far: array) -> None:
+        self.near = near
+        self.far = far
+        # nan fails both comparisons, so misses fall through to inf.
+        self.ts = array("d", [t0 if t0 >= 0 else t1 if t1 >= 0 else inf for t0, t1 in zip(near, far, strict=True)])
+        self.mask = bytes([t < inf for t in self.ts])
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+def intersect_batch(shape: Shape, rays: RayArray) -> BatchHits:
+    """Intersect every ray in ``rays`` with ``shape`` in one call, matching ``intersect`` and ``hit`` per ray."""
+    if shape.transform.key != identity_matrix4.key:
+        rays = rays.transform(inverse_cache.inverse(shape.transform))
+    return BatchHits(*shape.local_intersect_batch(rays))
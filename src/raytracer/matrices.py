@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+from array import array
+from collections import OrderedDict
 from math import isclose
+from typing import TYPE_CHECKING, overload
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
 
 class Matrix:
@@ -32,6 +38,10 @@ class Matrix:
 
         return True
 
+    def freeze(self) -> Matrix4:
+        """Return an immutable ``Matrix4`` copy of this 4x4 matrix."""
+        return Matrix4.from_matrix(self)
+
     @classmethod
     def new(cls, rows: int, cols: int, fill: int | float = 0) -> Matrix:
         elements = []
@@ -63,13 +73,302 @@ class Matrix:
             return tuple(result)
 
 
+class Matrix4(Matrix):
+    """Immutable 4x4 transform matrix stored as a flat row-major tuple of 16 values.
+
+    Multiplication, determinant, inverse and transpose are unrolled instead of looping through ``__getitem__``.
+    It compares equal to a ``Matrix`` with the same elements and can be mixed with one in multiplication.
+    """
+
+    def __init__(self, values: Sequence[float | int]) -> None:
+        if len(values) != 16:  # noqa: PLR2004
+            msg = f"Matrix4 needs 16 values, got {len(values)}"
+            raise ValueError(msg)
+        self.values = tuple(values)
+        self.rows = 4
+        self.columns = 4
+
+    @classmethod
+    def from_matrix(cls, matrix: Matrix) -> Matrix4:
+        if isinstance(matrix, Matrix4):
+            return matrix
+        if matrix.rows != 4 or matrix.columns != 4:  # noqa: PLR2004
+            msg = f"expected a 4x4 matrix, got {matrix.rows}x{matrix.columns}"
+            raise ValueError(msg)
+        return cls([item for row in matrix.elements for item in row])
+
+    @property  # type: ignore[override]
+    def elements(self) -> list[list[float | int]]:
+        values = self.values
+        return [list(values[0:4]), list(values[4:8]), list(values[8:12]), list(values[12:16])]
+
+    @property
+    def key(self) -> tuple[float | int, ...]:
+        """Hashable, exact snapshot of the contents, stable for the lifetime of the matrix."""
+        return self.values
+
+    def __getitem__(self, idx: tuple[int, int]) -> float | int:
+        return self.values[idx[0] * 4 + idx[1]]
+
+    def __setitem__(self, idx: tuple[int, int], value: int | float) -> None:
+        msg = "Matrix4 is immutable"
+        raise TypeError(msg)
+
+    def __repr__(self) -> str:
+        return f"Matrix4({self.values})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Matrix):
+            return False
+        if not isinstance(other, Matrix4):
+            if other.rows != 4 or other.columns != 4:  # noqa: PLR2004
+                return False
+            other = Matrix4.from_matrix(other)
+        if self.values == other.values:
+            return True
+        return all(isclose(a, b) for a, b in zip(self.values, other.values, strict=True))
+
+    @overload  # type: ignore[override]
+    def __mul__(self, other: Matrix) -> Matrix4:
+        ...
+
+    @overload
+    def __mul__(self, other: tuple) -> tuple[float, float, float, float]:
+        ...
+
+    def __mul__(self, other: Matrix | tuple) -> Matrix4 | tuple[float, float, float, float]:
+        a00, a01, a02, a03, a10, a11, a12, a13, a20, a21, a22, a23, a30, a31, a32, a33 = self.values
+        if isinstance(other, Matrix):
+            b00, b01, b02, b03, b10, b11, b12, b13, b20, b21, b22, b23, b30, b31, b32, b33 = Matrix4.from_matrix(
+                other
+            ).values
+            return Matrix4(
+                (
+                    a00 * b00 + a01 * b10 + a02 * b20 + a03 * b30,
+                    a00 * b01 + a01 * b11 + a02 * b21 + a03 * b31,
+                    a00 * b02 + a01 * b12 + a02 * b22 + a03 * b32,
+                    a00 * b03 + a01 * b13 + a02 * b23 + a03 * b33,
+                    a10 * b00 + a11 * b10 + a12 * b20 + a13 * b30,
+                    a10 * b01 + a11 * b11 + a12 * b21 + a13 * b31,
+                    a10 * b02 + a11 * b12 + a12 * b22 + a13 * b32,
+                    a10 * b03 + a11 * b13 + a12 * b23 + a13 * b33,
+                    a20 * b00 + a21 * b10 + a22 * b20 + a23 * b30,
+                    a20 * b01 + a21 * b11 + a22 * b21 + a23 * b31,
+                    a20 * b02 + a21 * b12 + a22 * b22 + a23 * b32,
+                    a20 * b03 + a21 * b13 + a22 * b23 + a23 * b33,
+                    a30 * b00 + a31 * b10 + a32 * b20 + a33 * b30,
+                    a30 * b01 + a31 * b11 + a32 * b21 + a33 * b31,
+                    a30 * b02 + a31 * b12 + a32 * b22 + a33 * b32,
+                    a30 * b03 + a31 * b13 + a32 * b23 + a33 * b33,
+                )
+            )
+        x, y, z, w = other
+        return (
+            a00 * x + a01 * y + a02 * z + a03 * w,
+            a10 * x + a11 * y + a12 * z + a13 * w,
+            a20 * x + a21 * y + a22 * z + a23 * w,
+            a30 * x + a31 * y + a32 * z + a33 * w,
+        )
+
+    def transposed(self) -> Matrix4:
+        a00, a01, a02, a03, a10, a11, a12, a13, a20, a21, a22, a23, a30, a31, a32, a33 = self.values
+        return Matrix4((a00, a10, a20, a30, a01, a11, a21, a31, a02, a12, a22, a32, a03, a13, a23, a33))
+
+    def _cofactor_terms(self) -> tuple[float, ...]:
+        """The six 2x2 determinants of the top two rows and of the bottom two rows."""
+        a00, a01, a02, a03, a10, a11, a12, a13, a20, a21, a22, a23, a30, a31, a32, a33 = self.values
+        return (
+            a00 * a11 - a10 * a01,
+            a00 * a12 - a10 * a02,
+            a00 * a13 - a10 * a03,
+            a01 * a12 - a11 * a02,
+            a01 * a13 - a11 * a03,
+            a02 * a13 - a12 * a03,
+            a20 * a31 - a30 * a21,
+            a20 * a32 - a30 * a22,
+            a20 * a33 - a30 * a23,
+            a21 * a32 - a31 * a22,
+            a21 * a33 - a31 * a23,
+            a22 * a33 - a32 * a23,
+        )
+
+    def determinant(self) -> float | int:
+        s0, s1, s2, s3, s4, s5, c0, c1, c2, c3, c4, c5 = self._cofactor_terms()
+        return s0 * c5 - s1 * c4 + s2 * c3 + s3 * c2 - s4 * c1 + s5 * c0
+
+    def inverse(self) -> Matrix4:
+        a00, a01, a02, a03, a10, a11, a12, a13, a20, a21, a22, a23, a30, a31, a32, a33 = self.values
+        s0, s1, s2, s3, s4, s5, c0, c1, c2, c3, c4, c5 = self._cofactor_terms()
+        det = s0 * c5 - s1 * c4 + s2 * c3 + s3 * c2 - s4 * c1 + s5 * c0
+        if det == 0:
+            msg = "matrix is not invertible"
+            raise ValueError(msg)
+        return Matrix4(
+            (
+                (a11 * c5 - a12 * c4 + a13 * c3) / det,
+                (-a01 * c5 + a02 * c4 - a03 * c3) / det,
+                (a31 * s5 - a32 * s4 + a33 * s3) / det,
+                (-a21 * s5 + a22 * s4 - a23 * s3) / det,
+                (-a10 * c5 + a12 * c2 - a13 * c1) / det,
+                (a00 * c5 - a02 * c2 + a03 * c1) / det,
+                (-a30 * s5 + a32 * s2 - a33 * s1) / det,
+                (a20 * s5 - a22 * s2 + a23 * s1) / det,
+                (a10 * c4 - a11 * c2 + a13 * c0) / det,
+                (-a00 * c4 + a01 * c2 - a03 * c0) / det,
+                (a30 * s4 - a31 * s2 + a33 * s0) / det,
+                (-a20 * s4 + a21 * s2 - a23 * s0) / det,
+                (-a10 * c3 + a11 * c1 - a12 * c0) / det,
+                (a00 * c3 - a01 * c1 + a02 * c0) / det,
+                (-a30 * s3 + a31 * s1 - a32 * s0) / det,
+                (a20 * s3 - a21 * s1 + a22 * s0) / det,
+            )
+        )
+
+    @classmethod
+    def identity(cls) -> Matrix4:
+        return cls((1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1))
+
+
+class InverseCache:
+    """LRU cache of inverses and inverse transposes keyed by matrix contents.
+
+    Mutable ``Matrix`` arguments are frozen first, so later ``__setitem__`` calls never return a stale inverse.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[float | int, ...], tuple[Matrix4, Matrix4]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, matrix: Matrix) -> tuple[Matrix4, Matrix4]:
+        key = matrix.freeze().key
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        inverted = Matrix4(key).inverse()
+        entry = (inverted, inverted.transposed())
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def inverse(self, matrix: Matrix) -> Matrix4:
+        return self._lookup(matrix)[0]
+
+    def inverse_transpose(self, matrix: Matrix) -> Matrix4:
+        return self._lookup(matrix)[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+inverse_cache = InverseCache()
+
 identity_matrix = Matrix([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
+identity_matrix4 = Matrix4.identity()
 
 
 def transpose(matrix: Matrix) -> Matrix:
+    if isinstance(matrix, Matrix4):
+        return matrix.transposed()
     new_matrix = Matrix.new(rows=matrix.rows, cols=matrix.columns, fill=0.0)
     for row in range(matrix.rows):
         for col in range(matrix.columns):
             new_matrix[row, col] = matrix[col, row]
 
     return new_matrix
+
+
+def submatrix(matrix: Matrix, row: int, column: int) -> Matrix:
+    rows = [items for r, items in enumerate(matrix.elements) if r != row]
+    return Matrix([[item for col, item in enumerate(items) if col != column] for items in rows])
+
+
+def minor(matrix: Matrix, row: int, column: int) -> float | int:
+    return determinant(submatrix(matrix, row, column))
+
+
+def cofactor(matrix: Matrix, row: int, column: int) -> float | int:
+    value = minor(matrix, row, column)
+    return -value if (row + column) % 2 else value
+
+
+def determinant(matrix: Matrix) -> float | int:
+    if isinstance(matrix, Matrix4):
+        return matrix.determinant()
+    if matrix.rows == 2:  # noqa: PLR2004
+        return matrix[0, 0] * matrix[1, 1] - matrix[0, 1] * matrix[1, 0]
+    return sum(matrix[0, col] * cofactor(matrix, 0, col) for col in range(matrix.columns))
+
+
+def inverse(matrix: Matrix) -> Matrix:
+    if isinstance(matrix, Matrix4):
+        return matrix.inverse()
+    det = determinant(matrix)
+    if det == 0:
+        msg = "matrix is not invertible"
+        raise ValueError(msg)
+    return Matrix([[cofactor(matrix, col, row) / det for col in range(matrix.columns)] for row in range(matrix.rows)])
+
+
+def transform_batch(matrix: Matrix, batch: Sequence[float]) -> array:
+    """Apply ``matrix`` to a flat row-major ``N x 4`` batch of ``x, y, z, w`` tuples in one call.
+
+    Each tuple is transformed exactly as ``matrix * (x, y, z, w)`` would, so points (``w == 1``) pick up the
+    translation and vectors (``w == 0``) do not. Returns a new ``array("d")`` with the same layout.
+    """
+    if len(batch) % 4:
+        msg = f"expected a flat N x 4 batch, got {len(batch)} values"
+        raise ValueError(msg)
+    values: array
+    if isinstance(batch, array) and batch.typecode == "d":
+        values = batch
+    else:
+        values = array("d", batch)
+    ws = values[3::4]
+    new_xs, new_ys, new_zs, new_ws = transform_columns(matrix, values[0::4], values[1::4], values[2::4], ws)
+    result = array("d", bytes(len(values) * values.itemsize))
+    result[0::4] = array("d", new_xs)
+    result[1::4] = array("d", new_ys)
+    result[2::4] = array("d", new_zs)
+    result[3::4] = ws if new_ws is None else array("d", new_ws)
+    return result
+
+
+def transform_columns(
+    matrix: Matrix, xs: Sequence[float], ys: Sequence[float], zs: Sequence[float], ws: Sequence[float]
+) -> tuple[list[float], list[float], list[float], list[float] | None]:
+    """Apply ``matrix`` to tuples stored as separate ``x``, ``y``, ``z`` and ``w`` columns.
+
+    Each tuple is transformed exactly as ``matrix * (x, y, z, w)`` would. The new ``w`` column is ``None`` when
+    the matrix is affine, since ``w`` is then unchanged.
+    """
+    a00, a01, a02, a03, a10, a11, a12, a13, a20, a21, a22, a23, a30, a31, a32, a33 = Matrix4.from_matrix(matrix).values
+    affine = (a30, a31, a32, a33) == (0, 0, 0, 1)
+    # Affine matrices leave w alone, and all-point or all-vector columns let each row skip the w product.
+    points = affine and ws.count(1) == len(ws)
+    vectors = affine and ws.count(0) == len(ws)
+    rows = [(a00, a01, a02, a03), (a10, a11, a12, a13), (a20, a21, a22, a23)]
+    if not affine:
+        rows.append((a30, a31, a32, a33))
+    columns = []
+    for m0, m1, m2, m3 in rows:
+        if points:
+            columns.append([m0 * x + m1 * y + m2 * z + m3 for x, y, z in zip(xs, ys, zs, strict=True)])
+        elif vectors:
+            columns.append([m0 * x + m1 * y + m2 * z for x, y, z in zip(xs, ys, zs, strict=True)])
+        else:
+            columns.append([m0 * x + m1 * y + m2 * z + m3 * w for x, y, z, w in zip(xs, ys, zs, ws, strict=True)])
+    return columns[0], columns[1], columns[2], None if affine else columns[3]
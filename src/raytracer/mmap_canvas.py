@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Canvas stored in a memory-mapped file that is already laid out as a binary P6 PPM image.
+
+Pixels are quantized to 8 bits as they are written, exactly like ``canvas_to_ppm`` would, so the file on disk is
+the finished image as soon as the mapping is flushed. Only the pages being touched need to be resident, which
+makes canvases far larger than RAM practical.
+"""
+from __future__ import annotations
+
+import mmap
+from typing import TYPE_CHECKING
+
+from raytracer.canvas import Canvas, block_width, check_block, clip_region
+from raytracer.ppm import parse_ppm_header, quantize
+from raytracer.tuples import Color
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Sequence
+    from types import TracebackType
+
+
+class MemoryMappedCanvas(Canvas):
+    def __init__(self, width: int, height: int, path: str | os.PathLike[str], bg_color: Color | None = None) -> None:
+        header = f"P6\n{width} {height}\n255\n".encode("ascii")
+        with open(path, "wb") as f:
+            f.write(header)
+            # Extending the file leaves a zero-filled (black) body, usually without allocating disk blocks.
+            f.truncate(len(header) + width * height * 3)
+        self._map(path, width, height, len(header))
+        if bg_color is not None and bg_color.scaled_between(0, 255) != (0, 0, 0):
+            self.fill_region(0, 0, width, height, bg_color)
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> MemoryMappedCanvas:  # noqa: A003
+        """Map an existing P6 file written with a maxval of 255, e.g. to resume a render."""
+        with open(path, "rb") as f:
+            fmt, width, height, maxval, offset = parse_ppm_header(f.read(256))
+        if fmt != "P6" or maxval != 255:  # noqa: PLR2004
+            msg = f"expected a P6 file with maxval 255, got {fmt} with maxval {maxval}"
+            raise ValueError(msg)
+        canvas = cls.__new__(cls)
+        canvas._map(path, width, height, offset)
+        return canvas
+
+    def _map(self, path: str | os.PathLike[str], width: int, height: int, offset: int) -> None:
+        self.path = path
+        self.width = width
+        self.height = height
+        self.offset = offset
+        with open(path, "r+b") as f:
+            self.mapping = mmap.mmap(f.fileno(), 0)
+        if len(self.mapping) < offset + width * height * 3:
+            self.mapping.close()
+            msg = f"{path} is too short for a {width}x{height} image"
+            raise ValueError(msg)
+
+    @property
+    def pixels(self) -> list[list[Color]]:  # type: ignore[override]
+        """A freshly built list-of-rows copy of the image; avoid on very large canvases."""
+        return [[self.pixel_at(x, y) for x in range(self.width)] for y in range(self.height)]
+
+    def write_pixel(self, x: int, y: int, color: Color) -> None:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            msg = f"pixel ({x}, {y}) is outside the {self.width}x{self.height} canvas"
+            raise IndexError(msg)
+        offset = self.offset + (y * self.width + x) * 3
+        self.mapping[offset : offset + 3] = quantize(color.rgb)
+
+    def pixel_at(self, x: int, y: int) -> Color:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            msg = f"pixel ({x}, {y}) is outside the {self.width}x{self.height} canvas"
+            raise IndexError(msg)
+        offset = self.offset + (y * self.width + x) * 3
+        red, green, blue = self.mapping[offset : offset + 3]
+        return Color(red / 255, green / 255, blue / 255)
+
+    def fill_region(self, x: int, y: int, width: int, height: int, color: Color) -> None:  # noqa: PLR0913
+        x, y, x_stop, y_stop = clip_region(self, x, y, width, height)
+        run = quantize(color.rgb) * (x_stop - x)
+        for row in range(y, y_stop):
+            start = self.offset + (row * self.width + x) * 3
+            self.mapping[start : start + len(run)] = run
+
+    def write_row(self, y: int, colors: Sequence[Color], x: int = 0) -> None:
+        self.write_array([component for color in colors for component in color.rgb], x=x, y=y, width=len(colors))
+
+    def write_array(self, values: Sequence[float], x: int = 0, y: int = 0, width: int | None = None) -> None:
+        width = block_width(self, values, x, width)
+        stride = width * 3
+        check_block(self, x, y, width, len(values) // stride)
+        encoded = quantize(values)
+        for row, start in enumerate(range(0, len(encoded), stride)):
+            offset = self.offset + ((y + row) * self.width + x) * 3
+            self.mapping[offset : offset + stride] = encoded[start : start + stride]
+
+    def row_components(self, y: int) -> Sequence[float]:
+        return [value / 255 for value in self.row_bytes(y)]
+
+    def row_bytes(self, y: int) -> bytes:
+        start = self.offset + y * self.width * 3
+        return self.mapping[start : start + self.width * 3]
+
+    def to_bytes(self, transfer: str = "linear", gamma: float = 2.2) -> bytes:
+        if transfer == "linear":
+            # Already stored quantized.
+            return self.mapping[self.offset : self.offset + self.width * self.height * 3]
+        return super().to_bytes(transfer, gamma)
+
+    def flush(self) -> None:
+        """Push written pixels to the file, which is then a complete P6 image."""
+        self.mapping.flush()
+
+    @property
+    def closed(self) -> bool:
+        return self.mapping.closed
+
+    def close(self) -> None:
+        if not self.mapping.closed:
+            self.mapping.flush()
+            self.mapping.close()
+
+    def __enter__(self) -> MemoryMappedCanvas:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
@@ -0,0 +1,302 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import mmap
+import os
+import sys
+from array import array
+from collections import deque
+from struct import pack
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from concurrent.futures import Executor, Future
+
+    from raytracer.canvas import ArrayCanvas, Canvas
+
+PPM_FORMATS = ("P3", "P6")
+# The bytes that bytes.isspace() accepts, which separate the header fields.
+PPM_WHITESPACE = b" \t\n\v\f\r"
+P3_LINE_LENGTH = 70
+# Rows per task when P3 encoding is spread over an executor: large enough to amortise the pickling round trip.
+P3_BAND_ROWS = 32
+# Chunks handed to an executor and not yet written when streaming, which keeps memory bounded.
+P3_CHUNKS_AHEAD = 2 * (os.cpu_count() or 1)
+TRANSFERS = ("linear", "gamma", "srgb")
+# Linear components up to this value are on the straight segment of the sRGB transfer curve.
+SRGB_LINEAR_CUTOFF = 0.0031308
+# Decimal text of every 8-bit value, so P3 rows are joined from table lookups instead of str() calls.
+P3_TOKENS = tuple(str(value) for value in range(256))
+# Samples converted per step when reading, which bounds the temporary list of floats on large images.
+READ_CHUNK_SAMPLES = 1 << 20
+
+
+def quantize(values: Iterable[float], transfer: str = "linear", gamma: float = 2.2) -> bytes:
+    """Scale color components to ``0..255``, in one pass over ``values``.
+
+    ``"linear"`` matches ``Color.scaled_between(0, 255)`` exactly. ``"gamma"`` raises each component, clamped to
+    ``0..1``, to ``1 / gamma`` first and ``"srgb"`` applies the piecewise sRGB transfer curve instead.
+    """
+    if transfer == "linear":
+        return bytes(
+            [0 if (n := round(value * 255)) < 0 else 255 if n > 255 else n for value in values]  # noqa: PLR2004
+        )
+    if transfer == "gamma":
+        exponent = 1 / gamma
+        return bytes([0 if value <= 0 else 255 if value >= 1 else round(value**exponent * 255) for value in values])
+    if transfer == "srgb":
+        cutoff = SRGB_LINEAR_CUTOFF
+        return bytes(
+            [
+                0
+                if value <= 0
+                else 255
+                if value >= 1
+                else round((value * 12.92 if value <= cutoff else 1.055 * value ** (1 / 2.4) - 0.055) * 255)
+                for value in values
+            ]
+        )
+    msg = f"transfer must be one of {TRANSFERS}, got {transfer!r}"
+    raise ValueError(msg)
+
+
+def p3_row_lines(row: bytes) -> list[str]:
+    """Wrap one row of quantized components into P3 lines shorter than ``P3_LINE_LENGTH`` columns."""
+    tokens = P3_TOKENS
+    text = " ".join([tokens[value] for value in row])
+    limit = P3_LINE_LENGTH - 1
+    lines = []
+    start = 0
+    while len(text) - start > limit:
+        end = text.rfind(" ", start, start + limit + 1)
+        lines.append(text[start:end])
+        start = end + 1
+    lines.append(text[start:])
+    return lines
+
+
+def encode_p3_rows(rows: Sequence[Sequence[float] | bytes]) -> list[str]:
+    """P3 text of each row, its wrapped lines joined with newlines.
+
+    Rows are flat ``r, g, b`` components, or ``bytes`` that are already quantized. Rows that quantize to the same
+    bytes, like runs of plain background, are wrapped once and share their text. This is the unit of work the
+    parallel encoders hand to executor workers, so it is a plain module-level function and pickles by reference.
+    """
+    encoded: dict[bytes, str] = {}
+    texts = []
+    for row in rows:
+        data = row if isinstance(row, bytes) else quantize(row)
+        text = encoded.get(data)
+        if text is None:
+            text = encoded[data] = "\n".join(p3_row_lines(data))
+        texts.append(text)
+    return texts
+
+
+def ppm_header(canvas: Canvas, fmt: str = "P3") -> str:
+    if fmt not in PPM_FORMATS:
+        msg = f"fmt must be one of {PPM_FORMATS}, got {fmt!r}"
+        raise ValueError(msg)
+    return f"{fmt}\n{canvas.width} {canvas.height}\n255\n"
+
+
+def parse_ppm_header(data: bytes | bytearray | memoryview | mmap.mmap) -> tuple[str, int, int, int, int]:
+    """Parse a PPM header into ``(fmt, width, height, maxval, body_offset)``, skipping ``#`` comments."""
+    tokens: list[bytes] = []
+    position = 0
+    # Bytes are compared as integers, which indexing every one of the accepted buffer types returns.
+    while len(tokens) < 4:  # noqa: PLR2004
+        while position < len(data) and data[position] in PPM_WHITESPACE:
+            position += 1
+        if position < len(data) and data[position] == ord("#"):
+            while position < len(data) and data[position] not in b"\n\r":
+                position += 1
+            continue
+        start = position
+        while position < len(data) and data[position] not in PPM_WHITESPACE:
+            position += 1
+        if start == position:
+            msg = "truncated PPM header"
+            raise ValueError(msg)
+        tokens.append(bytes(data[start:position]))
+    fmt = tokens[0].decode("ascii", "replace")
+    if fmt not in PPM_FORMATS:
+        msg = f"unsupported PPM format {fmt!r}"
+        raise ValueError(msg)
+    width, height, maxval = (int(token) for token in tokens[1:])
+    # Exactly one whitespace character separates the header from the pixel data.
+    return fmt, width, height, maxval, position + 1
+
+
+def iter_ppm_body(
+    canvas: Canvas, fmt: str = "P3", rows_per_chunk: int = 32, executor: Executor | None = None
+) -> Iterator[bytes]:
+    """Yield the encoded pixel data of a PPM file, ``rows_per_chunk`` canvas rows at a time.
+
+    P3 output matches the body of ``canvas_to_ppm`` byte for byte; P6 emits the quantized components as raw bytes.
+    With an ``executor``, P3 chunks are encoded by its workers and still yielded in row order, with at most
+    ``P3_CHUNKS_AHEAD`` of them submitted and not yet yielded.
+    """
+    height = canvas.height
+    bands = [range(start, min(start + rows_per_chunk, height)) for start in range(0, height, rows_per_chunk)]
+    if fmt == "P6":
+        for band in bands:
+            yield b"".join([canvas.row_bytes(y) for y in band])
+        return
+    if executor is None:
+        encoded: Iterable[list[str]] = (encode_p3_rows([canvas.row_bytes(y) for y in band]) for band in bands)
+    else:
+        encoded = _encode_ahead(canvas, bands, executor)
+    for texts in encoded:
+        yield "".join([text + "\n" for text in texts]).encode("ascii")
+    yield b"\n" if canvas.height else b"\n\n"
+
+
+def _encode_ahead(canvas: Canvas, bands: list[range], executor: Executor) -> Iterator[list[str]]:
+    # Executor.map would submit every band at once, holding all of their components in memory.
+    pending: deque[Future[list[str]]] = deque()
+    try:
+        for band in bands:
+            if len(pending) >= P3_CHUNKS_AHEAD:
+                yield pending.popleft().result()
+            pending.append(executor.submit(encode_p3_rows, [canvas.row_components(y) for y in band]))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # A consumer that stops early leaves nothing queued behind it.
+        for future in pending:
+            future.cancel()
+
+
+def write_ppm(
+    canvas: Canvas,
+    target: str | os.PathLike[str] | BinaryIO,
+    fmt: str = "P3",
+    rows_per_chunk: int = 32,
+    executor: Executor | None = None,
+) -> None:
+    """Stream ``canvas`` as a PPM file to a path or a binary file object without building it in memory."""
+    header = ppm_header(canvas, fmt).encode("ascii")
+    if isinstance(target, str | os.PathLike):
+        with open(target, "wb") as f:
+            f.write(header)
+            f.writelines(iter_ppm_body(canvas, fmt, rows_per_chunk, executor))
+    else:
+        target.write(header)
+        target.writelines(iter_ppm_body(canvas, fmt, rows_per_chunk, executor))
+
+
+def read_ppm(path: str | os.PathLike[str], typecode: str = "d") -> ArrayCanvas:
+    """Load a P3 or P6 file into an ``ArrayCanvas`` by memory-mapping it and converting the body in bulk."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            msg = "truncated PPM header"
+            raise ValueError(msg)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            return parse_ppm(mapping, typecode)
+
+
+def parse_ppm(data: bytes | bytearray | memoryview | mmap.mmap, typecode: str = "d") -> ArrayCanvas:
+    """Decode a whole P3 or P6 image into an ``ArrayCanvas`` with components scaled to ``0..1``.
+
+    Samples are looked up in a table of ``value / maxval`` rather than parsed into a ``Color`` each, and output of
+    ``canvas_to_ppm`` or ``write_ppm`` reads back to a canvas that encodes to the same bytes again. P6 files with a
+    maxval above 255 use two bytes per sample, most significant first.
+    """
+    # Imported here because the canvas module imports this one.
+    from raytracer.canvas import ARRAY_TYPECODES, ArrayCanvas
+
+    if typecode not in ARRAY_TYPECODES:
+        msg = f"typecode must be one of {ARRAY_TYPECODES}, got {typecode!r}"
+        raise ValueError(msg)
+    fmt, width, height, maxval, offset = parse_ppm_header(data)
+    if not 0 < maxval < 65536:  # noqa: PLR2004
+        msg = f"maxval must be between 1 and 65535, got {maxval}"
+        raise ValueError(msg)
+    count = width * height * 3
+    scale = [value / maxval for value in range(maxval + 1)]
+    if fmt == "P6":
+        components = _p6_components(data, offset, count, scale, typecode)
+    else:
+        components = _p3_components(data, offset, count, scale, typecode)
+    return ArrayCanvas.from_buffer(width, height, components)
+
+
+def _p6_components(
+    data: bytes | bytearray | memoryview | mmap.mmap, offset: int, count: int, scale: list[float], typecode: str
+) -> array:
+    maxval = len(scale) - 1
+    size = count if maxval <= 255 else count * 2  # noqa: PLR2004
+    body = bytes(data[offset : offset + size])
+    if len(body) < size:
+        msg = f"truncated PPM body: expected {size} bytes, got {len(body)}"
+        raise ValueError(msg)
+    components: array = array(typecode)
+    if maxval <= 255:  # noqa: PLR2004
+        if maxval < 255 and body.translate(None, bytes(range(maxval + 1))):  # noqa: PLR2004
+            msg = f"PPM sample exceeds maxval {maxval}"
+            raise ValueError(msg)
+        # Each byte of a component's machine representation depends only on its 8-bit sample, so every byte lane
+        # of the buffer is one bytes.translate of the body, strided into place without a Python-level loop.
+        packed = [pack(typecode, component) for component in scale]
+        # Samples above maxval were rejected above, so the padding only completes the 256-entry tables.
+        packed += packed[-1:] * (256 - len(packed))
+        itemsize = components.itemsize
+        raw = bytearray(count * itemsize)
+        for lane in range(itemsize):
+            raw[lane::itemsize] = body.translate(bytes([item[lane] for item in packed]))
+        components.frombytes(raw)
+        return components
+    samples = array("H", body)
+    if sys.byteorder == "little":
+        samples.byteswap()
+    try:
+        for start in range(0, count, READ_CHUNK_SAMPLES):
+            components.extend([scale[value] for value in samples[start : start + READ_CHUNK_SAMPLES]])
+    except IndexError:
+        msg = f"PPM sample exceeds maxval {maxval}"
+        raise ValueError(msg) from None
+    return components
+
+
+def _p3_components(
+    data: bytes | bytearray | memoryview | mmap.mmap, offset: int, count: int, scale: list[float], typecode: str
+) -> array:
+    # Canonical decimal tokens map straight to their component; anything else, like "007", goes through int().
+    lookup = {str(value).encode("ascii"): component for value, component in enumerate(scale)}
+    components: array = array(typecode)
+    # Roughly four bytes of text per sample, so each chunk holds about READ_CHUNK_SAMPLES tokens.
+    chunk_size = READ_CHUNK_SAMPLES * 4
+    end = len(data)
+    position = offset
+    tail = b""
+    while len(components) < count and position < end:
+        chunk = tail + bytes(data[position : position + chunk_size])
+        position += chunk_size
+        tokens = chunk.split()
+        # A token cut off at the end of the chunk is carried over to the next one.
+        tail = tokens.pop() if position < end and tokens and not chunk[-1:].isspace() else b""
+        del tokens[count - len(components) :]
+        try:
+            components.extend([lookup[token] for token in tokens])
+        except KeyError:
+            components.extend([_p3_sample(token, scale) for token in tokens])
+    if len(components) < count:
+        msg = f"truncated PPM body: expected {count} samples, got {len(components)}"
+        raise ValueError(msg)
+    return components
+
+
+def _p3_sample(token: bytes, scale: list[float]) -> float:
+    try:
+        value = int(token)
+    except ValueError:
+        msg = f"invalid PPM sample {token!r}"
+        raise ValueError(msg) from None
+    if not 0 <= value < len(scale):
+        msg = f"PPM sample exceeds maxval {len(scale) - 1}"
+        raise ValueError(msg)
+    return scale[value]
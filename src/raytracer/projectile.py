@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from array import array
+from itertools import compress
+from typing import TYPE_CHECKING
+
+from raytracer.arrays import PointArray, VectorArray
+from raytracer.tuples import Color, Point, TupleFeature, Vector, point
+
+if TYPE_CHECKING:
+    from raytracer.canvas import Canvas
+
+
+class Projectile:
+    def __init__(self, position: TupleFeature, velocity: TupleFeature) -> None:
+        self.position = position
+        self.velocity = velocity
+
+
+class Environment:
+    def __init__(self, gravity: Vector, wind: Vector) -> None:
+        self.gravity = gravity
+        self.wind = wind
+
+
+def tick(env: Environment, proj: Projectile) -> Projectile:
+    position = proj.position + proj.velocity
+    velocity = proj.velocity + env.gravity + env.wind
+    return Projectile(position=position, velocity=velocity)
+
+
+class BatchTrajectories:
+    """Positions recorded by ``simulate_batch``, one snapshot of the still-flying projectiles per tick."""
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.steps: list[tuple[list[int], array, array, array]] = []
+
+    def trajectory(self, index: int) -> list[Point]:
+        """Positions of projectile ``index`` while it was above the ground, as ``tick`` would visit them."""
+        positions = []
+        for ids, xs, ys, zs in self.steps:
+            slot = _find(ids, index)
+            if slot is None:
+                break
+            positions.append(point(xs[slot], ys[slot], zs[slot]))
+        return positions
+
+    def flight_times(self) -> list[int]:
+        """Number of ticks each projectile spent above the ground."""
+        times = [0] * self.count
+        for ids, *_ in self.steps:
+            for index in ids:
+                times[index] += 1
+        return times
+
+    def rasterize(self, canvas: Canvas, color: Color) -> None:
+        """Plot every recorded position at ``(int(x), int(canvas.height - y))``, skipping ones off the canvas."""
+        width, height = canvas.width, canvas.height
+        for _ids, xs, ys, _zs in self.steps:
+            for x, y in zip(xs, ys, strict=True):
+                column, row = int(x), int(height - y)
+                if 0 <= column < width and 0 <= row < height:
+                    canvas.write_pixel(column, row, color)
+
+
+def _find(ids: list[int], index: int) -> int | None:
+    # ids stay sorted because retiring projectiles only ever removes entries.
+    low, high = 0, len(ids)
+    while low < high:
+        middle = (low + high) // 2
+        if ids[middle] < index:
+            low = middle + 1
+        else:
+            high = middle
+    return low if low < len(ids) and ids[low] == index else None
+
+
+def simulate_batch(
+    positions: PointArray,
+    velocities: VectorArray,
+    gravity: Vector | VectorArray,
+    wind: Vector | VectorArray,
+    max_ticks: int | None = None,
+) -> BatchTrajectories:
+    """Advance many projectiles in lockstep, retiring each once its ``y <= 0``.
+
+    ``gravity`` and ``wind`` apply to every projectile, or give one vector per projectile for parameter sweeps.
+    Every position and velocity is computed with the same operations, in the same order, as looping ``tick``.
+    """
+    count = len(positions)
+    ids = list(range(count))
+    px, py, pz = list(positions.xs), list(positions.ys), list(positions.zs)
+    vx, vy, vz = list(velocities.xs), list(velocities.ys), list(velocities.zs)
+    # A shared environment stays scalar so each tick adds constants instead of zipping three columns.
+    if isinstance(gravity, VectorArray) or isinstance(wind, VectorArray):
+        uniform = False
+        gxs, gys, gzs = _per_projectile(gravity, count)
+        wxs, wys, wzs = _per_projectile(wind, count)
+        # When nothing moves along z the z column is carried over unchanged instead of recomputed every tick.
+        moves_in_z = any(vz) or any(gzs + wzs)
+    else:
+        uniform = True
+        # No per-projectile columns, so retiring projectiles below has nothing to compress in them.
+        gxs, gys, gzs, wxs, wys, wzs = [], [], [], [], [], []
+        gx, gy, gz = gravity.x, gravity.y, gravity.z
+        wx, wy, wz = wind.x, wind.y, wind.z
+        moves_in_z = any(vz) or any((gz, wz))
+
+    trajectories = BatchTrajectories(count)
+    z_snapshot = array("d", pz)
+    ticks = 0
+    while ids and (max_ticks is None or ticks < max_ticks):
+        if min(py) <= 0:
+            flying = [y > 0 for y in py]
+            ids = list(compress(ids, flying))
+            if not ids:
+                break
+            px, py, pz, vx, vy, vz = (list(compress(column, flying)) for column in (px, py, pz, vx, vy, vz))
+            gxs, gys, gzs, wxs, wys, wzs = (list(compress(column, flying)) for column in (gxs, gys, gzs, wxs, wys, wzs))
+            z_snapshot = array("d", pz)
+        elif moves_in_z:
+            z_snapshot = array("d", pz)
+        trajectories.steps.append((ids, array("d", px), array("d", py), z_snapshot))
+        px = [p + v for p, v in zip(px, vx, strict=True)]
+        py = [p + v for p, v in zip(py, vy, strict=True)]
+        if moves_in_z:
+            pz = [p + v for p, v in zip(pz, vz, strict=True)]
+        if uniform:
+            vx = [v + gx + wx for v in vx]
+            vy = [v + gy + wy for v in vy]
+            if moves_in_z:
+                vz = [v + gz + wz for v in vz]
+        else:
+            vx = [v + g + w for v, g, w in zip(vx, gxs, wxs, strict=True)]
+            vy = [v + g + w for v, g, w in zip(vy, gys, wys, strict=True)]
+            if moves_in_z:
+                vz = [v + g + w for v, g, w in zip(vz, gzs, wzs, strict=True)]
+        ticks += 1
+    return trajectories
+
+
+def _per_projectile(vectors: Vector | VectorArray, count: int) -> tuple[list[float], list[float], list[float]]:
+    if isinstance(vectors, VectorArray):
+        return list(vectors.xs), list(vectors.ys), list(vectors.zs)
+    return [vectors.x] * count, [vectors.y] * count, [vectors.z] * count
@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from raytracer.arrays import PointArray, VectorArray, transform
+from raytracer.matrices import Matrix, Matrix4
+from raytracer.tuples import Point, TupleFeature, Vector
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+
+class Ray:
+    __slots__ = ("origin", "direction")
+
+    def __init__(self, origin: TupleFeature, direction: TupleFeature) -> None:
+        self.origin = origin
+        self.direction = direction
+
+    def __repr__(self) -> str:
+        return f"Ray({self.origin!r}, {self.direction!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Ray):
+            return False
+        return self.origin == other.origin and self.direction == other.direction
+
+    def position(self, t: float) -> TupleFeature:
+        """The point ``t`` units of ``direction`` along the ray."""
+        return self.origin + self.direction * t
+
+    def transform(self, matrix: Matrix) -> Ray:
+        matrix = Matrix4.from_matrix(matrix)
+        return Ray(Point(matrix * self.origin.coords), Vector(matrix * self.direction.coords))
+
+
+class RayArray:
+    """Many rays as one ``PointArray`` of origins and one ``VectorArray`` of directions."""
+
+    def __init__(self, origins: PointArray, directions: VectorArray) -> None:
+        if len(origins) != len(directions):
+            msg = "origins and directions must have the same length"
+            raise ValueError(msg)
+        self.origins = origins
+        self.directions = directions
+
+    @classmethod
+    def from_rays(cls, rays: Sequence[Ray]) -> RayArray:
+        return cls(
+            PointArray.from_tuples([ray.origin for ray in rays]),
+            VectorArray.from_tuples([ray.direction for ray in rays]),
+        )
+
+    def to_list(self) -> list[Ray]:
+        return [
+            Ray(origin, direction)
+            for origin, direction in zip(self.origins.to_list(), self.directions.to_list(), strict=True)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.origins)
+
+    def __getitem__(self, index: int) -> Ray:
+        return Ray(self.origins[index], self.directions[index])
+
+    def __repr__(self) -> str:
+        return f"RayArray({self.origins!r}, {self.directions!r})"
+
+    def position(self, ts: Iterable[float]) -> PointArray:
+        """The point ``ts[i]`` units along ray ``i``, for every ray."""
+        ts = list(ts)
+        origins, directions = self.origins, self.directions
+        return PointArray(
+            [o + d * t for o, d, t in zip(origins.xs, directions.xs, ts, strict=True)],
+            [o + d * t for o, d, t in zip(origins.ys, directions.ys, ts, strict=True)],
+            [o + d * t for o, d, t in zip(origins.zs, directions.zs, ts, strict=True)],
+            [o + d * t for o, d, t in zip(origins.ws, directions.ws, ts, strict=True)],
+        )
+
+    def transform(self, matrix: Matrix) -> RayArray:
+        # Like Ray.transform, origins stay points and directions stay vectors even when the matrix changes w.
+        origins, directions = transform(matrix, self.origins), transform(matrix, self.directions)
+        return RayArray(
+            PointArray(origins.xs, origins.ys, origins.zs, origins.ws),
+            VectorArray(directions.xs, directions.ys, directions.zs, directions.ws),
+        )
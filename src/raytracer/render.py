@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Tiled rendering of a ``Canvas`` over a pool of worker processes.
+
+Shaders run in the workers, so they must be picklable: module-level functions or ``functools.partial`` objects
+wrapping them.
+"""
+from __future__ import annotations
+
+import os
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
+from raytracer.shared_canvas import SharedMemoryCanvas
+from raytracer.tuples import Color
+
+if TYPE_CHECKING:
+    from raytracer.canvas import Canvas
+
+PixelShader = Callable[[int, int], Color]
+
+
+class Tile:
+    def __init__(self, x: int, y: int, width: int, height: int) -> None:
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def __repr__(self) -> str:
+        return f"Tile({self.x}, {self.y}, {self.width}, {self.height})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Tile):
+            return False
+        return (self.x, self.y, self.width, self.height) == (other.x, other.y, other.width, other.height)
+
+
+TileShader = Callable[[Tile], Sequence[float]]
+
+
+def split_tiles(width: int, height: int, tile_size: int) -> list[Tile]:
+    """Cover a ``width x height`` canvas with tiles in row-major order; edge tiles are clipped."""
+    if tile_size <= 0:
+        msg = f"tile_size must be positive, got {tile_size}"
+        raise ValueError(msg)
+    return [
+        Tile(x, y, min(tile_size, width - x), min(tile_size, height - y))
+        for y in range(0, height, tile_size)
+        for x in range(0, width, tile_size)
+    ]
+
+
+def shade_tile(shader: PixelShader, tile: Tile) -> array:
+    """Run a per-pixel shader over ``tile`` and return its flat ``r, g, b`` components row by row."""
+    components = array("d")
+    for y in range(tile.y, tile.y + tile.height):
+        for x in range(tile.x, tile.x + tile.width):
+            components.extend(shader(x, y).rgb)
+    return components
+
+
+def _shade(tile_shader: TileShader, tile: Tile) -> tuple[Tile, Sequence[float]]:
+    return tile, tile_shader(tile)
+
+
+def render(
+    canvas: Canvas,
+    pixel_shader: PixelShader | None = None,
+    tile_shader: TileShader | None = None,
+    tile_size: int = 32,
+    workers: int | None = None,
+) -> Canvas:
+    """Shade every pixel of ``canvas`` tile by tile and write the results back in place.
+
+    Give either ``pixel_shader(x, y) -> Color`` or ``tile_shader(tile) -> flat r, g, b components``. Tiles are
+    dispatched over ``workers`` processes (``None`` uses every core, ``1`` renders in this process). Each tile
+    covers its own pixels, so the finished canvas does not depend on the order tiles complete in.
+    """
+    if pixel_shader is not None and tile_shader is None:
+        shader: TileShader = partial(shade_tile, pixel_shader)
+    elif tile_shader is not None and pixel_shader is None:
+        shader = tile_shader
+    else:
+        msg = "give exactly one of pixel_shader or tile_shader"
+        raise ValueError(msg)
+    tiles = split_tiles(canvas.width, canvas.height, tile_size)
+
+    if workers == 1:
+        results: Iterable[tuple[Tile, Sequence[float]]] = (_shade(shader, tile) for tile in tiles)
+        _assemble(canvas, results)
+    else:
+        # A few chunks per worker keeps the pool busy without paying inter-process overhead per tile.
+        chunksize = max(1, len(tiles) // (4 * (workers or os.cpu_count() or 1)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            if isinstance(canvas, SharedMemoryCanvas):
+                # Workers attach to the segment by name and write their tiles in place; only tiles come back.
+                for _tile in executor.map(partial(_shade_in_place, shader, canvas), tiles, chunksize=chunksize):
+                    pass
+            else:
+                _assemble(canvas, executor.map(partial(_shade, shader), tiles, chunksize=chunksize))
+    return canvas
+
+
+def _shade_in_place(tile_shader: TileShader, canvas: Canvas, tile: Tile) -> Tile:
+    canvas.write_array(tile_shader(tile), x=tile.x, y=tile.y, width=tile.width)
+    return tile
+
+
+def _assemble(canvas: Canvas, results: Iterable[tuple[Tile, Sequence[float]]]) -> None:
+    for tile, components in results:
+        canvas.write_array(components, x=tile.x, y=tile.y, width=tile.width)
@@ -0,0 +1,310 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Asyncio render server that streams finished rows back to its clients in order.
+
+A client connects over a Unix or TCP socket and sends one JSON line naming a tile shader registered on the server,
+with the image size and keyword arguments for the shader::
+
+    {"shader": "gradient", "width": 640, "height": 480, "params": {"scale": 2}}
+
+The server answers with JSON lines: ``{"status": "queued", ...}`` once the job is accepted, then for every band of
+rows ``{"rows": [first, stop], "bytes": n}`` followed by ``n`` bytes of quantized ``r, g, b`` components laid out
+like a P6 body, and finally ``{"status": "done"}``. A rejected or failed job gets ``{"status": "error", ...}``.
+
+At most ``max_jobs`` jobs run at once and at most ``max_queued`` wait behind them; further requests are turned
+away, as are images of more than ``max_pixels`` pixels. Bands are shaded on ``executor`` off the event loop, at
+most ``prefetch`` of them ahead of the slowest client, so a client that stops reading stalls its job instead of
+piling rows up in memory. Closing the connection or sending ``{"cancel": true}`` cancels the job, whether it is
+still queued or already running.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+from collections import Counter, deque
+from contextlib import suppress
+from functools import partial
+from typing import TYPE_CHECKING, Any, TypeGuard
+
+from raytracer.ppm import quantize
+from raytracer.render import Tile, TileShader
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Mapping
+    from concurrent.futures import Executor
+
+
+class RenderJobError(RuntimeError):
+    """Raised on the client side when the server rejects or fails a job."""
+
+
+def shade_band(shader: TileShader, band: Tile) -> bytes:
+    """Shade one band of rows and quantize it; module-level so process pools can run it."""
+    data = quantize(shader(band))
+    expected = band.width * band.height * 3
+    if len(data) != expected:
+        msg = f"shader returned {len(data)} components for a band of {expected}"
+        raise ValueError(msg)
+    return data
+
+
+class RenderJob:
+    def __init__(  # noqa: PLR0913
+        self,
+        job_id: int,
+        shader: str,
+        width: int,
+        height: int,
+        params: dict[str, Any],
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.id = job_id
+        self.shader = shader
+        self.width = width
+        self.height = height
+        self.params = params
+        self.writer = writer
+        self.done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self.task: asyncio.Task[None] | None = None
+
+    def __repr__(self) -> str:
+        return f"RenderJob({self.id}, {self.shader!r}, {self.width}x{self.height})"
+
+    def cancel(self) -> None:
+        """Drop the job if it is still queued, or stop shading and streaming it if it is running."""
+        if self.task is not None:
+            self.task.cancel()
+        else:
+            self.done.cancel()
+
+
+class RenderServer:
+    def __init__(  # noqa: PLR0913
+        self,
+        shaders: Mapping[str, TileShader],
+        executor: Executor | None = None,
+        max_jobs: int = 2,
+        max_queued: int = 16,
+        rows_per_band: int = 16,
+        prefetch: int = 4,
+        write_buffer: int = 64 * 1024,
+        max_pixels: int = 4096 * 4096,
+    ) -> None:
+        """Serve the tile ``shaders`` by name; ``executor=None`` shades on the event loop's default executor.
+
+        Shaders are called as ``shader(tile, **params)`` with one full-width band of rows at a time. A
+        ``ProcessPoolExecutor`` needs them picklable, like the shaders ``render`` takes. ``max_pixels`` bounds
+        ``width * height`` of a request, and with it the band sizes and work one client can ask for.
+        """
+        if min(max_jobs, max_queued, rows_per_band, prefetch, max_pixels) <= 0:
+            msg = "max_jobs, max_queued, rows_per_band, prefetch and max_pixels must be positive"
+            raise ValueError(msg)
+        self.shaders = dict(shaders)
+        self.executor = executor
+        self.max_jobs = max_jobs
+        self.max_queued = max_queued
+        self.rows_per_band = rows_per_band
+        self.prefetch = prefetch
+        self.write_buffer = write_buffer
+        self.max_pixels = max_pixels
+        # "accepted", "rejected", "completed", "cancelled" and "failed" jobs.
+        self.stats: Counter[str] = Counter()
+        self._ids = itertools.count(1)
+        self._queue: asyncio.Queue[RenderJob] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """Listen on TCP; port ``0`` picks a free one, found in ``server.sockets[0].getsockname()``."""
+        self._start_workers()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def start_unix(self, path: str | os.PathLike[str]) -> asyncio.Server:
+        self._start_workers()
+        self._server = await asyncio.start_unix_server(self._handle, os.fspath(path))
+        return self._server
+
+    async def close(self) -> None:
+        """Stop listening and cancel every queued and running job."""
+        if self._server is not None:
+            self._server.close()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait().cancel()
+        if self._server is not None:
+            # Only now, with every job cancelled, can the connection handlers finish.
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> RenderServer:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    def _start_workers(self) -> None:
+        if self._queue is None:
+            # Idle workers take jobs off the queue at once, so it only ever holds jobs that are waiting.
+            self._queue = asyncio.Queue(self.max_queued)
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.max_jobs)]
+
+    def _parse(self, line: bytes, writer: asyncio.StreamWriter) -> RenderJob:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            msg = "request must be one line of JSON"
+            raise ValueError(msg) from None
+        if not isinstance(request, dict):
+            msg = "request must be a JSON object"
+            raise ValueError(msg)
+        shader = request.get("shader")
+        if shader not in self.shaders:
+            msg = f"unknown shader {shader!r}"
+            raise ValueError(msg)
+        width, height = request.get("width"), request.get("height")
+        # JSON true and false decode to bools, which are ints too.
+        if not (_is_positive_int(width) and _is_positive_int(height)):
+            msg = f"width and height must be positive integers, got {width!r} and {height!r}"
+            raise ValueError(msg)
+        if width * height > self.max_pixels:
+            msg = f"a {width}x{height} image exceeds the limit of {self.max_pixels} pixels"
+            raise ValueError(msg)
+        params = request.get("params", {})
+        if not isinstance(params, dict):
+            msg = "params must be a JSON object"
+            raise ValueError(msg)
+        return RenderJob(next(self._ids), shader, width, height, params, writer)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.transport.set_write_buffer_limits(high=self.write_buffer)
+        try:
+            try:
+                job = self._parse(await reader.readline(), writer)
+            except ValueError as error:
+                self.stats["rejected"] += 1
+                await _send(writer, {"status": "error", "message": str(error)})
+                return
+            queue = self._queue
+            assert queue is not None  # noqa: S101
+            if queue.full():
+                self.stats["rejected"] += 1
+                await _send(writer, {"status": "error", "message": "server busy"})
+                return
+            queue.put_nowait(job)
+            self.stats["accepted"] += 1
+            await _send(writer, {"status": "queued", "job": job.id, "position": queue.qsize()})
+            # The only thing a client may send while its job is pending is a cancel request; EOF counts as one.
+            cancel_request = asyncio.ensure_future(reader.readline())
+            waiters: list[asyncio.Future[Any]] = [job.done, cancel_request]
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            if not job.done.done():
+                job.cancel()
+            cancel_request.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await job.done
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _work(self) -> None:
+        queue = self._queue
+        assert queue is not None  # noqa: S101
+        while True:
+            job = await queue.get()
+            if job.done.done():
+                # Cancelled while it was waiting in the queue.
+                self.stats["cancelled"] += 1
+                continue
+            job.task = asyncio.create_task(self._run(job))
+            try:
+                await asyncio.wait([job.task])
+            except asyncio.CancelledError:
+                # The server is closing.
+                job.task.cancel()
+                job.done.cancel()
+                raise
+            if job.task.cancelled():
+                self.stats["cancelled"] += 1
+                job.done.cancel()
+            elif job.task.exception() is not None:
+                self.stats["failed"] += 1
+                job.done.set_exception(job.task.exception())  # type: ignore[arg-type]
+            else:
+                self.stats["completed"] += 1
+                job.done.set_result(None)
+
+    async def _run(self, job: RenderJob) -> None:
+        loop = asyncio.get_running_loop()
+        shader = self.shaders[job.shader]
+        if job.params:
+            shader = partial(shader, **job.params)
+        rows = self.rows_per_band
+        bands = iter([Tile(0, y, job.width, min(rows, job.height - y)) for y in range(0, job.height, rows)])
+        writer = job.writer
+        pending: deque[tuple[Tile, asyncio.Future[bytes]]] = deque()
+
+        def submit(band: Tile | None) -> None:
+            if band is not None:
+                pending.append((band, loop.run_in_executor(self.executor, shade_band, shader, band)))
+
+        try:
+            for band in itertools.islice(bands, self.prefetch):
+                submit(band)
+            while pending:
+                band, future = pending.popleft()
+                try:
+                    data = await future
+                except Exception as error:
+                    await _send(writer, {"status": "error", "message": f"{type(error).__name__}: {error}"})
+                    raise
+                submit(next(bands, None))
+                header = {"rows": [band.y, band.y + band.height], "bytes": len(data)}
+                writer.write(json.dumps(header).encode("ascii") + b"\n" + data)
+                # Waits while the client is behind, which keeps shading no more than ``prefetch`` bands ahead.
+                await writer.drain()
+            await _send(writer, {"status": "done"})
+        finally:
+            for _band, future in pending:
+                future.cancel()
+
+
+def _is_positive_int(value: object) -> TypeGuard[int]:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    writer.write(json.dumps(message).encode("ascii") + b"\n")
+    await writer.drain()
+
+
+async def stream_rows(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: Mapping[str, Any]
+) -> AsyncIterator[tuple[int, bytes]]:
+    """Client side: send ``request`` and yield ``(first_row, data)`` for each band as the server streams it.
+
+    Bands arrive in row order. Closing ``writer`` or sending ``{"cancel": true}`` on it cancels the job.
+    """
+    writer.write(json.dumps(dict(request)).encode("ascii") + b"\n")
+    await writer.drain()
+    while True:
+        line = await reader.readline()
+        if not line:
+            msg = "connection closed before the job finished"
+            raise RenderJobError(msg)
+        message = json.loads(line)
+        if "rows" in message:
+            yield message["rows"][0], await reader.readexactly(message["bytes"])
+        elif message.get("status") == "done":
+            return
+        elif message.get("status") == "error":
+            raise RenderJobError(message.get("message", "render job failed"))
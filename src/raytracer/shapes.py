@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Shapes in object space. ``raytracer.intersections`` moves rays into that space before calling them."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+from math import nan, sqrt
+from typing import TYPE_CHECKING
+
+from raytracer.bounds import BoundingBox
+from raytracer.matrices import Matrix, Matrix4, identity_matrix4
+from raytracer.transformations import Transform
+
+if TYPE_CHECKING:
+    from raytracer.rays import Ray, RayArray
+
+
+class Shape(ABC):
+    def __init__(self, transform: Matrix | Transform | None = None) -> None:
+        if isinstance(transform, Transform):
+            transform = transform.matrix
+        self.transform = Matrix4.from_matrix(transform) if transform is not None else identity_matrix4
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.transform!r})"
+
+    @abstractmethod
+    def bounds(self) -> BoundingBox:
+        """Object-space box enclosing the shape."""
+
+    def parent_space_bounds(self) -> BoundingBox:
+        """Box enclosing the shape after its ``transform``, in the space its rays are given in."""
+        return self.bounds().transform(self.transform)
+
+    @abstractmethod
+    def local_intersect(self, ray: Ray) -> list[float]:
+        """Sorted distances along an object-space ``ray`` where it crosses the surface."""
+
+    @abstractmethod
+    def local_intersect_batch(self, rays: RayArray) -> tuple[array, array]:
+        """Near and far distances for every object-space ray, ``nan`` where a ray misses."""
+
+
+class Sphere(Shape):
+    """Unit sphere centred on the object-space origin."""
+
+    def bounds(self) -> BoundingBox:
+        return BoundingBox((-1, -1, -1), (1, 1, 1))
+
+    def local_intersect(self, ray: Ray) -> list[float]:
+        origin, direction = ray.origin, ray.direction
+        roots = _sphere_roots(origin.x, origin.y, origin.z, direction.x, direction.y, direction.z)
+        return list(roots) if roots is not None else []
+
+    def local_intersect_batch(self, rays: RayArray) -> tuple[array, array]:
+        origins, directions = rays.origins, rays.directions
+        near: list[float] = []
+        far: list[float] = []
+        append_near, append_far = near.append, far.append
+        # One fused loop per ray beats a comprehension per intermediate column, which allocates five lists.
+        # The arithmetic is _sphere_roots inlined operation for operation, so results match the scalar path.
+        if _shared_origin(origins.xs, origins.ys, origins.zs):
+            # Primary rays all leave the camera, so the origin-only term is computed once.
+            ox, oy, oz = origins.xs[0], origins.ys[0], origins.zs[0]
+            c4 = 4 * (ox * ox + oy * oy + oz * oz - 1)
+            for dx, dy, dz in zip(directions.xs, directions.ys, directions.zs, strict=True):
+                a = dx * dx + dy * dy + dz * dz
+                b = 2 * (dx * ox + dy * oy + dz * oz)
+                discriminant = b * b - a * c4
+                if discriminant < 0:
+                    append_near(nan)
+                    append_far(nan)
+                else:
+                    root = sqrt(discriminant)
+                    append_near((-b - root) / (2 * a))
+                    append_far((-b + root) / (2 * a))
+        else:
+            for ox, oy, oz, dx, dy, dz in zip(
+                origins.xs, origins.ys, origins.zs, directions.xs, directions.ys, directions.zs, strict=True
+            ):
+                a = dx * dx + dy * dy + dz * dz
+                b = 2 * (dx * ox + dy * oy + dz * oz)
+                discriminant = b * b - a * (4 * (ox * ox + oy * oy + oz * oz - 1))
+                if discriminant < 0:
+                    append_near(nan)
+                    append_far(nan)
+                else:
+                    root = sqrt(discriminant)
+                    append_near((-b - root) / (2 * a))
+                    append_far((-b + root) / (2 * a))
+        return array("d", near), array("d", far)
+
+
+def _shared_origin(xs: array, ys: array, zs: array) -> bool:
+    return bool(xs) and xs.count(xs[0]) == len(xs) and ys.count(ys[0]) == len(ys) and zs.count(zs[0]) == len(zs)
+
+
+def _sphere_roots(  # noqa: PLR0913
+    ox: float, oy: float, oz: float, dx: float, dy: float, dz: float
+) -> tuple[float, float] | None:
+    # The vector from the sphere's centre to the ray origin is just the origin's coordinates.
+    a = dx * dx + dy * dy + dz * dz
+    b = 2 * (dx * ox + dy * oy + dz * oz)
+    discriminant = b * b - a * (4 * (ox * ox + oy * oy + oz * oz - 1))
+    if discriminant < 0:
+        return None
+    root = sqrt(discriminant)
+    return (-b - root) / (2 * a), (-b + root) / (2 * a)
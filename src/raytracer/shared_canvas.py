@@ -0,0 +1,172 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""``ArrayCanvas`` whose pixel buffer lives in ``multiprocessing.shared_memory``.
+
+The creating process owns the segment. Workers ``attach`` to it by name and write pixels in place, so nothing is
+pickled or copied on the way back. The owner unlinks the segment on ``close()``, when the canvas is garbage
+collected, or at interpreter exit; if the owner is killed outright, the multiprocessing resource tracker removes
+it instead.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import weakref
+from array import array
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
+
+from raytracer.canvas import ARRAY_TYPECODES, ArrayCanvas
+from raytracer.tuples import Color
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import TracebackType
+
+# Segments created by this process, and so registered with its resource tracker. A forked child inherits both this
+# set and the tracker.
+_created: set[str] = set()
+
+# (st_dev, st_ino) of the pipe to a resource tracker, which identifies it across processes.
+TrackerId = tuple[int, int]
+
+
+def _tracker_id() -> TrackerId | None:
+    """This process's resource tracker; processes started through ``multiprocessing`` share their parent's."""
+    fd = resource_tracker.getfd() if os.name == "posix" else None
+    if fd is None:
+        return None
+    info = os.fstat(fd)
+    return info.st_dev, info.st_ino
+
+
+def _attach_untracked(name: str, owner_tracker: TrackerId | None) -> SharedMemory:
+    """Open an existing segment without leaving it registered with a resource tracker it does not belong to.
+
+    Before Python 3.13 every ``SharedMemory`` is registered, and a tracker unlinks what is still registered once
+    the processes using it are gone, so a process with a tracker of its own would unlink the owner's segment when
+    it exits. There the registration is undone right after attaching. Processes sharing the owner's tracker, like
+    the owner itself and the workers it starts, leave it alone: the tracker keeps one entry per name, and
+    unregistering would drop the owner's.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    shm = SharedMemory(name=name)
+    if os.name == "posix" and shm.name not in _created and owner_tracker != _tracker_id():
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+def _release(views: list[memoryview], shm: SharedMemory, unlink: bool) -> None:  # noqa: FBT001
+    for view in reversed(views):
+        view.release()
+    shm.close()
+    if unlink:
+        _created.discard(shm.name)
+        shm.unlink()
+
+
+class SharedMemoryCanvas(ArrayCanvas):
+    # Other processes write into the segment behind this object's back, so encoded rows are never cached.
+    tracks_dirty_rows = False
+
+    def __init__(  # noqa: PLR0913
+        self,
+        width: int,
+        height: int,
+        bg_color: Color | None = None,
+        typecode: str = "d",
+        name: str | None = None,
+    ) -> None:
+        _check_typecode(typecode)
+        shm = SharedMemory(name=name, create=True, size=max(width * height * 3 * array(typecode).itemsize, 1))
+        _created.add(shm.name)
+        self._setup(width, height, typecode, shm)
+        self.owner = True
+        self.tracker = _tracker_id()
+        self._finalizer = weakref.finalize(self, _release, self._views, self.shm, True)  # noqa: FBT003
+        self.fill_region(0, 0, width, height, bg_color if bg_color is not None else Color(0, 0, 0))
+
+    @classmethod
+    def attach(  # noqa: PLR0913
+        cls, name: str, width: int, height: int, typecode: str = "d", owner_tracker: TrackerId | None = None
+    ) -> SharedMemoryCanvas:
+        """Map an existing canvas created in another process; closing it never unlinks the segment.
+
+        ``owner_tracker`` is the owner's ``tracker``; pickling passes it along, so attaching does not disturb
+        the resource tracker the owner shares with its workers.
+        """
+        _check_typecode(typecode)
+        canvas = cls.__new__(cls)
+        canvas._setup(width, height, typecode, _attach_untracked(name, owner_tracker))
+        canvas.owner = False
+        canvas.tracker = owner_tracker
+        canvas._finalizer = weakref.finalize(canvas, _release, canvas._views, canvas.shm, False)  # noqa: FBT003
+        return canvas
+
+    def _setup(self, width: int, height: int, typecode: str, shm: SharedMemory) -> None:
+        self.width = width
+        self.height = height
+        self.dirty_rows = set()
+        self.typecode = typecode
+        self.shm = shm
+        raw = shm.buf[: width * height * 3 * array(typecode).itemsize]
+        buffer = raw.cast(typecode)
+        self.buffer = buffer  # type: ignore[assignment]
+        self._views = [raw, buffer]
+
+    def __reduce__(self) -> tuple[object, tuple[str, int, int, str, TrackerId | None]]:
+        # Pickling hands out the segment name, so worker processes attach instead of copying pixels.
+        return (_attach_cached, (self.name, self.width, self.height, self.typecode, self.tracker))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def row_components(self, y: int) -> Sequence[float]:
+        # Copy the row so no view into the segment outlives close().
+        start = y * self.width * 3
+        return self.buffer[start : start + self.width * 3].tolist()
+
+    def close(self) -> None:
+        """Detach from the segment, and unlink it too when this process created it."""
+        self._finalizer()
+
+    def __enter__(self) -> SharedMemoryCanvas:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+
+def _check_typecode(typecode: str) -> None:
+    if typecode not in ARRAY_TYPECODES:
+        msg = f"typecode must be one of {ARRAY_TYPECODES}, got {typecode!r}"
+        raise ValueError(msg)
+
+
+# Keyed on the shape too, so a segment name reused for a differently shaped canvas never returns the old view.
+# Entries are weak: a mapping is closed once nothing uses it, except for the one in _recent.
+_attached: weakref.WeakValueDictionary[tuple[str, int, int, str], SharedMemoryCanvas] = weakref.WeakValueDictionary()
+# The most recently attached canvas stays mapped between the tiles a worker renders into it.
+_recent: list[SharedMemoryCanvas] = []
+
+
+def _attach_cached(
+    name: str, width: int, height: int, typecode: str, owner_tracker: TrackerId | None = None
+) -> SharedMemoryCanvas:
+    """Attach once per canvas, so a worker reuses its mapping across tiles instead of mapping every one."""
+    key = (name, width, height, typecode)
+    canvas = _attached.get(key)
+    if canvas is None or canvas.closed:
+        canvas = _attached[key] = SharedMemoryCanvas.attach(name, width, height, typecode, owner_tracker)
+    _recent[:] = [canvas]
+    return canvas
@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Canvas that only stores the square tiles that have been written to.
+
+Every other pixel reads as ``bg_color``. A row that crosses no stored tile is all background, and ``row_bytes``
+returns one quantized background row that is computed once, so the PPM encoders spend their time on the written
+area; ``encode_p3_rows`` also reuses the text of rows it has already encoded in the same call. Every write goes
+through the canvas methods, so ``canvas_to_ppm`` caches encoded rows and re-encodes only the rows written since.
+Colors are stored as given: code that mutates a written ``Color`` or edits ``tiles`` directly must call
+``mark_dirty``.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from raytracer.canvas import RowCachingCanvas, block_width, check_block, clip_region
+from raytracer.ppm import quantize
+from raytracer.tuples import Color
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+TILE_SIZE = 64
+
+Tile = list[list[Color]]
+
+
+class SparseCanvas(RowCachingCanvas):
+    def __init__(self, width: int, height: int, bg_color: Color | None = None, tile_size: int = TILE_SIZE) -> None:
+        if tile_size <= 0:
+            msg = f"tile_size must be positive, got {tile_size}"
+            raise ValueError(msg)
+        self.width = width
+        self.height = height
+        self.dirty_rows = set()
+        self.bg_color = bg_color if bg_color is not None else Color(0, 0, 0)
+        self.tile_size = tile_size
+        # (column, row) of the tile -> its rows of pixels, clipped to the canvas edges.
+        self.tiles: dict[tuple[int, int], Tile] = {}
+        self._tiles_across = -(-width // tile_size)
+        self._bg_row_bytes = quantize(self.bg_color.rgb) * width
+
+    @property
+    def pixels(self) -> list[list[Color]]:  # type: ignore[override]
+        """A freshly built list-of-rows copy of the whole canvas; avoid on large canvases."""
+        return [[self.pixel_at(x, y) for x in range(self.width)] for y in range(self.height)]
+
+    def _tile(self, column: int, row: int) -> Tile:
+        tile = self.tiles.get((column, row))
+        if tile is None:
+            size = self.tile_size
+            width = min(size, self.width - column * size)
+            height = min(size, self.height - row * size)
+            tile = self.tiles[column, row] = [[self.bg_color] * width for _ in range(height)]
+        return tile
+
+    def _row_segments(self, y: int) -> list[tuple[int, list[Color]]]:
+        """``(x, pixels)`` of every stored tile's part of row ``y``, left to right."""
+        size = self.tile_size
+        row, offset = divmod(y, size)
+        tiles = self.tiles
+        return [
+            (column * size, tile[offset])
+            for column in range(self._tiles_across)
+            if (tile := tiles.get((column, row))) is not None
+        ]
+
+    def write_pixel(self, x: int, y: int, color: Color) -> None:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            msg = f"pixel ({x}, {y}) is outside the {self.width}x{self.height} canvas"
+            raise IndexError(msg)
+        size = self.tile_size
+        self._tile(x // size, y // size)[y % size][x % size] = color
+        if self._p3_rows is not None:
+            self.dirty_rows.add(y)
+
+    def pixel_at(self, x: int, y: int) -> Color:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            msg = f"pixel ({x}, {y}) is outside the {self.width}x{self.height} canvas"
+            raise IndexError(msg)
+        size = self.tile_size
+        tile = self.tiles.get((x // size, y // size))
+        return self.bg_color if tile is None else tile[y % size][x % size]
+
+    def fill_region(self, x: int, y: int, width: int, height: int, color: Color) -> None:  # noqa: PLR0913
+        x, y, x_stop, y_stop = clip_region(self, x, y, width, height)
+        if x == x_stop or y == y_stop:
+            # Nothing on the canvas to paint, and no tile to allocate for it.
+            return
+        size = self.tile_size
+        is_bg = color.rgb == self.bg_color.rgb
+        for row in range(y // size, -(-y_stop // size)):
+            for column in range(x // size, -(-x_stop // size)):
+                left, top = column * size, row * size
+                if is_bg and (column, row) not in self.tiles:
+                    # Unstored tiles already read as the background.
+                    continue
+                tile = self._tile(column, row)
+                start, stop = max(x, left) - left, min(x_stop, left + size) - left
+                for line in tile[max(y, top) - top : min(y_stop, top + size) - top]:
+                    line[start:stop] = [color] * (stop - start)
+        self.mark_dirty(y, y_stop)
+
+    def write_row(self, y: int, colors: Sequence[Color], x: int = 0) -> None:
+        check_block(self, x, y, len(colors), 1)
+        size = self.tile_size
+        position = 0
+        while position < len(colors):
+            column, offset = divmod(x + position, size)
+            run = min(size - offset, len(colors) - position)
+            self._tile(column, y // size)[y % size][offset : offset + run] = colors[position : position + run]
+            position += run
+        self.mark_dirty(y, y + 1)
+
+    def write_array(self, values: Sequence[float], x: int = 0, y: int = 0, width: int | None = None) -> None:
+        width = block_width(self, values, x, width)
+        stride = width * 3
+        check_block(self, x, y, width, len(values) // stride)
+        for row, start in enumerate(range(0, len(values), stride)):
+            components = values[start : start + stride]
+            self.write_row(y + row, [Color(*components[i : i + 3]) for i in range(0, stride, 3)], x=x)
+
+    def row_components(self, y: int) -> Sequence[float]:
+        components = list(self.bg_color.rgb) * self.width
+        for x, pixels in self._row_segments(y):
+            components[x * 3 : (x + len(pixels)) * 3] = [component for pixel in pixels for component in pixel.rgb]
+        return components
+
+    def row_bytes(self, y: int) -> bytes:
+        segments = self._row_segments(y)
+        if not segments:
+            return self._bg_row_bytes
+        row = bytearray(self._bg_row_bytes)
+        for x, pixels in segments:
+            row[x * 3 : (x + len(pixels)) * 3] = quantize([component for pixel in pixels for component in pixel.rgb])
+        return bytes(row)
+
+    def to_bytes(self, transfer: str = "linear", gamma: float = 2.2) -> bytes:
+        if transfer == "linear":
+            return b"".join([self.row_bytes(y) for y in range(self.height)])
+        return super().to_bytes(transfer, gamma)
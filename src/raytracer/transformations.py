@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2023-present Jason Washburn <jason.washburn@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from math import cos, sin
+from typing import TYPE_CHECKING, overload
+
+from raytracer.matrices import Matrix4, identity_matrix4, inverse_cache
+from raytracer.rays import Ray
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from raytracer.tuples import TupleFeature
+
+
+def translation(x: float, y: float, z: float) -> Matrix4:
+    return Matrix4((1, 0, 0, x, 0, 1, 0, y, 0, 0, 1, z, 0, 0, 0, 1))
+
+
+def scaling(x: float, y: float, z: float) -> Matrix4:
+    return Matrix4((x, 0, 0, 0, 0, y, 0, 0, 0, 0, z, 0, 0, 0, 0, 1))
+
+
+def rotation_x(radians: float) -> Matrix4:
+    c, s = cos(radians), sin(radians)
+    return Matrix4((1, 0, 0, 0, 0, c, -s, 0, 0, s, c, 0, 0, 0, 0, 1))
+
+
+def rotation_y(radians: float) -> Matrix4:
+    c, s = cos(radians), sin(radians)
+    return Matrix4((c, 0, s, 0, 0, 1, 0, 0, -s, 0, c, 0, 0, 0, 0, 1))
+
+
+def rotation_z(radians: float) -> Matrix4:
+    c, s = cos(radians), sin(radians)
+    return Matrix4((c, -s, 0, 0, s, c, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1))
+
+
+def shearing(x_y: float, x_z: float, y_x: float, y_z: float, z_x: float, z_y: float) -> Matrix4:  # noqa: PLR0913
+    """Move each coordinate in proportion to the other two, e.g. ``x += x_y * y + x_z * z``."""
+    return Matrix4((1, x_y, x_z, 0, y_x, 1, y_z, 0, z_x, z_y, 1, 0, 0, 0, 0, 1))
+
+
+_STEPS: dict[str, Callable[..., Matrix4]] = {
+    "translate": translation,
+    "scale": scaling,
+    "rotate_x": rotation_x,
+    "rotate_y": rotation_y,
+    "rotate_z": rotation_z,
+    "shear": shearing,
+}
+
+
+class Transform:
+    """Immutable, fluent chain of transformations, applied in the order they are called.
+
+    ``Transform().rotate_x(r).scale(5, 5, 5).translate(10, 5, 7)`` rotates first and translates last, so its
+    ``matrix`` equals ``translation(10, 5, 7) * scaling(5, 5, 5) * rotation_x(r)``. Recording a step is cheap; the
+    steps are only built and multiplied together the first time ``matrix`` is needed, and the product and its
+    inverse are then kept on the chain.
+    """
+
+    __slots__ = ("steps", "_matrix", "_inverse")
+
+    def __init__(self, steps: tuple[tuple[str, tuple[float, ...]], ...] = ()) -> None:
+        self.steps = steps
+        self._matrix: Matrix4 | None = None
+        self._inverse: Matrix4 | None = None
+
+    def __repr__(self) -> str:
+        calls = "".join(f".{name}({', '.join(map(repr, args))})" for name, args in self.steps)
+        return f"Transform(){calls}"
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def _then(self, name: str, *args: float) -> Transform:
+        return Transform((*self.steps, (name, args)))
+
+    def translate(self, x: float, y: float, z: float) -> Transform:
+        return self._then("translate", x, y, z)
+
+    def scale(self, x: float, y: float, z: float) -> Transform:
+        return self._then("scale", x, y, z)
+
+    def rotate_x(self, radians: float) -> Transform:
+        return self._then("rotate_x", radians)
+
+    def rotate_y(self, radians: float) -> Transform:
+        return self._then("rotate_y", radians)
+
+    def rotate_z(self, radians: float) -> Transform:
+        return self._then("rotate_z", radians)
+
+    def shear(  # noqa: PLR0913
+        self, x_y: float, x_z: float, y_x: float, y_z: float, z_x: float, z_y: float
+    ) -> Transform:
+        return self._then("shear", x_y, x_z, y_x, y_z, z_x, z_y)
+
+    @property
+    def matrix(self) -> Matrix4:
+        """The whole chain as one matrix, folded on first use."""
+        if self._matrix is None:
+            if not self.steps:
+                self._matrix = identity_matrix4
+            else:
+                # Multiply from the last step back, the grouping of writing ``last * ... * first`` left to right.
+                matrices = [_STEPS[name](*args) for name, args in reversed(self.steps)]
+                folded = matrices[0]
+                for step in matrices[1:]:
+                    folded = folded * step
+                self._matrix = folded
+        return self._matrix
+
+    @property
+    def inverse(self) -> Matrix4:
+        if self._inverse is None:
+            self._inverse = inverse_cache.inverse(self.matrix)
+        return self._inverse
+
+    @overload
+    def apply(self, target: Ray) -> Ray:
+        ...
+
+    @overload
+    def apply(self, target: TupleFeature) -> TupleFeature:
+        ...
+
+    def apply(self, target: Ray | TupleFeature) -> Ray | TupleFeature:
+        """Transform a ray, point or vector by the folded matrix."""
+        if isinstance(target, Ray):
+            return target.transform(self.matrix)
+        return type(target)(self.matrix * target.coords)
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+from array import array
 from math import isclose, sqrt
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
 
 
 class TupleFeature:
+    __slots__ = ("x", "y", "z", "w")
+
     def __init__(self, coords: tuple[float, float, float, float]) -> None:
-        self.coords = coords
-        self.x = coords[0]
-        self.y = coords[1]
-        self.z = coords[2]
-        self.w = coords[3]
+        self.x, self.y, self.z, self.w = coords
+
+    @property
+    def coords(self) -> tuple[float, float, float, float]:
+        return (self.x, self.y, self.z, self.w)
 
     @property
     def is_point(self) -> bool:
@@ -63,28 +70,31 @@ class TupleFeature:
 
 
 class Point(TupleFeature):
-    def __init__(self, coords: tuple[float, float, float, float]) -> None:
-        super().__init__(coords)
+    __slots__ = ()
 
     def __repr__(self) -> str:
         return f"Point({self.coords})"
 
 
 class Vector(TupleFeature):
-    def __init__(self, coords: tuple[float, float, float, float]) -> None:
-        super().__init__(coords)
+    __slots__ = ()
 
     def __repr__(self) -> str:
         return f"Vector({self.coords})"
 
 
 class Color:
+    __slots__ = ("red", "green", "blue")
+
     def __init__(self, red: float, green: float, blue: float) -> None:
-        self.rgb = (red, green, blue)
         self.red = red
         self.green = green
         self.blue = blue
 
+    @property
+    def rgb(self) -> tuple[float, float, float]:
+        return (self.red, self.green, self.blue)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Color):
             return False
@@ -112,16 +122,16 @@ class Color:
         return (red, green, blue)
 
     def __mul__(self, other: int | float | Color) -> Color:
-        if isinstance(other, int | float):
-            red = self.red * other
-            green = self.green * other
-            blue = self.blue * other
-            return Color(red, green, blue)
         if isinstance(other, Color):
             red = self.red * other.red
             green = self.green * other.green
             blue = self.blue * other.blue
             return Color(red, green, blue)
+        if isinstance(other, int | float):
+            red = self.red * other
+            green = self.green * other
+            blue = self.blue * other
+            return Color(red, green, blue)
 
 
 def point(x: float, y: float, z: float, w: float = 1) -> Point:
@@ -155,6 +165,29 @@ def cross(vec_a: Vector, vec_b: Vector) -> Vector:
     )
 
 
+def pack_tuples(features: Iterable[TupleFeature]) -> array:
+    """Pack tuples into a flat row-major ``N x 4`` ``array("d")`` of ``x, y, z, w`` values."""
+    return array("d", [coord for feature in features for coord in feature.coords])
+
+
+def unpack_tuples(batch: Sequence[float]) -> list[TupleFeature]:
+    """Unpack a flat ``N x 4`` batch, returning a ``Point`` for ``w == 1`` and a ``Vector`` for ``w == 0``."""
+    if len(batch) % 4:
+        msg = f"expected a flat N x 4 batch, got {len(batch)} values"
+        raise ValueError(msg)
+    it = iter(batch)
+    features: list[TupleFeature] = []
+    for coords in zip(it, it, it, it, strict=True):
+        w = coords[3]
+        if w == 1:
+            features.append(Point(coords))
+        elif w == 0:
+            features.append(Vector(coords))
+        else:
+            features.append(TupleFeature(coords))
+    return features
+
+
 def clamp(n: int, clamp_min: int, clamp_max: int) -> int:
     if n > clamp_max:
         return clamp_max
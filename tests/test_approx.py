@@ -0,0 +1,70 @@
+from math import inf, nan
+
+import pytest
+
+from raytracer.approx import ColorKey, MatrixKey, all_close, canvases_close, colors_close, matrices_close
+from raytracer.canvas import ArrayCanvas, Canvas, write_pixel
+from raytracer.matrices import Matrix, Matrix4, identity_matrix, identity_matrix4
+from raytracer.tuples import Color
+
+
+def test_all_close_uses_an_absolute_tolerance() -> None:
+    assert all_close([1, 2, 3], [1.000001, 2, 2.999999])
+    assert not all_close([1, 2, 3], [1, 2, 3.001])
+    assert all_close([0.0], [1e-3], abs_tol=1e-2)
+    assert not all_close([nan], [nan])
+    assert not all_close([1, 2, 3], [1])
+    assert not all_close([], [0.0])
+    assert all_close(iter([1.0]), [1.0])
+
+
+def test_matrices_and_colors_close() -> None:
+    nudged = Matrix4([value + 1e-7 for value in identity_matrix4.values])
+    assert matrices_close(identity_matrix, nudged)
+    assert matrices_close(nudged, identity_matrix4)
+    assert not matrices_close(identity_matrix, Matrix([[1, 0], [0, 1]]))
+    assert not matrices_close(identity_matrix4, Matrix4([2, *identity_matrix4.values[1:]]))
+    assert colors_close(Color(0.1, 0.2, 0.3), Color(0.1 + 1e-7, 0.2, 0.3 - 1e-7))
+    assert not colors_close(Color(0.1, 0.2, 0.3), Color(0.1, 0.2, 0.31))
+
+
+@pytest.mark.parametrize("kinds", [(Canvas, Canvas), (ArrayCanvas, ArrayCanvas), (Canvas, ArrayCanvas)])
+def test_canvases_close(kinds: tuple[type[Canvas], type[Canvas]]) -> None:
+    a, b = kinds[0](4, 3), kinds[1](4, 3)
+    write_pixel(a, 1, 2, Color(0.5, 0.25, 1))
+    write_pixel(b, 1, 2, Color(0.5 + 1e-7, 0.25, 1))
+    assert canvases_close(a, b)
+    write_pixel(b, 3, 0, Color(0.01, 0, 0))
+    assert not canvases_close(a, b)
+    assert canvases_close(a, b, abs_tol=0.1)
+    assert not canvases_close(a, kinds[1](4, 2))
+
+
+def test_matrix_keys_deduplicate_nearly_equal_transforms() -> None:
+    a = Matrix4((1, 0, 0, 0.3, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1))
+    b = Matrix4((1, 0, 0, 0.1 + 0.2, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1))
+    assert a.values != b.values
+    cache = {MatrixKey(a): "a"}
+    assert cache[MatrixKey(b)] == "a"
+    assert MatrixKey(a) == MatrixKey(Matrix(a.elements))
+    assert hash(MatrixKey(a)) == hash(MatrixKey(b))
+    assert MatrixKey(a) != MatrixKey(identity_matrix4)
+    assert MatrixKey(a) != MatrixKey(a, epsilon=1e-3)
+    assert MatrixKey(Matrix([[1, 2], [3, 4]])) != MatrixKey(Matrix([[1, 2, 3, 4]]))
+
+
+def test_matrix_key_snapshots_mutable_matrices() -> None:
+    matrix = Matrix([[1, 2], [3, 4]])
+    key = MatrixKey(matrix)
+    matrix[0, 0] = 10
+    assert key == MatrixKey(Matrix([[1, 2], [3, 4]]))
+    assert key.matrix[0, 0] == 1
+
+
+def test_color_keys() -> None:
+    colors = [Color(0.1, 0.2, 0.3), Color(0.1 + 1e-9, 0.2, 0.3), Color(0.3, 0.2, 0.1), Color(-0.0, 0, 0)]
+    unique = {ColorKey(color) for color in colors}
+    assert len(unique) == 3
+    assert ColorKey(Color(0, 0, 0)) in unique
+    assert ColorKey(Color(inf, 0, 0)) == ColorKey(Color(inf, 0, 0))
+    assert repr(ColorKey(Color(1, 0, 0))) == "ColorKey(Color(1, 0, 0), epsilon=1e-05)"
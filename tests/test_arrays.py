@@ -0,0 +1,163 @@
+from array import array
+from collections.abc import Callable
+from math import sqrt
+
+import pytest
+
+from raytracer.arrays import (
+    ColorArray,
+    PointArray,
+    TupleArray,
+    VectorArray,
+    cross,
+    dot,
+    magnitude,
+    normalize,
+    transform,
+)
+from raytracer.canvas import ArrayCanvas, pixel_at
+from raytracer.matrices import Matrix4
+from raytracer.tuples import Color, Point, TupleFeature, Vector, point, vector
+from raytracer.tuples import cross as scalar_cross
+from raytracer.tuples import dot as scalar_dot
+from raytracer.tuples import magnitude as scalar_magnitude
+from raytracer.tuples import normalize as scalar_normalize
+
+POINTS = [point(3, 2, 1), point(-1.5, 0.25, 4), point(0, 0, 0)]
+VECTORS = [vector(1, 2, 3), vector(-3.5, 0.5, 2), vector(4, 0, 0)]
+OTHER_VECTORS = [vector(2, 3, 4), vector(1, -1, 0.5), vector(0, 0, 1)]
+
+
+def test_round_trip_through_scalar_lists() -> None:
+    points = PointArray.from_tuples(POINTS)
+    assert isinstance(points, PointArray)
+    assert list(points.ws) == [1, 1, 1]
+    assert points.to_list() == POINTS
+    assert all(isinstance(p, Point) for p in points.to_list())
+    assert isinstance(points[1], Point)
+    assert points[1] == POINTS[1]
+    assert len(points) == 3
+
+
+def test_default_w_follows_array_type() -> None:
+    assert list(PointArray([1], [2], [3]).ws) == [1]
+    assert list(VectorArray([1], [2], [3]).ws) == [0]
+
+
+def test_columns_must_have_the_same_length() -> None:
+    with pytest.raises(ValueError, match="same length"):
+        VectorArray([1, 2], [2], [3])
+
+
+@pytest.mark.parametrize(
+    "left, right, expected_type",
+    [
+        (POINTS, VECTORS, PointArray),
+        (VECTORS, POINTS, PointArray),
+        (VECTORS, OTHER_VECTORS, VectorArray),
+        (POINTS, POINTS, TupleArray),
+    ],
+)
+def test_adding_arrays_matches_scalar_addition(
+    left: list[TupleFeature], right: list[TupleFeature], expected_type: type[TupleArray]
+) -> None:
+    total = _typed(left) + _typed(right)
+    assert type(total) is expected_type
+    assert total.to_list() == [a + b for a, b in zip(left, right, strict=True)]
+
+
+@pytest.mark.parametrize(
+    "left, right, expected_type",
+    [(POINTS, POINTS, VectorArray), (POINTS, VECTORS, PointArray), (VECTORS, OTHER_VECTORS, VectorArray)],
+)
+def test_subtracting_arrays_matches_scalar_subtraction(
+    left: list[TupleFeature], right: list[TupleFeature], expected_type: type[TupleArray]
+) -> None:
+    difference = _typed(left) - _typed(right)
+    assert type(difference) is expected_type
+    assert difference.to_list() == [a - b for a, b in zip(left, right, strict=True)]
+
+
+def test_negating_and_scaling_arrays() -> None:
+    vectors = VectorArray.from_tuples(VECTORS)
+    assert type(-vectors) is VectorArray
+    assert (-vectors).to_list() == [-v for v in VECTORS]
+    assert type(vectors * 3.5) is VectorArray
+    assert (vectors * 3.5).to_list() == [v * 3.5 for v in VECTORS]
+    assert type(vectors / 2) is VectorArray
+    assert (vectors / 2).to_list() == [v / 2 for v in VECTORS]
+    assert type(PointArray.from_tuples(POINTS) * 2) is TupleArray
+
+
+def test_vectorized_vector_math_matches_scalar_functions() -> None:
+    vectors = VectorArray.from_tuples(VECTORS)
+    others = VectorArray.from_tuples(OTHER_VECTORS)
+    assert list(dot(vectors, others)) == [scalar_dot(a, b) for a, b in zip(VECTORS, OTHER_VECTORS, strict=True)]
+    assert list(magnitude(vectors)) == [scalar_magnitude(v) for v in VECTORS]
+    assert normalize(vectors).to_list() == [scalar_normalize(v) for v in VECTORS]
+    assert cross(vectors, others).to_list() == [scalar_cross(a, b) for a, b in zip(VECTORS, OTHER_VECTORS, strict=True)]
+    assert list(magnitude(VectorArray([1], [2], [3]))) == [sqrt(14)]
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        lambda a, b: a + b,
+        lambda a, b: a - b,
+        dot,
+        cross,
+    ],
+)
+def test_mismatched_lengths_raise(operation: Callable[[TupleArray, TupleArray], object]) -> None:
+    with pytest.raises(ValueError, match="same length, got 2 and 1"):
+        operation(PointArray.from_tuples(POINTS[:2]), VectorArray.from_tuples(VECTORS[:1]))
+    with pytest.raises(ValueError, match="same length"):
+        ColorArray([1, 0], [0, 0], [0, 1]) * ColorArray([1], [1], [1])
+
+
+def test_color_array_arithmetic_matches_scalar_colors() -> None:
+    colors = [Color(0.9, 0.6, 0.75), Color(1, 0.2, 0.4)]
+    others = [Color(0.7, 0.1, 0.25), Color(0.9, 1, 0.1)]
+    a, b = ColorArray.from_colors(colors), ColorArray.from_colors(others)
+    assert (a + b).to_list() == [x + y for x, y in zip(colors, others, strict=True)]
+    assert (a - b).to_list() == [x - y for x, y in zip(colors, others, strict=True)]
+    assert (a * b).to_list() == [x * y for x, y in zip(colors, others, strict=True)]
+    assert (a * 2).to_list() == [x * 2 for x in colors]
+    assert (a / 2)[0] == Color(0.45, 0.3, 0.375)
+    assert (-a)[1] == Color(-1, -0.2, -0.4)
+
+
+def test_color_array_scaled_between_matches_scalar() -> None:
+    colors = [Color(0, 0.5, 1.5), Color(-0.5, 0.2, 0.998)]
+    reds, greens, blues = ColorArray.from_colors(colors).scaled_between(0, 255)
+    assert list(zip(reds, greens, blues, strict=True)) == [color.scaled_between(0, 255) for color in colors]
+
+
+def test_color_array_components_round_trip_with_canvas() -> None:
+    colors = ColorArray([1, 0], [0, 0.5], [0.25, 1])
+    components = colors.to_components()
+    assert components == array("d", [1, 0, 0.25, 0, 0.5, 1])
+    assert ColorArray.from_components(components) == colors
+    canvas = ArrayCanvas(2, 1)
+    canvas.write_array(components)
+    assert pixel_at(canvas, 1, 0) == Color(0, 0.5, 1)
+
+
+def _typed(features: list[TupleFeature]) -> TupleArray:
+    if all(isinstance(f, Point) for f in features):
+        return PointArray.from_tuples(features)
+    if all(isinstance(f, Vector) for f in features):
+        return VectorArray.from_tuples(features)
+    return TupleArray.from_tuples(features)
+
+
+def test_transform_matches_matrix_times_tuple() -> None:
+    affine = Matrix4((2, 0, 0, 5, 0, 1, 0.5, -3, 0, 0, 1, 2, 0, 0, 0, 1))
+    projective = Matrix4((1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0))
+    for tuples in (PointArray.from_tuples(POINTS), VectorArray.from_tuples(VECTORS)):
+        moved = transform(affine, tuples)
+        assert type(moved) is type(tuples)
+        assert [t.coords for t in moved.to_list()] == [affine * t.coords for t in tuples.to_list()]
+    skewed = transform(projective, PointArray.from_tuples(POINTS))
+    assert type(skewed) is TupleArray
+    assert [t.coords for t in skewed.to_list()] == [projective * p.coords for p in POINTS]
@@ -0,0 +1,49 @@
+import importlib.util
+import json
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+
+def _load_suite() -> ModuleType:
+    # benchmarks/ is a directory of scripts rather than a package, so load the suite from its path.
+    path = Path(__file__).parent.parent / "benchmarks" / "suite.py"
+    spec = importlib.util.spec_from_file_location("benchmark_suite", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+suite = _load_suite()
+
+
+@pytest.mark.parametrize(
+    ("seconds", "regressed"),
+    [(1.0, False), (1.1, False), (1.1001, True), (0.5, False)],
+)
+def test_compare_flags_only_slowdowns_past_the_threshold(seconds: float, regressed: bool) -> None:  # noqa: FBT001
+    assert suite.compare({"case": seconds}, {"case": 1.0}, 0.1) == (["case"] if regressed else [])
+
+
+def test_compare_ignores_cases_missing_from_the_baseline() -> None:
+    results = {"old": 3.0, "new": 100.0}
+    assert suite.compare(results, {"old": 1.0, "gone": 1.0}, 0.5) == ["old"]
+    assert suite.compare(results, {}, 0.0) == []
+
+
+def test_main_exits_non_zero_on_a_regression_against_a_baseline_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(suite, "run_cases", lambda _name_filter, _repeat: {"fast": 0.001, "slow": 0.003})
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"fast": 0.001, "slow": 0.002}}))
+    output = tmp_path / "results.json"
+
+    assert suite.main(["--baseline", str(baseline), "--output", str(output), "--threshold", "0.2"]) == 1
+    assert "REGRESSION: slow" in capsys.readouterr().out
+    assert json.loads(output.read_text())["results"] == {"fast": 0.001, "slow": 0.003}
+
+    assert suite.main(["--baseline", str(baseline), "--threshold", "0.5"]) == 0
+    assert suite.main([]) == 0
@@ -0,0 +1,48 @@
+from math import inf
+
+from raytracer.bounds import BoundingBox
+from raytracer.matrices import Matrix4
+from raytracer.shapes import Sphere
+
+
+def test_default_box_is_empty() -> None:
+    box = BoundingBox()
+    assert box.is_empty
+    assert box.surface_area == 0
+    assert box.merge(BoundingBox((1, 2, 3), (4, 5, 6))) == BoundingBox((1, 2, 3), (4, 5, 6))
+
+
+def test_box_around_corners() -> None:
+    box = BoundingBox.around([(-5, 2, 0), (7, 0, -3), (1, 4, 2)])
+    assert box == BoundingBox((-5, 0, -3), (7, 4, 2))
+    assert box.centroid == (1, 2, -0.5)
+    assert box.surface_area == 2 * (12 * 4 + 4 * 5 + 5 * 12)
+    assert box.contains((0, 1, 1))
+    assert not box.contains((0, 5, 1))
+
+
+def test_transforming_a_box_encloses_its_rotated_corners() -> None:
+    # Rotation by 45 degrees about y, then a translation.
+    c = 2**0.5 / 2
+    rotation = Matrix4((c, 0, c, 10, 0, 1, 0, 0, -c, 0, c, 0, 0, 0, 0, 1))
+    box = BoundingBox((-1, -1, -1), (1, 1, 1)).transform(rotation)
+    assert box.minimum[0] == 10 - 2 * c
+    assert box.maximum[0] == 10 + 2 * c
+    assert box.minimum[1] == -1
+    assert box.maximum[1] == 1
+
+
+def test_sphere_bounds_follow_its_transform() -> None:
+    shape = Sphere(Matrix4((2, 0, 0, 1, 0, 3, 0, 0, 0, 0, 1, -4, 0, 0, 0, 1)))
+    assert shape.bounds() == BoundingBox((-1, -1, -1), (1, 1, 1))
+    assert shape.parent_space_bounds() == BoundingBox((-1, -3, -5), (3, 3, -3))
+
+
+def test_ray_box_intersection_range() -> None:
+    box = BoundingBox((-1, -1, -1), (1, 1, 1))
+    assert box.intersection_range((-5, 0.5, 0), (1, 0, 0)) == (4, 6)
+    assert box.intersection_range((0, 0, 0), (0, 0, 1)) == (-1, 1)
+    assert box.intersection_range((0, 2, -5), (0, 0, 1)) is None
+    assert box.intersection_range((2, 2, 2), (-1, -1, -1)) == (1, 3)
+    assert box.intersection_range((0, 0, 5), (0, 0, 1)) == (-6, -4)
+    assert BoundingBox((-inf, 0, 0), (inf, 1, 1)).intersection_range((0, 0.5, -2), (0, 0, 1)) == (2, 3)
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from raytracer.bvh import BVH
+from raytracer.intersections import hit, intersect_all
+from raytracer.matrices import Matrix4
+from raytracer.rays import Ray
+from raytracer.shapes import Sphere
+from raytracer.tuples import normalize, point, vector
+
+
+def random_spheres(count: int, seed: int = 15) -> list[Sphere]:
+    rng = random.Random(seed)
+    spheres = []
+    for _ in range(count):
+        r = rng.uniform(0.05, 0.5)
+        x, y, z = rng.uniform(-10, 10), rng.uniform(-10, 10), rng.uniform(-10, 10)
+        spheres.append(Sphere(Matrix4((r, 0, 0, x, 0, r * 1.5, 0, y, 0, 0, r, z, 0, 0, 0, 1))))
+    return spheres
+
+
+def random_rays(count: int, seed: int = 16) -> list[Ray]:
+    rng = random.Random(seed)
+    return [
+        Ray(
+            point(rng.uniform(-12, 12), rng.uniform(-12, 12), rng.uniform(-12, 12)),
+            normalize(vector(rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1))),
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("split", ["sah", "median"])
+def test_bvh_hit_matches_testing_every_shape(split: str) -> None:
+    spheres = random_spheres(300)
+    tree = BVH(spheres, split=split)
+    assert len(tree) == 300
+    assert tree.depth() < 20
+    hits = 0
+    for ray in random_rays(300):
+        expected = hit(intersect_all(spheres, ray))
+        actual = tree.hit(ray)
+        assert actual == expected
+        hits += actual is not None
+    assert hits > 0
+
+
+def test_bvh_with_few_or_coincident_shapes() -> None:
+    assert BVH([]).hit(Ray(point(0, 0, -5), vector(0, 0, 1))) is None
+    same = [Sphere() for _ in range(10)]
+    tree = BVH(same, leaf_size=2)
+    assert tree.depth() == 1
+    assert tree.hit(Ray(point(0, 0, -5), vector(0, 0, 1))).t == 4  # type: ignore[union-attr]
+
+
+def test_bvh_rejects_unknown_split() -> None:
+    with pytest.raises(ValueError, match="split"):
+        BVH([], split="middle")
@@ -0,0 +1,163 @@
+import os
+import stat
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from raytracer.__about__ import __version__
+from raytracer.cache import RenderCache, encode_canvas, scene_key
+from raytracer.canvas import ArrayCanvas, Canvas, canvas_to_ppm
+from raytracer.tuples import Color
+
+SCENE = {"spheres": [{"center": [0, 0, 0], "radius": 1}], "light": [-10, 10, -10]}
+
+
+def renderer(width: int, height: int, calls: list[int]) -> Callable[[], Canvas]:
+    def render() -> Canvas:
+        calls.append(1)
+        canvas = ArrayCanvas(width, height)
+        canvas.write_array([(i % 7) / 6 for i in range(width * height * 3)], width=width)
+        return canvas
+
+    return render
+
+
+def test_scene_key_is_stable_and_covers_size_format_and_version(monkeypatch: pytest.MonkeyPatch) -> None:
+    reordered = {"light": [-10, 10, -10], "spheres": [{"radius": 1, "center": [0, 0, 0]}]}
+    key = scene_key(SCENE, 4, 3)
+    assert key == scene_key(reordered, 4, 3)
+    assert len({key, scene_key(SCENE, 3, 4), scene_key(SCENE, 4, 3, "P3"), scene_key({}, 4, 3)}) == 4
+    monkeypatch.setattr("raytracer.cache.__version__", __version__ + ".post1")
+    assert scene_key(SCENE, 4, 3) != key
+
+
+@pytest.mark.parametrize("fmt", ["P3", "P6"])
+def test_hit_skips_rendering(tmp_path: Path, fmt: str) -> None:
+    cache = RenderCache(tmp_path, fmt=fmt)
+    calls: list[int] = []
+    first = cache.render(SCENE, 8, 5, renderer(8, 5, calls))
+    second = cache.render(SCENE, 8, 5, renderer(8, 5, calls))
+    assert calls == [1]
+    assert canvas_to_ppm(second) == canvas_to_ppm(first)
+    assert dict(cache.stats) == {"misses": 1, "stores": 1, "hits": 1, "evictions": 0}
+    assert cache.hit_rate == 0.5
+    key = cache.key(SCENE, 8, 5)
+    assert cache.path(key).read_bytes().startswith(f"{fmt}\n8 5\n255\n".encode())
+
+
+def test_renderer_must_match_the_requested_size(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="expected 5x5"):
+        RenderCache(tmp_path).render(SCENE, 5, 5, lambda: Canvas(4, 4))
+
+
+def test_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    entry_size = len(b"P6\n4 4\n255\n") + 48
+    # Eviction frees space down to 90% of the cap, which still leaves room for two entries here.
+    cache = RenderCache(tmp_path, max_bytes=entry_size * 2 + entry_size // 2)
+    keys = [cache.key({"frame": i}, 4, 4) for i in range(3)]
+    for age, key in enumerate(keys[:2]):
+        path = cache.put(key, b"P6\n4 4\n255\n" + bytes(48))
+        assert path is not None
+        os.utime(path, (1000 + age, 1000 + age))
+    # Reading the oldest entry makes it the most recently used, so the other one goes first.
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[2], b"P6\n4 4\n255\n" + bytes(48))
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+    assert cache.stats["evictions"] == 1
+    assert cache.size() == entry_size * 2
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_stores_only_scan_the_directory_when_over_the_cap(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    entry = b"P6\n4 4\n255\n" + bytes(48)
+    RenderCache(tmp_path).put("00existing", entry)
+    cache = RenderCache(tmp_path, max_bytes=len(entry) * 4)
+    scans = []
+    entries = cache._entries
+
+    def counting_entries() -> list[tuple[float, int, Path]]:
+        scans.append(1)
+        return entries()
+
+    monkeypatch.setattr(cache, "_entries", counting_entries)
+    for i in range(3):
+        cache.put(cache.key({"frame": i}, 4, 4), entry)
+    cache.put(cache.key({"frame": 0}, 4, 4), entry)
+    assert len(scans) == 1
+    cache.put(cache.key({"frame": 3}, 4, 4), entry)
+    assert len(scans) == 2
+    # Five entries against a cap of four: eviction goes down to 90% of the cap, which leaves three.
+    assert cache.stats["evictions"] == 2
+    assert cache._size == cache.size() == len(entry) * 3
+
+
+def test_entries_larger_than_the_cache_are_not_stored(tmp_path: Path) -> None:
+    cache = RenderCache(tmp_path, max_bytes=64)
+    kept = cache.put("00kept", b"P6\n1 1\n255\n" + bytes(3))
+    assert cache.put("00big", b"P6\n8 8\n255\n" + bytes(192)) is None
+    assert cache.get("00big") is None
+    assert kept is not None and kept.exists()
+    assert cache.stats["evictions"] == 0
+
+
+def test_corrupt_entry_is_a_miss_and_is_rendered_again(tmp_path: Path) -> None:
+    cache = RenderCache(tmp_path)
+    calls: list[int] = []
+    key = cache.key(SCENE, 8, 5)
+    cache.put(key, b"P6\n8 5\n255\n" + bytes(7))
+    canvas = cache.render(SCENE, 8, 5, renderer(8, 5, calls))
+    assert calls == [1]
+    assert (canvas.width, canvas.height) == (8, 5)
+    assert cache.path(key).read_bytes() == encode_canvas(canvas)
+    assert cache.stats["hits"] == 0
+    assert cache.stats["misses"] == 1
+
+
+def test_entries_are_readable_by_other_users_under_the_umask(tmp_path: Path) -> None:
+    # A fresh interpreter, since the entry mode is worked out from the umask at import.
+    script = "import sys\nfrom raytracer.cache import RenderCache\nRenderCache(sys.argv[1]).put('00key', b'P6')\n"
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).parents[1] / "src")}
+    umask = os.umask(0o022)
+    try:
+        subprocess.run([sys.executable, "-c", script, str(tmp_path)], env=env, check=True)  # noqa: S603
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE((tmp_path / "00" / "00key.ppm").stat().st_mode) == 0o644
+
+
+def test_stale_temporary_files_are_cleaned_up(tmp_path: Path) -> None:
+    cache = RenderCache(tmp_path)
+    shard = tmp_path / "ab"
+    shard.mkdir()
+    stale, fresh = shard / ".tmp-stale", shard / ".tmp-fresh"
+    stale.write_bytes(b"partial")
+    fresh.write_bytes(b"partial")
+    os.utime(stale, (0, 0))
+    assert cache.evict() == 0
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def test_concurrent_writers_leave_one_complete_entry(tmp_path: Path) -> None:
+    script = (
+        "import sys\n"
+        "from raytracer.cache import RenderCache\n"
+        "cache = RenderCache(sys.argv[1])\n"
+        "for _ in range(20):\n"
+        "    cache.put(cache.key({'frame': 1}, 64, 64), b'P6\\n64 64\\n255\\n' + bytes([7]) * 12288)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).parents[1] / "src")}
+    writers = [subprocess.Popen([sys.executable, "-c", script, str(tmp_path)], env=env) for _ in range(4)]  # noqa: S603
+    assert [writer.wait() for writer in writers] == [0] * 4
+    cache = RenderCache(tmp_path)
+    canvas = cache.render({"frame": 1}, 64, 64, lambda: Canvas(64, 64))
+    assert cache.stats["hits"] == 1
+    assert canvas.pixel_at(63, 63) == Color(7 / 255, 7 / 255, 7 / 255)
+    entry = cache.path(cache.key({"frame": 1}, 64, 64))
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == [entry]
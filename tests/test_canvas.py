@@ -1,4 +1,10 @@
-from raytracer.canvas import Canvas, canvas_to_ppm, pixel_at, write_pixel
+from array import array
+from collections.abc import Callable
+
+import pytest
+
+from raytracer.canvas import ArrayCanvas, Canvas, RowCachingCanvas, canvas_to_ppm, pixel_at, write_pixel
+from raytracer.sparse_canvas import SparseCanvas
 from raytracer.tuples import Color
 
 
@@ -61,3 +67,167 @@ def test_ppm_terminated_by_newline_character() -> None:
     canvas = Canvas(5, 3)
     ppm = canvas_to_ppm(canvas)
     assert ppm[-1] == "\n"
+
+
+@pytest.mark.parametrize("typecode", ["f", "d"])
+def test_creating_an_array_canvas(typecode: str) -> None:
+    victim = ArrayCanvas(10, 20, bg_color=Color(1, 0.5, 0), typecode=typecode)
+    assert victim.width == 10
+    assert victim.height == 20
+    assert len(victim.buffer) == 10 * 20 * 3
+    assert all(pixel == Color(1, 0.5, 0) for row in victim.pixels for pixel in row)
+
+
+def test_array_canvas_rejects_unknown_typecode() -> None:
+    with pytest.raises(ValueError, match="typecode"):
+        ArrayCanvas(2, 2, typecode="i")
+
+
+def test_writing_pixels_to_array_canvas() -> None:
+    canvas = ArrayCanvas(10, 20)
+    red = Color(1, 0, 0)
+    write_pixel(canvas, 2, 3, red)
+    assert pixel_at(canvas, 2, 3) == red
+    assert pixel_at(canvas, 3, 2) == Color(0, 0, 0)
+
+
+@pytest.mark.parametrize("canvas", [Canvas(4, 3), ArrayCanvas(4, 3)])
+def test_fill_region(canvas: Canvas) -> None:
+    canvas.fill_region(2, 1, 5, 1, Color(0, 1, 0))
+    assert [pixel_at(canvas, x, 1) for x in range(4)] == [Color(0, 0, 0)] * 2 + [Color(0, 1, 0)] * 2
+    assert all(pixel_at(canvas, x, y) == Color(0, 0, 0) for x in range(4) for y in (0, 2))
+
+
+@pytest.mark.parametrize("canvas", [Canvas(4, 3), ArrayCanvas(4, 3)])
+def test_write_row(canvas: Canvas) -> None:
+    canvas.write_row(2, [Color(1, 0, 0), Color(0, 0, 1)], x=1)
+    black, red, blue = Color(0, 0, 0), Color(1, 0, 0), Color(0, 0, 1)
+    assert [pixel_at(canvas, x, 2) for x in range(4)] == [black, red, blue, black]
+
+
+@pytest.mark.parametrize("canvas", [Canvas(4, 3), ArrayCanvas(4, 3, typecode="f")])
+def test_write_array(canvas: Canvas) -> None:
+    canvas.write_array([1, 0, 0, 0, 1, 0, 0, 0, 1, 0.5, 0.5, 0.5], x=1, y=1, width=2)
+    assert pixel_at(canvas, 1, 1) == Color(1, 0, 0)
+    assert pixel_at(canvas, 2, 1) == Color(0, 1, 0)
+    assert pixel_at(canvas, 1, 2) == Color(0, 0, 1)
+    assert pixel_at(canvas, 2, 2) == Color(0.5, 0.5, 0.5)
+    assert pixel_at(canvas, 3, 1) == Color(0, 0, 0)
+
+
+@pytest.mark.parametrize("canvas", [Canvas(5, 3), ArrayCanvas(5, 3), SparseCanvas(5, 3, tile_size=2)])
+def test_fill_region_clips_to_the_canvas(canvas: Canvas) -> None:
+    canvas.fill_region(-1, -1, 2, 2, Color(0, 1, 0))
+    canvas.fill_region(4, 2, 3, 3, Color(0, 0, 1))
+    canvas.fill_region(7, 0, 2, 2, Color(1, 0, 0))
+    assert canvas.pixel_at(0, 0) == Color(0, 1, 0)
+    assert canvas.pixel_at(4, 2) == Color(0, 0, 1)
+    assert [pixel_at(canvas, x, y) for y in range(3) for x in range(5)].count(Color(0, 0, 0)) == 13
+    assert len(canvas_to_ppm(canvas).split()) == 4 + 5 * 3 * 3
+
+
+@pytest.mark.parametrize("canvas", [Canvas(5, 3), ArrayCanvas(5, 3), SparseCanvas(5, 3, tile_size=2)])
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda canvas: canvas.write_pixel(5, 0, Color(1, 0, 0)),
+        lambda canvas: canvas.write_pixel(-1, 0, Color(1, 0, 0)),
+        lambda canvas: canvas.write_row(1, [Color(1, 0, 0)] * 3, x=4),
+        lambda canvas: canvas.write_row(3, [Color(1, 0, 0)]),
+        lambda canvas: canvas.write_array([1, 0, 0] * 2, x=-1, y=0, width=2),
+        lambda canvas: canvas.write_array([1, 0, 0] * 4, x=3, y=2, width=2),
+    ],
+)
+def test_writes_outside_the_canvas_raise(canvas: Canvas, write: Callable[[Canvas], None]) -> None:
+    before = canvas_to_ppm(canvas)
+    with pytest.raises(IndexError, match="5x3 canvas"):
+        write(canvas)
+    assert canvas_to_ppm(canvas) == before
+    if isinstance(canvas, ArrayCanvas):
+        assert len(canvas.buffer) == 5 * 3 * 3
+
+
+def test_write_array_rejects_partial_rows() -> None:
+    with pytest.raises(ValueError, match="multiple"):
+        ArrayCanvas(4, 3).write_array([1, 0, 0, 0, 1], width=2)
+
+
+def test_array_canvas_ppm_matches_list_canvas() -> None:
+    canvas = Canvas(5, 3)
+    array_canvas = ArrayCanvas(5, 3)
+    for victim in (canvas, array_canvas):
+        write_pixel(victim, 0, 0, Color(1.5, 0, 0))
+        write_pixel(victim, 2, 1, Color(0, 0.5, 0))
+        write_pixel(victim, 4, 2, Color(-0.5, 0, 1))
+    assert canvas_to_ppm(array_canvas) == canvas_to_ppm(canvas)
+
+
+@pytest.mark.parametrize("canvas", [Canvas(30, 4), ArrayCanvas(30, 4), SparseCanvas(30, 4, tile_size=8)])
+def test_repeated_ppm_matches_fresh_encoding(canvas: Canvas) -> None:
+    canvas_to_ppm(canvas)
+    write_pixel(canvas, 3, 1, Color(1, 0.5, 0))
+    canvas.fill_region(20, 2, 5, 2, Color(0, 0, 1))
+    canvas.write_array([0.2, 0.4, 0.6] * 2, x=28, y=0, width=2)
+    fresh = Canvas(30, 4)
+    for y in range(4):
+        for x in range(30):
+            write_pixel(fresh, x, y, pixel_at(canvas, x, y))
+    assert canvas_to_ppm(canvas) == canvas_to_ppm(fresh)
+
+
+@pytest.mark.parametrize("canvas", [ArrayCanvas(5, 4), SparseCanvas(5, 4, tile_size=2)])
+def test_ppm_only_reencodes_dirty_rows(canvas: RowCachingCanvas) -> None:
+    assert canvas.dirty_rows == set()
+    canvas_to_ppm(canvas)
+    write_pixel(canvas, 1, 2, Color(1, 1, 1))
+    assert canvas.dirty_rows == {2}
+    encoded = []
+    row_bytes = canvas.row_bytes
+
+    def recording_row_bytes(y: int) -> bytes:
+        encoded.append(y)
+        return row_bytes(y)
+
+    canvas.row_bytes = recording_row_bytes  # type: ignore[method-assign]
+    canvas_to_ppm(canvas)
+    assert encoded == [2]
+    assert canvas.dirty_rows == set()
+
+
+def test_mark_dirty_covers_direct_buffer_writes() -> None:
+    canvas = ArrayCanvas(5, 3)
+    canvas_to_ppm(canvas)
+    canvas.buffer[15] = 1.0
+    canvas.mark_dirty(1, 2)
+    assert canvas_to_ppm(canvas).splitlines()[4] == "255 0 0 0 0 0 0 0 0 0 0 0 0 0 0"
+
+
+def test_list_canvas_encodes_direct_pixel_writes_and_mutated_colors() -> None:
+    canvas = Canvas(5, 3)
+    color = Color(0, 0, 0)
+    write_pixel(canvas, 4, 2, color)
+    canvas_to_ppm(canvas)
+    canvas.pixels[1][0] = Color(1, 0, 0)
+    color.blue = 1
+    lines = canvas_to_ppm(canvas).splitlines()
+    assert lines[4] == "255 0 0 0 0 0 0 0 0 0 0 0 0 0 0"
+    assert lines[5] == "0 0 0 0 0 0 0 0 0 0 0 0 0 0 255"
+
+
+def test_to_bytes_matches_row_bytes_for_every_canvas_type() -> None:
+    colors = [Color(1.5, 0.25, 0), Color(0.5, -1, 0.75)]
+    for canvas in (Canvas(3, 2), ArrayCanvas(3, 2), ArrayCanvas(3, 2, typecode="f")):
+        canvas.write_row(1, colors)
+        assert canvas.to_bytes() == b"".join(canvas.row_bytes(y) for y in range(2))
+        assert canvas.to_bytes("gamma", gamma=1) == canvas.to_bytes()
+        assert canvas.to_bytes("srgb")[9:15] == bytes([255, 137, 0, 188, 0, 225])
+
+
+def test_array_canvas_from_buffer_wraps_without_copying() -> None:
+    buffer = array("f", [0.5] * 12)
+    victim = ArrayCanvas.from_buffer(2, 2, buffer)
+    assert victim.buffer is buffer
+    assert victim.typecode == "f"
+    assert victim.pixel_at(1, 1) == Color(0.5, 0.5, 0.5)
+    with pytest.raises(ValueError, match="expected 12 components"):
+        ArrayCanvas.from_buffer(2, 2, array("d", [0.5] * 9))
@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from raytracer.canvas import ArrayCanvas, Canvas, canvas_to_ppm, write_pixel
+from raytracer.compare import compare, compare_canvases, main
+from raytracer.ppm import read_ppm, write_ppm
+from raytracer.tuples import Color
+
+
+def _pair() -> tuple[Canvas, Canvas]:
+    expected = ArrayCanvas(6, 4, bg_color=Color(0.5, 0.5, 0.5))
+    actual = Canvas(6, 4, bg_color=Color(0.5, 0.5, 0.5))
+    write_pixel(actual, 1, 1, Color(0.5, 0.75, 0.5))
+    write_pixel(actual, 4, 2, Color(0, 0.5, 0.5))
+    write_pixel(actual, 2, 3, Color(0.5, 0.5, 0.501))
+    return expected, actual
+
+
+def test_identical_canvases_match() -> None:
+    expected, _ = _pair()
+    diff = compare_canvases(expected, ArrayCanvas(6, 4, bg_color=Color(0.5, 0.5, 0.5)))
+    assert diff.matches
+    assert (diff.max_error, diff.mean_error, diff.over_tolerance, diff.bounds) == (0, 0, 0, None)
+
+
+def test_compare_canvases_reports_errors_and_bounds() -> None:
+    diff = compare_canvases(*_pair(), tolerance=0.01)
+    assert diff.error_at(1, 1) == 0.25
+    assert diff.error_at(4, 2) == 0.5
+    assert diff.error_at(0, 0) == 0
+    assert diff.max_error == 0.5
+    assert diff.mean_error == pytest.approx((0.25 + 0.5 + 0.001) / 24)
+    assert diff.over_tolerance == 2
+    assert diff.bounds == (1, 1, 4, 2)
+    assert not diff.matches
+    assert compare_canvases(*_pair(), tolerance=0).over_tolerance == 3
+
+
+def test_compare_rejects_different_sizes() -> None:
+    with pytest.raises(ValueError, match="sizes differ"):
+        compare_canvases(Canvas(2, 2), Canvas(2, 3))
+
+
+def test_heatmap_ramps_from_black_to_white() -> None:
+    heatmap = compare_canvases(*_pair(), tolerance=0.01).heatmap()
+    assert (heatmap.width, heatmap.height) == (6, 4)
+    assert heatmap.pixel_at(4, 2) == Color(1, 1, 1)
+    assert heatmap.pixel_at(1, 1) == Color(1, 0.5, 0)
+    assert heatmap.pixel_at(2, 3) == Color(0, 0, 0)
+    assert heatmap.pixel_at(0, 0) == Color(0, 0, 0)
+
+
+def test_compare_reads_ppm_files(tmp_path: Path) -> None:
+    expected, actual = _pair()
+    (tmp_path / "expected.ppm").write_text(canvas_to_ppm(expected))
+    write_ppm(actual, tmp_path / "actual.ppm", "P6")
+    diff = compare(tmp_path / "expected.ppm", str(tmp_path / "actual.ppm"), tolerance=0.01)
+    assert diff.over_tolerance == 2
+    assert diff.bounds == (1, 1, 4, 2)
+
+
+def test_cli_exit_status_summary_and_heatmap(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    expected, actual = _pair()
+    write_ppm(expected, tmp_path / "expected.ppm", "P6")
+    write_ppm(actual, tmp_path / "actual.ppm", "P6")
+    paths = [str(tmp_path / "expected.ppm"), str(tmp_path / "actual.ppm")]
+
+    assert main([paths[0], paths[0]]) == 0
+    assert "0 of 24 pixels over 0" in capsys.readouterr().out
+
+    heatmap = tmp_path / "diff.ppm"
+    assert main([*paths, "--tolerance", "0.01", "--json", "--heatmap", str(heatmap)]) == 1
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["over_tolerance"] == 2
+    assert summary["bounds"] == [1, 1, 4, 2]
+    assert read_ppm(heatmap).pixel_at(4, 2) == Color(1, 1, 1)
+
+    assert main([paths[0], str(tmp_path / "missing.ppm")]) == 2
+    assert "error:" in capsys.readouterr().err
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import raytracer
+from raytracer import canvas as canvas_module
+from raytracer.canvas import Canvas, write_pixel
+from raytracer.instrument import instrumented, is_enabled, phase, stats
+from raytracer.matrices import Matrix4
+from raytracer.tuples import Color, Point, TupleFeature, point, vector
+
+
+def test_counts_allocations_and_operations_per_class() -> None:
+    with instrumented() as collected:
+        p = point(1, 2, 3) + vector(0, 1, 0)
+        Color(1, 0, 0) * 0.5
+        Matrix4.identity() * Matrix4.identity()
+        assert isinstance(p, TupleFeature)
+    snapshot = collected.snapshot()
+    assert snapshot["allocations"]["Point"] == 1
+    assert snapshot["allocations"]["Vector"] == 1
+    assert snapshot["allocations"]["TupleFeature"] == 1
+    assert snapshot["allocations"]["Color"] == 2
+    assert snapshot["allocations"]["Matrix4"] == 3
+    assert snapshot["calls"]["TupleFeature.__add__"] == 1
+    assert snapshot["calls"]["Color.__mul__"] == 1
+    assert snapshot["calls"]["Matrix4.__mul__"] == 1
+
+
+def test_times_named_phases_and_encoding() -> None:
+    canvas = Canvas(4, 2)
+    with instrumented() as collected:
+        with phase("shade"):
+            write_pixel(canvas, 1, 1, Color(1, 1, 1))
+        canvas_module.canvas_to_ppm(canvas)
+    timers = collected.snapshot()["timers"]
+    assert timers["shade"]["calls"] == 1
+    assert timers["raytracer.canvas.canvas_to_ppm"]["calls"] == 1
+    assert timers["raytracer.canvas.Canvas.p3_rows"]["seconds"] >= 0
+    assert json.loads(collected.to_json())["calls"]["Canvas.write_pixel"] == 1
+
+
+def test_disabled_instrumentation_restores_the_original_methods() -> None:
+    add, init = TupleFeature.__dict__["__add__"], TupleFeature.__dict__["__init__"]
+    with instrumented():
+        assert is_enabled()
+        with instrumented(reset=False):
+            assert TupleFeature.__dict__["__add__"] is not add
+        assert is_enabled()
+    assert not is_enabled()
+    assert TupleFeature.__dict__["__add__"] is add
+    assert TupleFeature.__dict__["__init__"] is init
+    stats.reset()
+    point(1, 2, 3) + vector(1, 1, 1)
+    with phase("ignored"):
+        pass
+    assert stats.snapshot()["allocations"] == {}
+    assert "ignored" not in stats.snapshot()["timers"]
+    assert isinstance(point(0, 0, 0), Point)
+
+
+def test_counts_are_exact_across_threads() -> None:
+    def add_many(_: int) -> None:
+        p, v = point(0, 0, 0), vector(1, 1, 1)
+        for _ in range(2_000):
+            p + v
+
+    with instrumented() as collected, ThreadPoolExecutor(max_workers=8) as threads:
+        list(threads.map(add_many, range(8)))
+    assert collected.snapshot()["calls"]["TupleFeature.__add__"] == 8 * 2_000
+
+
+def test_environment_variable_enables_and_dumps_at_exit(tmp_path: Path) -> None:
+    output = tmp_path / "stats.json"
+    source = str(Path(raytracer.__file__).parent.parent)
+    env = dict(os.environ, PYTHONPATH=source, RAYTRACER_INSTRUMENT="1", RAYTRACER_INSTRUMENT_OUTPUT=str(output))
+    script = (
+        "import sys, raytracer\n"
+        "assert 'raytracer.render' not in sys.modules and 'multiprocessing' not in sys.modules\n"
+        "from raytracer import render\n"
+        "assert hasattr(render.render, '__wrapped__')\n"
+        "from raytracer.tuples import point; point(1, 2, 3)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], env=env, check=True)  # noqa: S603
+    snapshot = json.loads(output.read_text())
+    assert snapshot["enabled"] is True
+    assert snapshot["allocations"]["Point"] == 1
@@ -0,0 +1,92 @@
+import random
+from math import isnan
+
+import pytest
+
+from raytracer.intersections import Intersection, hit, intersect, intersect_batch, intersections
+from raytracer.matrices import Matrix4
+from raytracer.rays import Ray, RayArray
+from raytracer.shapes import Shape, Sphere
+from raytracer.tuples import point, vector
+
+
+def test_shape_cannot_be_instantiated_without_intersection_methods() -> None:
+    with pytest.raises(TypeError, match="abstract"):
+        Shape()  # type: ignore[abstract]
+
+
+def test_a_ray_intersects_a_sphere_at_two_points() -> None:
+    shape = Sphere()
+    xs = intersect(shape, Ray(point(0, 0, -5), vector(0, 0, 1)))
+    assert [i.t for i in xs] == [4.0, 6.0]
+    assert all(i.object is shape for i in xs)
+
+
+def test_a_ray_intersects_a_sphere_at_a_tangent() -> None:
+    xs = intersect(Sphere(), Ray(point(0, 1, -5), vector(0, 0, 1)))
+    assert [i.t for i in xs] == [5.0, 5.0]
+
+
+def test_a_ray_misses_a_sphere() -> None:
+    assert intersect(Sphere(), Ray(point(0, 2, -5), vector(0, 0, 1))) == []
+
+
+def test_a_ray_originates_inside_a_sphere() -> None:
+    assert [i.t for i in intersect(Sphere(), Ray(point(0, 0, 0), vector(0, 0, 1)))] == [-1.0, 1.0]
+
+
+def test_a_sphere_is_behind_a_ray() -> None:
+    assert [i.t for i in intersect(Sphere(), Ray(point(0, 0, 5), vector(0, 0, 1)))] == [-6.0, -4.0]
+
+
+def test_intersecting_a_scaled_sphere_with_a_ray() -> None:
+    shape = Sphere(Matrix4((2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 1)))
+    assert [i.t for i in intersect(shape, Ray(point(0, 0, -5), vector(0, 0, 1)))] == [3.0, 7.0]
+
+
+def test_intersecting_a_translated_sphere_with_a_ray() -> None:
+    shape = Sphere(Matrix4((1, 0, 0, 5, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1)))
+    assert intersect(shape, Ray(point(0, 0, -5), vector(0, 0, 1))) == []
+
+
+def test_hit_picks_the_lowest_nonnegative_intersection() -> None:
+    shape = Sphere()
+    i1, i2, i3, i4 = (Intersection(t, shape) for t in (5, 7, -3, 2))
+    assert hit(intersections(i1, i2, i3, i4)) == i4
+    assert hit(intersections(Intersection(-1, shape), Intersection(1, shape))) == Intersection(1, shape)
+    assert hit(intersections(Intersection(-2, shape), Intersection(-1, shape))) is None
+
+
+def test_batch_intersect_matches_scalar_path() -> None:
+    rng = random.Random(14)
+    rays = [
+        Ray(
+            point(rng.uniform(-3, 3), rng.uniform(-3, 3), rng.uniform(-6, 6)),
+            vector(rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(0.1, 1)),
+        )
+        for _ in range(500)
+    ]
+    batch = RayArray.from_rays(rays)
+    for shape in (Sphere(), Sphere(Matrix4((2, 0, 0, 0.5, 0, 1, 0, -1, 0, 0.5, 1.5, 2, 0, 0, 0, 1)))):
+        hits = intersect_batch(shape, batch)
+        assert len(hits) == len(rays)
+        for i, ray in enumerate(rays):
+            xs = intersect(shape, ray)
+            nearest = hit(xs)
+            if xs:
+                assert [hits.near[i], hits.far[i]] == [x.t for x in xs]
+            else:
+                assert isnan(hits.near[i])
+                assert isnan(hits.far[i])
+            assert hits.mask[i] == (nearest is not None)
+            if nearest is not None:
+                assert hits.ts[i] == nearest.t
+        assert 0 < sum(hits.mask) < len(rays)
+
+
+def test_batch_intersect_of_rays_from_one_origin_matches_scalar_path() -> None:
+    rays = [Ray(point(0, 0, -5), vector(x / 10, y / 10, 1)) for x in range(-15, 16) for y in range(-15, 16)]
+    hits = intersect_batch(Sphere(), RayArray.from_rays(rays))
+    expected = [hit(intersect(Sphere(), ray)) for ray in rays]
+    assert list(hits.mask) == [i is not None for i in expected]
+    assert [t for t in hits.ts if t < float("inf")] == [i.t for i in expected if i is not None]
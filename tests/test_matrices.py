@@ -1,6 +1,23 @@
+import ast
+from array import array
+from collections.abc import Callable
+
 import pytest
 
-from raytracer.matrices import Matrix, identity_matrix, transpose
+from raytracer.matrices import (
+    InverseCache,
+    Matrix,
+    Matrix4,
+    cofactor,
+    determinant,
+    identity_matrix,
+    identity_matrix4,
+    inverse,
+    minor,
+    submatrix,
+    transform_batch,
+    transpose,
+)
 
 
 def test_constructing_and_inspecting_a_4x4_matrix() -> None:
@@ -243,3 +260,165 @@ def test_transposing_a_matrix() -> None:
         ]
     )
     assert transpose(matrix) == expected
+
+
+def test_calculating_the_determinant_of_a_2x2_matrix() -> None:
+    assert determinant(Matrix([[1, 5], [-3, 2]])) == 17
+
+
+def test_a_submatrix_of_a_3x3_matrix_is_a_2x2_matrix() -> None:
+    matrix = Matrix([[1, 5, 0], [-3, 2, 7], [0, 6, -3]])
+    assert submatrix(matrix, 0, 2) == Matrix([[-3, 2], [0, 6]])
+
+
+def test_calculating_a_minor_and_cofactor_of_a_3x3_matrix() -> None:
+    matrix = Matrix([[3, 5, 0], [2, -1, -7], [6, -1, 5]])
+    assert minor(matrix, 0, 0) == -12
+    assert cofactor(matrix, 0, 0) == -12
+    assert minor(matrix, 1, 0) == 25
+    assert cofactor(matrix, 1, 0) == -25
+
+
+def test_calculating_the_determinant_of_a_3x3_matrix() -> None:
+    assert determinant(Matrix([[1, 2, 6], [-5, 8, -4], [2, 6, 4]])) == -196
+
+
+@pytest.mark.parametrize("matrix_type", [Matrix, lambda elements: Matrix4.from_matrix(Matrix(elements))])
+def test_calculating_the_determinant_of_a_4x4_matrix(matrix_type: Callable[[list[list[int]]], Matrix]) -> None:
+    matrix = matrix_type([[-2, -8, 3, 5], [-3, 1, 7, 3], [1, 2, -9, 6], [-6, 7, 7, -9]])
+    assert determinant(matrix) == -4071
+
+
+def test_noninvertible_matrix_raises() -> None:
+    elements: list[list[int | float]] = [[-4, 2, -2, -3], [9, 6, 2, 6], [0, -5, 1, -5], [0, 0, 0, 0]]
+    with pytest.raises(ValueError, match="not invertible"):
+        inverse(Matrix(elements))
+    with pytest.raises(ValueError, match="not invertible"):
+        inverse(Matrix4.from_matrix(Matrix(elements)))
+
+
+def test_calculating_the_inverse_of_a_matrix() -> None:
+    matrix = Matrix([[-5, 2, 6, -8], [1, -5, 1, 8], [7, 7, -6, -7], [1, -3, 7, 4]])
+    expected = Matrix(
+        [
+            [0.21805, 0.45113, 0.24060, -0.04511],
+            [-0.80827, -1.45677, -0.44361, 0.52068],
+            [-0.07895, -0.22368, -0.05263, 0.19737],
+            [-0.52256, -0.81391, -0.30075, 0.30639],
+        ]
+    )
+    generic = inverse(matrix)
+    fast = inverse(Matrix4.from_matrix(matrix))
+    assert isinstance(fast, Matrix4)
+    assert fast == generic
+    assert all(abs(generic[row, col] - expected[row, col]) < 1e-5 for row in range(4) for col in range(4))
+
+
+def test_multiplying_a_product_by_its_inverse() -> None:
+    matrix_a = Matrix4.from_matrix(Matrix([[3, -9, 7, 3], [3, -8, 2, -9], [-4, 4, 4, 1], [-6, 5, -1, 1]]))
+    matrix_b = Matrix4.from_matrix(Matrix([[8, 2, 2, 2], [3, -1, 7, 0], [7, 0, 5, 4], [6, -2, 0, 5]]))
+    assert matrix_a * matrix_b * inverse(matrix_b) == matrix_a
+
+
+def test_matrix4_matches_generic_matrix() -> None:
+    elements: list[list[int | float]] = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 8, 7, 6], [5, 4, 3, 2]]
+    other: list[list[int | float]] = [[-2, 1, 2, 3], [3, 2, 1, -1], [4, 3, 6, 5], [1, 2, 7, 8]]
+    fast = Matrix4.from_matrix(Matrix(elements))
+    assert fast == Matrix(elements)
+    assert Matrix(elements) == fast
+    assert fast[2, 1] == 8
+    assert fast.elements == elements
+    assert fast * Matrix(other) == Matrix(elements) * Matrix(other)
+    assert Matrix(elements) * Matrix4.from_matrix(Matrix(other)) == Matrix(elements) * Matrix(other)
+    assert fast * (1, 2, 3, 1) == Matrix(elements) * (1, 2, 3, 1)
+    assert transpose(fast) == transpose(Matrix(elements))
+    assert isinstance(transpose(fast), Matrix4)
+    assert fast * identity_matrix4 == fast
+    assert identity_matrix4 == identity_matrix
+
+
+def test_matrix4_is_immutable() -> None:
+    with pytest.raises(TypeError):
+        identity_matrix4[0, 0] = 2
+
+
+def test_matrix4_requires_16_values() -> None:
+    with pytest.raises(ValueError, match="16"):
+        Matrix4((1, 2, 3))
+    with pytest.raises(ValueError, match="4x4"):
+        Matrix4.from_matrix(Matrix([[1, 2], [3, 4]]))
+
+
+def test_matrix4_repr_round_trips() -> None:
+    text = repr(identity_matrix4)
+    assert text.startswith("Matrix4((") and text.endswith("))")
+    assert Matrix4(ast.literal_eval(text.removeprefix("Matrix4(").removesuffix(")"))) == identity_matrix4
+
+
+def test_transform_batch_matches_single_tuple_multiplication() -> None:
+    matrix = Matrix([[1, 2, 3, 4], [2, 4, 4, 2], [8, 6, 4, 1], [0, 0, 0, 1]])
+    tuples = [(1, 2, 3, 1), (1, 2, 3, 0), (-4.5, 0.25, 7, 1)]
+    result = transform_batch(matrix, [value for t in tuples for value in t])
+    assert isinstance(result, array)
+    assert [tuple(result[i : i + 4]) for i in range(0, len(result), 4)] == [matrix * t for t in tuples]
+
+
+def test_transform_batch_with_projective_matrix() -> None:
+    matrix = Matrix4((1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0))
+    assert list(transform_batch(matrix, [1, 2, 3, 1])) == [1, 2, 3, 3]
+
+
+def test_transform_batch_rejects_ragged_batches() -> None:
+    with pytest.raises(ValueError, match="N x 4"):
+        transform_batch(identity_matrix4, [1, 2, 3])
+
+
+def test_transform_batch_of_only_points_or_only_vectors() -> None:
+    matrix = Matrix4((2, 0, 0, 5, 0, 1, 0.5, -3, 0, 0, 1, 2, 0, 0, 0, 1))
+    for w in (0, 1):
+        tuples = [(1, 2, 3, w), (-4.5, 0.25, 7, w)]
+        result = transform_batch(matrix, [value for t in tuples for value in t])
+        assert [tuple(result[i : i + 4]) for i in range(0, len(result), 4)] == [matrix * t for t in tuples]
+
+
+def test_freezing_a_matrix_snapshots_its_contents() -> None:
+    matrix = Matrix.new(4, 4, fill=1)
+    frozen = matrix.freeze()
+    matrix[0, 0] = 5
+    assert frozen[0, 0] == 1
+    assert frozen.key == (1,) * 16
+    assert hash(frozen.key) == hash(Matrix.new(4, 4, fill=1).freeze().key)
+
+
+def test_inverse_cache_computes_each_inverse_once() -> None:
+    cache = InverseCache()
+    matrix = Matrix4((3, -9, 7, 3, 3, -8, 2, -9, -4, 4, 4, 1, -6, 5, -1, 1))
+    assert cache.inverse(matrix) == inverse(matrix)
+    assert cache.inverse(Matrix(matrix.elements)) is cache.inverse(matrix)
+    assert cache.inverse_transpose(matrix) == transpose(inverse(matrix))
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 1, "maxsize": 1024}
+
+
+def test_inverse_cache_sees_mutations_of_plain_matrices() -> None:
+    cache = InverseCache()
+    matrix = Matrix([[2, 0, 0, 0], [0, 2, 0, 0], [0, 0, 2, 0], [0, 0, 0, 1]])
+    assert cache.inverse(matrix)[0, 0] == 0.5
+    matrix[0, 0] = 4
+    assert cache.inverse(matrix)[0, 0] == 0.25
+    assert cache.misses == 2
+
+
+def test_inverse_cache_evicts_least_recently_used() -> None:
+    cache = InverseCache(maxsize=2)
+    scales = [Matrix4((s, 0, 0, 0, 0, s, 0, 0, 0, 0, s, 0, 0, 0, 0, 1)) for s in (2, 4, 8)]
+    cache.inverse(scales[0])
+    cache.inverse(scales[1])
+    cache.inverse(scales[0])
+    cache.inverse(scales[2])
+    assert len(cache) == 2
+    cache.inverse(scales[0])
+    assert cache.hits == 2
+    cache.inverse(scales[1])
+    assert cache.misses == 4
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
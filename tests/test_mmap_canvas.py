@@ -0,0 +1,88 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from raytracer.canvas import Canvas, canvas_to_ppm, pixel_at, write_pixel
+from raytracer.mmap_canvas import MemoryMappedCanvas
+from raytracer.ppm import parse_ppm_header, write_ppm
+from raytracer.tuples import Color
+
+
+def test_new_canvas_is_a_black_p6_file(tmp_path: Path) -> None:
+    path = tmp_path / "image.ppm"
+    with MemoryMappedCanvas(3, 2, path) as canvas:
+        assert pixel_at(canvas, 2, 1) == Color(0, 0, 0)
+    assert path.read_bytes() == b"P6\n3 2\n255\n" + bytes(18)
+
+
+def test_writes_go_straight_to_the_file(tmp_path: Path) -> None:
+    path = tmp_path / "image.ppm"
+    canvas = MemoryMappedCanvas(2, 2, path, bg_color=Color(0, 0, 1))
+    write_pixel(canvas, 1, 0, Color(1.5, 0.5, -1))
+    canvas.flush()
+    assert path.read_bytes()[-12:] == bytes([0, 0, 255, 255, 128, 0, 0, 0, 255, 0, 0, 255])
+    canvas.close()
+    assert canvas.closed
+
+
+def test_matches_p6_encoding_of_an_in_memory_canvas(tmp_path: Path) -> None:
+    expected = Canvas(5, 3, bg_color=Color(0.2, 0.4, 0.6))
+    mapped = MemoryMappedCanvas(5, 3, tmp_path / "image.ppm", bg_color=Color(0.2, 0.4, 0.6))
+    for canvas in (expected, mapped):
+        write_pixel(canvas, 0, 0, Color(1.5, 0, 0))
+        canvas.fill_region(1, 1, 3, 2, Color(0, 0.5, 0))
+        canvas.write_row(2, [Color(0.1, 0.2, 0.3), Color(0.9, 0.8, 0.7)], x=3)
+        canvas.write_array([1, 1, 1, 0, 0, 0], x=0, y=1, width=1)
+    stream = io.BytesIO()
+    write_ppm(expected, stream, "P6")
+    mapped.close()
+    assert (tmp_path / "image.ppm").read_bytes() == stream.getvalue()
+
+
+def test_p3_encoding_reads_back_quantized_pixels(tmp_path: Path) -> None:
+    expected = Canvas(4, 2)
+    with MemoryMappedCanvas(4, 2, tmp_path / "image.ppm") as mapped:
+        for canvas in (expected, mapped):
+            write_pixel(canvas, 1, 1, Color(0.3, 0.6, 0.9))
+        assert canvas_to_ppm(mapped) == canvas_to_ppm(expected)
+        assert pixel_at(mapped, 1, 1) == Color(76 / 255, 153 / 255, 230 / 255)
+
+
+def test_open_resumes_an_existing_file(tmp_path: Path) -> None:
+    path = tmp_path / "image.ppm"
+    with MemoryMappedCanvas(4, 3, path) as canvas:
+        write_pixel(canvas, 3, 2, Color(1, 1, 1))
+    with MemoryMappedCanvas.open(path) as canvas:
+        assert (canvas.width, canvas.height) == (4, 3)
+        assert pixel_at(canvas, 3, 2) == Color(1, 1, 1)
+        write_pixel(canvas, 0, 0, Color(1, 0, 0))
+    assert path.read_bytes()[11:14] == bytes([255, 0, 0])
+
+
+def test_open_rejects_p3_files(tmp_path: Path) -> None:
+    path = tmp_path / "image.ppm"
+    path.write_text(canvas_to_ppm(Canvas(2, 2)))
+    with pytest.raises(ValueError, match="P6"):
+        MemoryMappedCanvas.open(path)
+
+
+def test_parse_ppm_header_skips_comments() -> None:
+    data = b"P6\n# made by hand\n 3   2 # trailing\n255\n\x00"
+    assert parse_ppm_header(data) == ("P6", 3, 2, 255, len(data) - 1)
+    assert parse_ppm_header(memoryview(data)) == parse_ppm_header(bytearray(data)) == parse_ppm_header(data)
+    with pytest.raises(ValueError, match="format"):
+        parse_ppm_header(b"P5\n1 1\n255\n")
+    with pytest.raises(ValueError, match="truncated"):
+        parse_ppm_header(b"P6\n1 ")
+
+
+def test_writes_outside_the_canvas_raise_and_fill_region_clips(tmp_path: Path) -> None:
+    with MemoryMappedCanvas(3, 2, tmp_path / "image.ppm") as canvas:
+        with pytest.raises(IndexError, match="3x2 canvas"):
+            canvas.write_row(1, [Color(1, 1, 1)] * 2, x=2)
+        with pytest.raises(IndexError, match="3x2 canvas"):
+            write_pixel(canvas, 0, 2, Color(1, 1, 1))
+        canvas.fill_region(-1, 1, 3, 5, Color(1, 1, 1))
+        assert canvas.to_bytes() == bytes(9) + bytes([255] * 6) + bytes(3)
+        assert len((tmp_path / "image.ppm").read_bytes()) == 11 + 18
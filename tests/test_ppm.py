@@ -0,0 +1,197 @@
+import io
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from raytracer import ppm
+from raytracer.approx import canvases_close
+from raytracer.canvas import ArrayCanvas, Canvas, canvas_to_ppm, write_pixel
+from raytracer.ppm import P3_TOKENS, iter_ppm_body, p3_row_lines, parse_ppm, quantize, read_ppm, write_ppm
+from raytracer.tuples import Color
+
+
+def _sample_canvas() -> Canvas:
+    canvas = ArrayCanvas(30, 4, bg_color=Color(1, 0.8, 0.6))
+    write_pixel(canvas, 0, 0, Color(1.5, 0, 0))
+    write_pixel(canvas, 2, 1, Color(0, 0.5, 0))
+    write_pixel(canvas, 29, 3, Color(-0.5, 0, 1))
+    return canvas
+
+
+def test_quantize_matches_scaled_between() -> None:
+    colors = [Color(0, 0.5, 1.5), Color(-0.5, 0.2, 0.998), Color(0.4, 0.6, 0.002)]
+    assert list(quantize(c for color in colors for c in color.rgb)) == [
+        c for color in colors for c in color.scaled_between(0, 255)
+    ]
+
+
+def test_p3_row_lines_wraps_before_70_columns() -> None:
+    lines = p3_row_lines(bytes([255, 204, 153] * 10))
+    assert lines == [
+        "255 204 153 255 204 153 255 204 153 255 204 153 255 204 153 255 204",
+        "153 255 204 153 255 204 153 255 204 153 255 204 153",
+    ]
+    assert all(len(line) < 70 for line in p3_row_lines(bytes(range(256))))
+
+
+def test_p3_row_lines_with_empty_row() -> None:
+    assert p3_row_lines(b"") == [""]
+
+
+@pytest.mark.parametrize("rows_per_chunk", [1, 3, 32])
+def test_streaming_p3_is_identical_to_canvas_to_ppm(rows_per_chunk: int) -> None:
+    canvas = _sample_canvas()
+    stream = io.BytesIO()
+    write_ppm(canvas, stream, "P3", rows_per_chunk=rows_per_chunk)
+    assert stream.getvalue() == canvas_to_ppm(canvas).encode("ascii")
+
+
+def test_streaming_p6_to_path(tmp_path: Path) -> None:
+    canvas = Canvas(2, 2)
+    write_pixel(canvas, 1, 0, Color(1, 0.5, 0))
+    write_pixel(canvas, 0, 1, Color(0, 0, 2))
+    target = tmp_path / "image.ppm"
+    write_ppm(canvas, target, "P6")
+    assert target.read_bytes() == b"P6\n2 2\n255\n" + bytes([0, 0, 0, 255, 128, 0, 0, 0, 255, 0, 0, 0])
+
+
+def test_p6_body_is_chunked_by_rows() -> None:
+    chunks = list(iter_ppm_body(Canvas(2, 5), "P6", rows_per_chunk=2))
+    assert [len(chunk) for chunk in chunks] == [12, 12, 6]
+
+
+def test_write_ppm_rejects_unknown_format() -> None:
+    with pytest.raises(ValueError, match="fmt"):
+        write_ppm(Canvas(1, 1), io.BytesIO(), "P7")
+
+
+def test_p3_tokens_cover_every_byte() -> None:
+    assert len(P3_TOKENS) == 256
+    assert P3_TOKENS[0] == "0"
+    assert P3_TOKENS[255] == "255"
+
+
+def test_linear_quantize_matches_scaled_between() -> None:
+    values = [-0.5, 0, 0.3, 0.5 / 255, 1.5 / 255, 0.5, 2.5 / 255, 0.999, 1, 1.5]
+    expected = [Color(value, 0, 0).scaled_between(0, 255)[0] for value in values]
+    assert list(quantize(values)) == expected
+    assert list(quantize(values, "linear")) == expected
+
+
+def test_gamma_and_srgb_quantize() -> None:
+    values = [-1, 0, 0.002, 0.2, 0.5, 1, 2]
+    assert list(quantize(values, "gamma", gamma=2.2)) == [0, 0, 15, 123, 186, 255, 255]
+    assert list(quantize(values, "gamma", gamma=1)) == list(quantize(values))
+    assert list(quantize(values, "srgb")) == [0, 0, 7, 124, 188, 255, 255]
+
+
+def test_quantize_rejects_unknown_transfer() -> None:
+    with pytest.raises(ValueError, match="transfer"):
+        quantize([0.5], "log")
+
+
+def test_parallel_p3_encoding_is_byte_identical() -> None:
+    serial = canvas_to_ppm(_sample_canvas())
+    with ThreadPoolExecutor(max_workers=3) as threads:
+        assert canvas_to_ppm(_sample_canvas(), executor=threads) == serial
+    components = [(i % 97) / 96 for i in range(40 * 70 * 3)]
+    array_canvas, list_canvas = ArrayCanvas(40, 70), Canvas(40, 70)
+    for canvas in (array_canvas, list_canvas):
+        canvas.write_array(components, width=40)
+    with ProcessPoolExecutor(max_workers=2) as processes:
+        parallel = canvas_to_ppm(array_canvas, executor=processes)
+    assert parallel == canvas_to_ppm(list_canvas)
+
+
+def test_parallel_encoding_of_dirty_rows() -> None:
+    canvas = _sample_canvas()
+    with ThreadPoolExecutor(max_workers=2) as threads:
+        canvas_to_ppm(canvas, executor=threads)
+        write_pixel(canvas, 5, 2, Color(0.1, 0.2, 0.3))
+        write_pixel(canvas, 6, 0, Color(0.4, 0.5, 0.6))
+        parallel = canvas_to_ppm(canvas, executor=threads)
+    fresh = ArrayCanvas(canvas.width, canvas.height)
+    fresh.write_array(canvas.buffer, width=canvas.width)  # type: ignore[attr-defined]
+    assert parallel == canvas_to_ppm(fresh)
+
+
+def test_parallel_streaming_matches_serial() -> None:
+    canvas = _sample_canvas()
+    with ThreadPoolExecutor(max_workers=2) as threads:
+        assert b"".join(iter_ppm_body(canvas, rows_per_chunk=3, executor=threads)) == b"".join(
+            iter_ppm_body(canvas, rows_per_chunk=3)
+        )
+        buffer = io.BytesIO()
+        write_ppm(canvas, buffer, executor=threads)
+    assert buffer.getvalue().decode("ascii") == canvas_to_ppm(canvas)
+
+
+def test_parallel_streaming_submits_a_bounded_number_of_chunks_ahead(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ppm, "P3_CHUNKS_AHEAD", 2)
+    canvas = ArrayCanvas(3, 10)
+    submitted = []
+
+    class CountingExecutor(ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+            submitted.append(args)
+            return super().submit(*args, **kwargs)
+
+    with CountingExecutor(max_workers=1) as threads:
+        chunks = iter_ppm_body(canvas, rows_per_chunk=1, executor=threads)
+        next(chunks)
+        assert len(submitted) == 2
+        assert b"".join(chunks).count(b"\n") == 9 + 1
+    assert len(submitted) == 10
+
+
+def test_read_ppm_round_trips_p3(tmp_path: Path) -> None:
+    canvas = _sample_canvas()
+    text = canvas_to_ppm(canvas)
+    target = tmp_path / "image.ppm"
+    target.write_text(text)
+    loaded = read_ppm(target)
+    assert (loaded.width, loaded.height) == (30, 4)
+    assert canvas_to_ppm(loaded) == text
+
+
+@pytest.mark.parametrize("typecode", ["f", "d"])
+def test_read_ppm_round_trips_p6(tmp_path: Path, typecode: str) -> None:
+    canvas = ArrayCanvas(256, 2)
+    canvas.write_array([value / 255 for value in range(256)] * 6, width=256)
+    target = tmp_path / "image.ppm"
+    write_ppm(canvas, target, "P6")
+    loaded = read_ppm(target, typecode)
+    assert loaded.typecode == typecode
+    assert loaded.to_bytes() == canvas.to_bytes()
+    assert canvases_close(loaded, canvas, 1e-6)
+
+
+def test_parse_ppm_scales_by_maxval() -> None:
+    p3 = parse_ppm(b"P3\n# comment\n2 1\n15\n0 15 003\n  15 0 0\n")
+    assert list(p3.buffer) == [0, 1, 0.2, 1, 0, 0]
+    p6 = parse_ppm(b"P6 1 1 1000 " + bytes([0, 0, 0x01, 0xF4, 0x03, 0xE8]))
+    assert list(p6.buffer) == [0, 0.5, 1]
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (b"P6\n2 1\n255\n\x00\x00\x00", "truncated PPM body"),
+        (b"P3\n2 1\n255\n0 0 0 0 0\n", "truncated PPM body"),
+        (b"P3\n1 1\n15\n0 16 0\n", "exceeds maxval"),
+        (b"P6\n1 1\n15\n\x00\x10\x00", "exceeds maxval"),
+        (b"P3\n1 1\n255\n0 x 0\n", "invalid PPM sample"),
+        (b"P6\n1 1\n0\n\x00\x00\x00", "maxval"),
+    ],
+)
+def test_parse_ppm_rejects_malformed_bodies(data: bytes, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        parse_ppm(data)
+
+
+def test_read_ppm_rejects_empty_file(tmp_path: Path) -> None:
+    target = tmp_path / "empty.ppm"
+    target.write_bytes(b"")
+    with pytest.raises(ValueError, match="truncated PPM header"):
+        read_ppm(target)
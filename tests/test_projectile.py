@@ -0,0 +1,73 @@
+import pytest
+
+from raytracer.arrays import PointArray, VectorArray
+from raytracer.canvas import ArrayCanvas, Canvas, canvas_to_ppm, write_pixel
+from raytracer.projectile import Environment, Projectile, simulate_batch, tick
+from raytracer.tuples import Color, Point, TupleFeature, normalize, point, vector
+
+LAUNCHES = [
+    (point(0, 1, 0), normalize(vector(1, 1.8, 0)) * 11.25),
+    (point(2, 0.5, 0), normalize(vector(1, 1, 0)) * 5),
+    (point(0, 3, 1), vector(0.5, 2, -0.25)),
+    (point(1, -1, 0), vector(1, 1, 0)),
+]
+
+
+def _looped_trajectory(position: Point, velocity: TupleFeature, env: Environment) -> list[TupleFeature]:
+    projectile = Projectile(position=position, velocity=velocity)
+    positions = []
+    while projectile.position.y > 0:
+        positions.append(projectile.position)
+        projectile = tick(env=env, proj=projectile)
+    return positions
+
+
+def _batch(launches: list[tuple[Point, TupleFeature]]) -> tuple[PointArray, VectorArray]:
+    return (
+        PointArray.from_tuples([launch[0] for launch in launches]),
+        VectorArray.from_tuples([launch[1] for launch in launches]),
+    )
+
+
+def test_tick_moves_projectile() -> None:
+    env = Environment(gravity=vector(0, -0.1, 0), wind=vector(-0.01, 0, 0))
+    moved = tick(env, Projectile(position=point(0, 1, 0), velocity=vector(1, 1, 0)))
+    assert moved.position == point(1, 2, 0)
+    assert moved.velocity == vector(0.99, 0.9, 0)
+
+
+def test_batch_matches_looping_tick_with_shared_environment() -> None:
+    env = Environment(gravity=vector(0, -0.1, 0), wind=vector(-0.01, 0, 0.003))
+    trajectories = simulate_batch(*_batch(LAUNCHES), env.gravity, env.wind)
+    for index, (position, velocity) in enumerate(LAUNCHES):
+        assert trajectories.trajectory(index) == _looped_trajectory(position, velocity, env)
+    assert trajectories.flight_times() == [len(_looped_trajectory(p, v, env)) for p, v in LAUNCHES]
+    assert trajectories.flight_times()[3] == 0
+
+
+def test_batch_matches_looping_tick_with_per_projectile_wind() -> None:
+    winds = [vector(-0.01, 0, 0), vector(0.02, 0, 0), vector(0, 0.01, -0.02), vector(0, 0, 0)]
+    trajectories = simulate_batch(*_batch(LAUNCHES), vector(0, -0.1, 0), VectorArray.from_tuples(winds))
+    for index, ((position, velocity), wind) in enumerate(zip(LAUNCHES, winds, strict=True)):
+        env = Environment(gravity=vector(0, -0.1, 0), wind=wind)
+        assert trajectories.trajectory(index) == _looped_trajectory(position, velocity, env)
+
+
+def test_batch_stops_after_max_ticks() -> None:
+    trajectories = simulate_batch(*_batch(LAUNCHES[:1]), vector(0, 0, 0), vector(0, 0, 0), max_ticks=5)
+    assert trajectories.flight_times() == [5]
+
+
+@pytest.mark.parametrize("canvas_type", [Canvas, ArrayCanvas])
+def test_rasterizing_matches_plotting_each_tick(canvas_type: type[Canvas]) -> None:
+    env = Environment(gravity=vector(0, -0.1, 0), wind=vector(-0.01, 0, 0))
+    expected = Canvas(90, 55)
+    for position, velocity in LAUNCHES[:2]:
+        for p in _looped_trajectory(position, velocity * 0.4, env):
+            if 0 <= int(p.x) < expected.width and 0 <= int(expected.height - p.y) < expected.height:
+                write_pixel(expected, int(p.x), int(expected.height - p.y), Color(1, 0.5, 0.5))
+
+    positions, velocities = _batch(LAUNCHES[:2])
+    canvas = canvas_type(90, 55)
+    simulate_batch(positions, velocities * 0.4, env.gravity, env.wind).rasterize(canvas, Color(1, 0.5, 0.5))
+    assert canvas_to_ppm(canvas) == canvas_to_ppm(expected)
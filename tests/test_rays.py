@@ -0,0 +1,56 @@
+from raytracer.arrays import PointArray, VectorArray
+from raytracer.matrices import Matrix4
+from raytracer.rays import Ray, RayArray
+from raytracer.tuples import point, vector
+
+TRANSLATION = Matrix4((1, 0, 0, 3, 0, 1, 0, 4, 0, 0, 1, 5, 0, 0, 0, 1))
+SCALING = Matrix4((2, 0, 0, 0, 0, 3, 0, 0, 0, 0, 4, 0, 0, 0, 0, 1))
+# Not affine, so it changes w.
+PROJECTION = Matrix4((1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0))
+
+
+def test_creating_and_querying_a_ray() -> None:
+    origin = point(1, 2, 3)
+    direction = vector(4, 5, 6)
+    ray = Ray(origin, direction)
+    assert ray.origin == origin
+    assert ray.direction == direction
+
+
+def test_computing_a_point_from_a_distance() -> None:
+    ray = Ray(point(2, 3, 4), vector(1, 0, 0))
+    assert ray.position(0) == point(2, 3, 4)
+    assert ray.position(1) == point(3, 3, 4)
+    assert ray.position(-1) == point(1, 3, 4)
+    assert ray.position(2.5) == point(4.5, 3, 4)
+
+
+def test_translating_a_ray() -> None:
+    ray = Ray(point(1, 2, 3), vector(0, 1, 0))
+    assert ray.transform(TRANSLATION) == Ray(point(4, 6, 8), vector(0, 1, 0))
+
+
+def test_scaling_a_ray() -> None:
+    ray = Ray(point(1, 2, 3), vector(0, 1, 0))
+    assert ray.transform(SCALING) == Ray(point(2, 6, 12), vector(0, 3, 0))
+
+
+def test_ray_array_round_trip() -> None:
+    rays = [Ray(point(1, 2, 3), vector(0, 1, 0)), Ray(point(-1, 0, 2), vector(0.5, 0, -1))]
+    batch = RayArray.from_rays(rays)
+    assert isinstance(batch.origins, PointArray)
+    assert isinstance(batch.directions, VectorArray)
+    assert len(batch) == 2
+    assert batch.to_list() == rays
+    assert batch[1] == rays[1]
+
+
+def test_ray_array_matches_scalar_rays() -> None:
+    rays = [Ray(point(1, 2, 3), vector(0, 1, 0)), Ray(point(-1, 0, 2), vector(0.5, 0, -1))]
+    batch = RayArray.from_rays(rays)
+    assert batch.position([2.5, -1]).to_list() == [rays[0].position(2.5), rays[1].position(-1)]
+    for matrix in (TRANSLATION, SCALING, PROJECTION):
+        moved = batch.transform(matrix)
+        assert isinstance(moved.origins, PointArray)
+        assert isinstance(moved.directions, VectorArray)
+        assert moved.to_list() == [ray.transform(matrix) for ray in rays]
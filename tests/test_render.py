@@ -0,0 +1,60 @@
+from collections.abc import Sequence
+
+import pytest
+
+from raytracer.canvas import ArrayCanvas, Canvas, canvas_to_ppm, pixel_at
+from raytracer.render import Tile, render, shade_tile, split_tiles
+from raytracer.tuples import Color
+
+
+def gradient(x: int, y: int) -> Color:
+    return Color(x / 17, y / 9, (x * y) % 7 / 7)
+
+
+def striped_tile(tile: Tile) -> Sequence[float]:
+    rows = range(tile.y, tile.y + tile.height)
+    return [component for y in rows for _ in range(tile.width) for component in (y, 0, 1)]
+
+
+def test_split_tiles_covers_canvas_with_clipped_edges() -> None:
+    assert split_tiles(5, 3, 2) == [
+        Tile(0, 0, 2, 2),
+        Tile(2, 0, 2, 2),
+        Tile(4, 0, 1, 2),
+        Tile(0, 2, 2, 1),
+        Tile(2, 2, 2, 1),
+        Tile(4, 2, 1, 1),
+    ]
+
+
+def test_split_tiles_rejects_non_positive_size() -> None:
+    with pytest.raises(ValueError, match="tile_size"):
+        split_tiles(5, 3, 0)
+
+
+def test_shade_tile_returns_components_row_by_row() -> None:
+    assert list(shade_tile(gradient, Tile(1, 2, 2, 1))) == [*gradient(1, 2).rgb, *gradient(2, 2).rgb]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("tile_size", [1, 4, 64])
+def test_render_matches_shading_each_pixel(workers: int, tile_size: int) -> None:
+    expected = Canvas(17, 9)
+    for y in range(9):
+        for x in range(17):
+            expected.write_pixel(x, y, gradient(x, y))
+    canvas = render(ArrayCanvas(17, 9), pixel_shader=gradient, tile_size=tile_size, workers=workers)
+    assert canvas_to_ppm(canvas) == canvas_to_ppm(expected)
+
+
+def test_render_with_tile_shader() -> None:
+    canvas = render(Canvas(6, 4), tile_shader=striped_tile, tile_size=4, workers=2)
+    assert pixel_at(canvas, 5, 3) == Color(3, 0, 1)
+    assert pixel_at(canvas, 0, 1) == Color(1, 0, 1)
+
+
+def test_render_needs_exactly_one_shader() -> None:
+    with pytest.raises(ValueError, match="exactly one"):
+        render(Canvas(2, 2))
+    with pytest.raises(ValueError, match="exactly one"):
+        render(Canvas(2, 2), pixel_shader=gradient, tile_shader=striped_tile)
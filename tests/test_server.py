@@ -0,0 +1,197 @@
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from raytracer.ppm import quantize
+from raytracer.render import Tile, TileShader
+from raytracer.server import RenderJobError, RenderServer, stream_rows
+
+
+def gradient(tile: Tile, scale: float = 1.0) -> Sequence[float]:
+    return [
+        component
+        for y in range(tile.y, tile.y + tile.height)
+        for x in range(tile.x, tile.x + tile.width)
+        for component in (x / 16 * scale, y / 16, 0.5)
+    ]
+
+
+def expected_rows(width: int, height: int, scale: float = 1.0) -> bytes:
+    return quantize(gradient(Tile(0, 0, width, height), scale))
+
+
+async def collect(host: str, port: int, request: dict) -> list[tuple[int, bytes]]:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return [band async for band in stream_rows(reader, writer, request)]
+    finally:
+        writer.close()
+
+
+def test_streams_rows_over_tcp_in_order() -> None:
+    async def scenario() -> list[tuple[int, bytes]]:
+        async with RenderServer({"gradient": gradient}, rows_per_band=4) as server:
+            host, port = (await server.start()).sockets[0].getsockname()[:2]
+            return await collect(host, port, {"shader": "gradient", "width": 16, "height": 10, "params": {"scale": 2}})
+
+    bands = asyncio.run(scenario())
+    assert [first for first, _ in bands] == [0, 4, 8]
+    assert b"".join(data for _, data in bands) == expected_rows(16, 10, scale=2)
+
+
+def test_streams_rows_over_a_unix_socket(tmp_path: Path) -> None:
+    async def scenario() -> bytes:
+        async with RenderServer({"gradient": gradient}) as server:
+            await server.start_unix(tmp_path / "render.sock")
+            reader, writer = await asyncio.open_unix_connection(tmp_path / "render.sock")
+            request = {"shader": "gradient", "width": 5, "height": 3}
+            bands = [data async for _, data in stream_rows(reader, writer, request)]
+            writer.close()
+            return b"".join(bands)
+
+    assert asyncio.run(scenario()) == expected_rows(5, 3)
+
+
+def test_rows_stay_in_order_when_bands_finish_out_of_order() -> None:
+    def slow_start(tile: Tile) -> Sequence[float]:
+        # Earlier bands take longer, so later ones finish first on the pool.
+        time.sleep(0.05 / (tile.y + 1))
+        return gradient(tile)
+
+    async def scenario() -> list[int]:
+        with ThreadPoolExecutor(4) as executor:
+            async with RenderServer({"slow": slow_start}, executor=executor, rows_per_band=1, prefetch=4) as server:
+                host, port = (await server.start()).sockets[0].getsockname()[:2]
+                bands = await collect(host, port, {"shader": "slow", "width": 3, "height": 8})
+        return [first for first, _ in bands]
+
+    assert asyncio.run(scenario()) == list(range(8))
+
+
+@pytest.mark.parametrize(
+    ("request_line", "message"),
+    [
+        (b"not json\n", "one line of JSON"),
+        (b'{"shader": "nope", "width": 1, "height": 1}\n', "unknown shader"),
+        (b'{"shader": "gradient", "width": 0, "height": 1}\n', "positive integers"),
+        (b'{"shader": "gradient", "width": true, "height": 1}\n', "positive integers"),
+        (b'{"shader": "gradient", "width": 1000000, "height": 1000000}\n', "exceeds the limit of"),
+        (b'{"shader": "gradient", "width": 101, "height": 100}\n', "limit of 10000 pixels"),
+        (b'{"shader": "gradient", "width": 1, "height": 1, "params": []}\n', "params"),
+    ],
+)
+def test_rejects_malformed_requests(request_line: bytes, message: str) -> None:
+    async def scenario() -> dict:
+        async with RenderServer({"gradient": gradient}, max_pixels=100 * 100) as server:
+            host, port = (await server.start()).sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request_line)
+            reply = json.loads(await reader.readline())
+            writer.close()
+            assert server.stats["rejected"] == 1
+            return reply
+
+    reply = asyncio.run(scenario())
+    assert reply["status"] == "error"
+    assert message in reply["message"]
+
+
+def test_shader_errors_reach_the_client() -> None:
+    def broken(_tile: Tile) -> Sequence[float]:
+        raise ZeroDivisionError
+
+    async def scenario() -> None:
+        async with RenderServer({"broken": broken}) as server:
+            host, port = (await server.start()).sockets[0].getsockname()[:2]
+            with pytest.raises(RenderJobError, match="ZeroDivisionError"):
+                await collect(host, port, {"shader": "broken", "width": 2, "height": 2})
+            await asyncio.sleep(0.01)
+            assert server.stats["failed"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_queue_is_bounded_and_cancelling_frees_the_worker() -> None:
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking(tile: Tile) -> Sequence[float]:
+        started.set()
+        release.wait(5)
+        return gradient(tile)
+
+    async def scenario() -> None:
+        loop = asyncio.get_running_loop()
+        shaders: dict[str, TileShader] = {"blocking": blocking, "gradient": gradient}
+        async with RenderServer(shaders, max_jobs=1, max_queued=1) as server:
+            host, port = (await server.start()).sockets[0].getsockname()[:2]
+            running = await asyncio.open_connection(host, port)
+            running[1].write(b'{"shader": "blocking", "width": 2, "height": 2}\n')
+            assert json.loads(await running[0].readline())["status"] == "queued"
+            await loop.run_in_executor(None, started.wait, 5)
+
+            waiting = await asyncio.open_connection(host, port)
+            waiting[1].write(b'{"shader": "gradient", "width": 2, "height": 2}\n')
+            assert json.loads(await waiting[0].readline())["position"] == 1
+
+            turned_away = await asyncio.open_connection(host, port)
+            turned_away[1].write(b'{"shader": "gradient", "width": 2, "height": 2}\n')
+            assert json.loads(await turned_away[0].readline()) == {"status": "error", "message": "server busy"}
+            turned_away[1].close()
+
+            # Cancel the queued job by hanging up, then the running one with a cancel request.
+            waiting[1].close()
+            await asyncio.sleep(0.01)
+            running[1].write(b'{"cancel": true}\n')
+            assert await running[0].read() == b""
+            running[1].close()
+            await running[1].wait_closed()
+            release.set()
+
+            assert await collect(host, port, {"shader": "gradient", "width": 2, "height": 2}) == [
+                (0, expected_rows(2, 2))
+            ]
+            assert server.stats == {"accepted": 3, "rejected": 1, "cancelled": 2, "completed": 1}
+
+    asyncio.run(scenario())
+
+
+def test_a_client_that_stops_reading_stalls_its_job(tmp_path: Path) -> None:
+    calls = []
+
+    def counted(tile: Tile) -> Sequence[float]:
+        calls.append(tile.y)
+        return [0.5] * (tile.width * tile.height * 3)
+
+    async def scenario() -> None:
+        width, height, rows = 1000, 1000, 10
+        async with RenderServer({"counted": counted}, rows_per_band=rows, prefetch=2) as server:
+            # Unix socket buffers are fixed in size, unlike TCP's, which grow to hold megabytes on loopback.
+            await server.start_unix(tmp_path / "render.sock")
+            reader, writer = await asyncio.open_unix_connection(tmp_path / "render.sock", limit=2**16)
+            writer.write(json.dumps({"shader": "counted", "width": width, "height": height}).encode() + b"\n")
+            await reader.readline()
+            await asyncio.sleep(0.2)
+            # 30 kB bands against a few hundred kB of buffering: far from all 100 bands are shaded.
+            assert len(calls) < height // rows // 2
+            received = 0
+            while line := await reader.readline():
+                message = json.loads(line)
+                if "rows" in message:
+                    received += len(await reader.readexactly(message["bytes"]))
+            assert received == width * height * 3
+            assert len(calls) == height // rows
+            writer.close()
+
+    asyncio.run(scenario())
+
+
+def test_rejects_non_positive_limits() -> None:
+    with pytest.raises(ValueError, match="must be positive"):
+        RenderServer({}, max_queued=0)
@@ -0,0 +1,121 @@
+import multiprocessing
+import pickle
+import sys
+import weakref
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from raytracer import shared_canvas
+from raytracer.canvas import ArrayCanvas, canvas_to_ppm, pixel_at, write_pixel
+from raytracer.render import render
+from raytracer.shared_canvas import SharedMemoryCanvas, _attach_cached
+from raytracer.tuples import Color
+
+from .test_render import gradient
+
+
+@pytest.mark.parametrize("typecode", ["f", "d"])
+def test_attached_canvas_shares_pixels_with_owner(typecode: str) -> None:
+    with SharedMemoryCanvas(4, 3, bg_color=Color(0, 0, 1), typecode=typecode) as owner:
+        worker = SharedMemoryCanvas.attach(owner.name, 4, 3, typecode=typecode)
+        write_pixel(worker, 2, 1, Color(1, 0.5, 0))
+        worker.fill_region(0, 2, 2, 1, Color(0, 1, 0))
+        assert pixel_at(owner, 2, 1) == Color(1, 0.5, 0)
+        assert pixel_at(owner, 1, 2) == Color(0, 1, 0)
+        assert pixel_at(owner, 3, 0) == Color(0, 0, 1)
+        worker.close()
+        assert worker.closed
+        assert not owner.closed
+        assert pixel_at(owner, 2, 1) == Color(1, 0.5, 0)
+
+
+def test_owner_close_unlinks_segment() -> None:
+    canvas = SharedMemoryCanvas(2, 2)
+    name = canvas.name
+    canvas.close()
+    canvas.close()
+    assert canvas.closed
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_segment_is_unlinked_when_owner_is_collected() -> None:
+    canvas = SharedMemoryCanvas(2, 2)
+    name = canvas.name
+    del canvas
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_segment_is_unlinked_when_block_raises() -> None:
+    with pytest.raises(RuntimeError), SharedMemoryCanvas(2, 2) as canvas:
+        name = canvas.name
+        raise RuntimeError
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_pickling_attaches_by_name() -> None:
+    with SharedMemoryCanvas(3, 2) as owner:
+        copy = pickle.loads(pickle.dumps(owner))  # noqa: S301
+        assert copy.name == owner.name
+        assert not copy.owner
+        write_pixel(copy, 0, 1, Color(1, 1, 1))
+        assert pixel_at(owner, 0, 1) == Color(1, 1, 1)
+
+
+def test_unpickled_mappings_are_reused_only_for_the_same_shape() -> None:
+    with SharedMemoryCanvas(4, 2) as owner:
+        first = pickle.loads(pickle.dumps(owner))  # noqa: S301
+        assert pickle.loads(pickle.dumps(owner)) is first  # noqa: S301
+        reshaped = _attach_cached(owner.name, 2, 4, "d")
+        assert reshaped is not first
+        assert (reshaped.width, reshaped.height) == (2, 4)
+        # Only the most recent mapping is kept alive by the cache.
+        first_ref = weakref.ref(first)
+        del first
+        assert first_ref() is None
+        reshaped.close()
+
+
+def _write_from_child(pickled: bytes) -> None:
+    unregistered = []
+    resource_tracker.unregister = lambda name, _rtype: unregistered.append(name)  # type: ignore[assignment]
+    write_pixel(pickle.loads(pickled), 1, 1, Color(0, 1, 0))  # noqa: S301
+    sys.exit(len(unregistered))
+
+
+def test_spawned_workers_share_the_owners_resource_tracker_registration() -> None:
+    with SharedMemoryCanvas(2, 2) as owner:
+        worker = multiprocessing.get_context("spawn").Process(target=_write_from_child, args=(pickle.dumps(owner),))
+        worker.start()
+        worker.join(30)
+        assert worker.exitcode == 0
+        assert pixel_at(owner, 1, 1) == Color(0, 1, 0)
+        SharedMemory(name=owner.name).close()
+
+
+@pytest.mark.skipif(sys.version_info >= (3, 13), reason="attaches with track=False")
+def test_attaching_from_a_process_with_its_own_tracker_unregisters(monkeypatch: pytest.MonkeyPatch) -> None:
+    unregistered: list[str] = []
+    monkeypatch.setattr(resource_tracker, "unregister", lambda name, _rtype: unregistered.append(name))
+    with SharedMemoryCanvas(2, 2) as owner:
+        monkeypatch.setattr(shared_canvas, "_created", set())
+        SharedMemoryCanvas.attach(owner.name, 2, 2, owner_tracker=owner.tracker).close()
+        assert unregistered == []
+        SharedMemoryCanvas.attach(owner.name, 2, 2, owner_tracker=(-1, -1)).close()
+        assert unregistered == [f"/{owner.name}"]
+
+
+def test_shared_canvas_rejects_unknown_typecode() -> None:
+    with pytest.raises(ValueError, match="typecode"):
+        SharedMemoryCanvas(2, 2, typecode="i")
+
+
+def test_render_writes_tiles_in_place() -> None:
+    expected = render(ArrayCanvas(17, 9), pixel_shader=gradient, workers=1)
+    with SharedMemoryCanvas(17, 9) as canvas:
+        render(canvas, pixel_shader=gradient, tile_size=4, workers=2)
+        assert canvas_to_ppm(canvas) == canvas_to_ppm(expected)
@@ -0,0 +1,84 @@
+import io
+
+import pytest
+
+from raytracer.canvas import Canvas, canvas_to_ppm, pixel_at, write_pixel
+from raytracer.ppm import write_ppm
+from raytracer.sparse_canvas import SparseCanvas
+from raytracer.tuples import Color
+
+
+def test_unwritten_pixels_read_as_background_without_tiles() -> None:
+    canvas = SparseCanvas(900, 550, bg_color=Color(0.2, 0.4, 0.6))
+    assert pixel_at(canvas, 899, 549) == Color(0.2, 0.4, 0.6)
+    assert canvas.tiles == {}
+    assert canvas.row_bytes(10) == bytes([51, 102, 153]) * 900
+
+
+def test_writes_only_allocate_touched_tiles() -> None:
+    canvas = SparseCanvas(100, 100, tile_size=16)
+    write_pixel(canvas, 99, 99, Color(1, 0, 0))
+    write_pixel(canvas, 98, 97, Color(0, 1, 0))
+    assert list(canvas.tiles) == [(6, 6)]
+    # Edge tiles are clipped to the canvas.
+    assert [len(row) for row in canvas.tiles[6, 6]] == [4, 4, 4, 4]
+    assert pixel_at(canvas, 99, 99) == Color(1, 0, 0)
+    assert pixel_at(canvas, 98, 97) == Color(0, 1, 0)
+    assert pixel_at(canvas, 96, 96) == Color(0, 0, 0)
+
+
+def test_rejects_pixels_outside_the_canvas() -> None:
+    canvas = SparseCanvas(4, 4)
+    with pytest.raises(IndexError):
+        write_pixel(canvas, -1, 0, Color(1, 1, 1))
+    with pytest.raises(IndexError):
+        pixel_at(canvas, 0, 4)
+
+
+def test_fill_region_only_stores_tiles_on_the_canvas() -> None:
+    canvas = SparseCanvas(20, 20, tile_size=8)
+    canvas.fill_region(-10, -10, 12, 12, Color(1, 0, 0))
+    canvas.fill_region(20, 0, 5, 5, Color(1, 0, 0))
+    canvas.fill_region(3, 3, 0, 5, Color(1, 0, 0))
+    assert set(canvas.tiles) == {(0, 0)}
+    assert pixel_at(canvas, 1, 1) == Color(1, 0, 0)
+    assert pixel_at(canvas, 2, 2) == Color(0, 0, 0)
+
+
+def test_filling_with_background_skips_unstored_tiles() -> None:
+    canvas = SparseCanvas(64, 64, tile_size=16)
+    canvas.fill_region(0, 0, 64, 64, Color(0, 0, 0))
+    assert canvas.tiles == {}
+    canvas.fill_region(10, 10, 10, 3, Color(1, 1, 1))
+    assert sorted(canvas.tiles) == [(0, 0), (1, 0)]
+
+
+def test_matches_dense_canvas_output() -> None:
+    bg = Color(0.1, 0.1, 0.1)
+    dense, sparse = Canvas(37, 29, bg_color=bg), SparseCanvas(37, 29, bg_color=bg, tile_size=8)
+    for canvas in (dense, sparse):
+        write_pixel(canvas, 0, 0, Color(1.5, 0, 0))
+        canvas.fill_region(5, 6, 20, 9, Color(0, 0.5, 0))
+        canvas.write_row(20, [Color(0.1, 0.2, 0.3), Color(0.9, 0.8, 0.7)] * 10, x=17)
+        canvas.write_array([1, 1, 1, 0, 0, 0] * 2, x=6, y=25, width=2)
+    assert sparse.pixels == dense.pixels
+    assert [sparse.row_components(y) for y in range(29)] == [dense.row_components(y) for y in range(29)]
+    assert canvas_to_ppm(sparse) == canvas_to_ppm(dense)
+    assert sparse.to_bytes() == dense.to_bytes()
+    assert sparse.to_bytes("srgb") == dense.to_bytes("srgb")
+    streams = io.BytesIO(), io.BytesIO()
+    write_ppm(dense, streams[0], "P6")
+    write_ppm(sparse, streams[1], "P6")
+    assert streams[0].getvalue() == streams[1].getvalue()
+
+
+def test_ppm_picks_up_later_writes() -> None:
+    canvas = SparseCanvas(20, 20, tile_size=8)
+    canvas_to_ppm(canvas)
+    write_pixel(canvas, 19, 19, Color(1, 1, 1))
+    assert canvas_to_ppm(canvas).endswith("255 255 255\n\n")
+
+
+def test_rejects_non_positive_tile_size() -> None:
+    with pytest.raises(ValueError, match="tile_size"):
+        SparseCanvas(4, 4, tile_size=0)
@@ -0,0 +1,94 @@
+from math import pi, sqrt
+
+import pytest
+
+from raytracer import transformations
+from raytracer.matrices import InverseCache, Matrix, inverse
+from raytracer.rays import Ray
+from raytracer.shapes import Sphere
+from raytracer.transformations import (
+    Transform,
+    rotation_x,
+    rotation_y,
+    rotation_z,
+    scaling,
+    shearing,
+    translation,
+)
+from raytracer.tuples import Point, point, vector
+
+
+def test_translation_moves_points_but_not_vectors() -> None:
+    transform = translation(5, -3, 2)
+    assert transform * (-3, 4, 5, 1) == (2, 1, 7, 1)
+    assert inverse(transform) * (-3, 4, 5, 1) == (-8, 7, 3, 1)
+    assert transform * (-3, 4, 5, 0) == (-3, 4, 5, 0)
+
+
+def test_scaling_and_reflection() -> None:
+    assert scaling(2, 3, 4) * (-4, 6, 8, 1) == (-8, 18, 32, 1)
+    assert scaling(2, 3, 4) * (-4, 6, 8, 0) == (-8, 18, 32, 0)
+    assert inverse(scaling(2, 3, 4)) * (-4, 6, 8, 0) == (-2, 2, 2, 0)
+    assert scaling(-1, 1, 1) * (2, 3, 4, 1) == (-2, 3, 4, 1)
+
+
+def test_rotations() -> None:
+    half = sqrt(2) / 2
+    expected = [
+        (rotation_x(pi / 4), (0, 1, 0), (0, half, half)),
+        (rotation_x(pi / 2), (0, 1, 0), (0, 0, 1)),
+        (rotation_y(pi / 4), (0, 0, 1), (half, 0, half)),
+        (rotation_y(pi / 2), (0, 0, 1), (1, 0, 0)),
+        (rotation_z(pi / 4), (0, 1, 0), (-half, half, 0)),
+        (rotation_z(pi / 2), (0, 1, 0), (-1, 0, 0)),
+    ]
+    for matrix, start, end in expected:
+        assert matrix * (*start, 1) == pytest.approx((*end, 1))
+
+
+def test_shearing_moves_each_coordinate_in_proportion_to_the_others() -> None:
+    assert shearing(1, 0, 0, 0, 0, 0) * (2, 3, 4, 1) == (5, 3, 4, 1)
+    assert shearing(0, 1, 0, 0, 0, 0) * (2, 3, 4, 1) == (6, 3, 4, 1)
+    assert shearing(0, 0, 1, 0, 0, 0) * (2, 3, 4, 1) == (2, 5, 4, 1)
+    assert shearing(0, 0, 0, 1, 0, 0) * (2, 3, 4, 1) == (2, 7, 4, 1)
+    assert shearing(0, 0, 0, 0, 1, 0) * (2, 3, 4, 1) == (2, 3, 6, 1)
+    assert shearing(0, 0, 0, 0, 0, 1) * (2, 3, 4, 1) == (2, 3, 7, 1)
+
+
+def test_chained_transformations_apply_in_call_order() -> None:
+    chain = Transform().rotate_x(pi / 2).scale(5, 5, 5).translate(10, 5, 7)
+    moved = chain.apply(point(1, 0, 1))
+    assert moved.coords == pytest.approx((15, 0, 7, 1))
+    assert isinstance(moved, Point)
+
+
+def test_folded_chain_is_identical_to_multiplying_the_steps() -> None:
+    chain = Transform().shear(0.5, 0, 0, 0.25, 0, 0).rotate_y(0.3).scale(2, 3, 0.5).rotate_z(1.1).translate(1, -2, 3)
+    product = (
+        translation(1, -2, 3) * rotation_z(1.1) * scaling(2, 3, 0.5) * rotation_y(0.3) * shearing(0.5, 0, 0, 0.25, 0, 0)
+    )
+    assert chain.matrix.values == product.values
+    generic = Matrix(translation(1, -2, 3).elements) * Matrix(rotation_z(1.1).elements)
+    assert Transform().rotate_z(1.1).translate(1, -2, 3).matrix == generic
+
+
+def test_chain_folds_lazily_and_caches_the_matrix_and_inverse(monkeypatch: pytest.MonkeyPatch) -> None:
+    inverse_cache = InverseCache()
+    monkeypatch.setattr(transformations, "inverse_cache", inverse_cache)
+    base = Transform().scale(2, 2, 2)
+    chain = base.translate(1, 0, 0)
+    assert len(chain) == 2
+    assert len(base) == 1
+    assert chain._matrix is None
+    matrix = chain.matrix
+    assert chain.matrix is matrix
+    assert chain.inverse is chain.inverse
+    assert inverse_cache.stats()["misses"] == 1
+    assert chain.inverse * matrix == Transform().matrix
+    assert repr(chain) == "Transform().scale(2, 2, 2).translate(1, 0, 0)"
+
+
+def test_chain_transforms_rays_and_shapes() -> None:
+    chain = Transform().scale(2, 3, 4)
+    assert chain.apply(Ray(point(1, 2, 3), vector(0, 1, 0))) == Ray(point(2, 6, 12), vector(0, 3, 0))
+    assert Sphere(chain).transform == scaling(2, 3, 4)
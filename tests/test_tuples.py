@@ -2,7 +2,22 @@ from math import sqrt
 
 import pytest
 
-from raytracer.tuples import Color, Point, TupleFeature, Vector, clamp, cross, dot, magnitude, normalize, point, vector
+from raytracer.matrices import Matrix, transform_batch
+from raytracer.tuples import (
+    Color,
+    Point,
+    TupleFeature,
+    Vector,
+    clamp,
+    cross,
+    dot,
+    magnitude,
+    normalize,
+    pack_tuples,
+    point,
+    unpack_tuples,
+    vector,
+)
 
 
 def test_point() -> None:
@@ -176,3 +191,43 @@ def test_color_eq_returns_false_when_other_not_color() -> None:
 @pytest.mark.parametrize("number, clamp_min, clamp_max, expected", [(5, 0, 10, 5), (5, 10, 20, 10), (5, 0, 3, 3)])
 def test_clamp(number: int, clamp_min: int, clamp_max: int, expected: int) -> None:
     assert clamp(number, clamp_min, clamp_max) == expected
+
+
+def test_pack_and_unpack_tuples_preserve_w() -> None:
+    features = [point(1, 2, 3), vector(4, 5, 6), TupleFeature((7, 8, 9, 2))]
+    batch = pack_tuples(features)
+    assert list(batch) == [1, 2, 3, 1, 4, 5, 6, 0, 7, 8, 9, 2]
+    unpacked = unpack_tuples(batch)
+    assert [type(feature) for feature in unpacked] == [Point, Vector, TupleFeature]
+    assert unpacked == features
+    with pytest.raises(ValueError, match="N x 4"):
+        unpack_tuples(batch[:-1])
+
+
+def test_transform_batch_of_points_and_vectors() -> None:
+    translation = Matrix([[1, 0, 0, 5], [0, 1, 0, -3], [0, 0, 1, 2], [0, 0, 0, 1]])
+    moved = unpack_tuples(transform_batch(translation, pack_tuples([point(-3, 4, 5), vector(-3, 4, 5)])))
+    assert moved == [point(2, 1, 7), vector(-3, 4, 5)]
+    assert isinstance(moved[0], Point)
+    assert isinstance(moved[1], Vector)
+
+
+@pytest.mark.parametrize("victim", [TupleFeature((1, 2, 3, 4)), point(1, 2, 3), vector(1, 2, 3), Color(1, 2, 3)])
+def test_tuples_and_colors_use_slots(victim: object) -> None:
+    assert not hasattr(victim, "__dict__")
+    with pytest.raises(AttributeError):
+        victim.extra = 1  # type: ignore[attr-defined]
+
+
+def test_tuple_feature_coords_follow_attributes() -> None:
+    victim = TupleFeature((1, 2, 3, 4))
+    assert victim.coords == (1, 2, 3, 4)
+    victim.x = 5
+    assert victim.coords == (5, 2, 3, 4)
+
+
+def test_color_rgb_follows_attributes() -> None:
+    victim = Color(0.1, 0.2, 0.3)
+    assert victim.rgb == (0.1, 0.2, 0.3)
+    victim.red = 1
+    assert victim.rgb == (1, 0.2, 0.3)